@@ -0,0 +1,358 @@
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+# Marks the end of the aggregator's input
+_DONE = object()
+
+
+def _quantile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class ParallelMixtureOfAgents:
+    """
+    Runs a MixtureOfAgents with every layer's agents in parallel and early aggregation.
+
+    Each layer gives the task, plus the previous layer's outputs, to all agents
+    at once on a thread pool. With `quorum=K`, a layer ends as soon as K agents
+    have answered; the stragglers are cancelled and their outputs dropped. An
+    agent that has not started yet is never started, but one already waiting
+    on its model cannot be interrupted (it runs on a worker thread), so it
+    finishes in the background and its output is ignored.
+
+    An agent object is never run twice at the same time, since `Agent.run`
+    updates the agent's conversation. A straggler still running in the
+    background is skipped by the following layers (reported under "skipped")
+    until its call returns, and the final agent, which may also be one of the
+    layer agents, waits for its own previous call before aggregating. The
+    straggler's late answer still ends up in its own conversation, as every
+    answer of an agent that keeps its history across layers does.
+
+    With `incremental_aggregation`, the final agent does not wait for the last
+    layer to finish. It folds the outputs into a running answer as they arrive:
+    the first call combines the outputs available, and each later call updates
+    the answer with the outputs that arrived meanwhile. When the slowest agent
+    finishes, only one update is left. This costs extra aggregator calls (at
+    most one per last-layer agent) and only pays off when the aggregator's time
+    is dominated by reading long outputs rather than writing its answer, so it
+    is off by default.
+
+    Every run reports each agent's latency per layer, the layer's p50, p95 and
+    max, and which agents were cancelled, so tail latency can be tracked.
+
+    Args:
+        agents (List[Any]): Agents exposing `agent_name` and a synchronous `run(task)`.
+        final_agent (Any): The aggregator, exposing `run(task)`.
+        layers (int): Number of layers every agent takes part in.
+        quorum (Optional[int]): Outputs needed to finish a layer. Defaults to all agents.
+        incremental_aggregation (bool): Whether the final agent folds outputs as they arrive.
+        max_concurrency (int): Maximum number of agents running at the same time.
+        agent_timeout (Optional[float]): Seconds each agent may take before it is abandoned.
+    """
+
+    def __init__(
+        self,
+        agents: List[Any],
+        final_agent: Any,
+        layers: int = 3,
+        quorum: Optional[int] = None,
+        incremental_aggregation: bool = False,
+        max_concurrency: int = 8,
+        agent_timeout: Optional[float] = None,
+    ):
+        if not agents:
+            raise ValueError("At least one agent is required.")
+        if layers < 1:
+            raise ValueError("layers must be at least 1.")
+        if quorum is not None and not 1 <= quorum <= len(agents):
+            raise ValueError(f"quorum must be between 1 and the number of agents ({len(agents)}).")
+
+        self.agents = agents
+        self.final_agent = final_agent
+        self.layers = layers
+        self.quorum = quorum or len(agents)
+        self.incremental_aggregation = incremental_aggregation
+        self.max_concurrency = max_concurrency
+        self.agent_timeout = agent_timeout
+        # The call each agent object is running, kept across layers and runs
+        self._calls: Dict[int, Future] = {}
+
+    @staticmethod
+    def _layer_task(task: str, outputs: Dict[str, str]) -> str:
+        if not outputs:
+            return task
+        responses = "\n\n".join(f"[{name}]: {output}" for name, output in outputs.items())
+        return f"{task}\n\nResponses from the previous layer:\n\n{responses}"
+
+    @staticmethod
+    def _aggregation_task(task: str, outputs: Dict[str, str], draft: Optional[str]) -> str:
+        responses = "\n\n".join(f"[{name}]: {output}" for name, output in outputs.items())
+        if draft is None:
+            return f"{task}\n\nCombine the following responses into one final answer:\n\n{responses}"
+        return (
+            f"{task}\n\nHere is the current combined answer:\n\n{draft}\n\n"
+            f"Update it with these additional responses, keeping everything that is still relevant:\n\n{responses}"
+        )
+
+    def _is_busy(self, agent: Any) -> bool:
+        call = self._calls.get(id(agent))
+        return call is not None and not call.done()
+
+    async def _call(
+        self,
+        agent: Any,
+        task: str,
+        executor: ThreadPoolExecutor,
+        timeout: Optional[float] = None,
+    ) -> str:
+        # Waits for the agent's previous call, so one agent never runs twice at once
+        previous = self._calls.get(id(agent))
+        if previous is not None and not previous.done():
+            await asyncio.wait([asyncio.wrap_future(previous)])
+        call = executor.submit(agent.run, task)
+        self._calls[id(agent)] = call
+        try:
+            # Shielded, so the recorded call stays pending until the agent really returns
+            return str(await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(call)), timeout=timeout))
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            # Only succeeds if the call has not started yet
+            call.cancel()
+            raise
+
+    async def _run_agent(self, agent: Any, task: str, executor: ThreadPoolExecutor) -> str:
+        return await self._call(agent, task, executor, self.agent_timeout)
+
+    async def _aggregate(
+        self,
+        task: str,
+        inbox: "asyncio.Queue",
+        executor: ThreadPoolExecutor,
+        stats: Dict[str, Any],
+    ) -> Optional[str]:
+        draft: Optional[str] = None
+        finished = False
+        while not finished:
+            items = [await inbox.get()]
+            # Outputs that arrived during the previous call are folded in together
+            while items[-1] is not _DONE and not inbox.empty():
+                items.append(inbox.get_nowait())
+            if items[-1] is _DONE:
+                finished = True
+                items.pop()
+            if not items:
+                break
+
+            outputs = dict(items)
+            draft = await self._call(self.final_agent, self._aggregation_task(task, outputs, draft), executor)
+            stats["calls"] += 1
+            stats["folded"].append(list(outputs))
+        return draft
+
+    async def _run_layer(
+        self,
+        index: int,
+        layer_task: str,
+        executor: ThreadPoolExecutor,
+        inbox: Optional["asyncio.Queue"],
+    ) -> Dict[str, Any]:
+        start = time.perf_counter()
+        available = [agent for agent in self.agents if not self._is_busy(agent)]
+        skipped = sorted(agent.agent_name for agent in self.agents if self._is_busy(agent))
+        quorum = min(self.quorum, len(available))
+        pending = {
+            asyncio.ensure_future(self._run_agent(agent, layer_task, executor)): agent.agent_name
+            for agent in available
+        }
+        outputs: Dict[str, str] = {}
+        errors: Dict[str, str] = {}
+        latencies: Dict[str, float] = {}
+        quorum_time = None
+
+        while pending and len(outputs) < quorum:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                latencies[name] = time.perf_counter() - start
+                try:
+                    outputs[name] = future.result()
+                except asyncio.TimeoutError:
+                    errors[name] = f"Timed out after {self.agent_timeout}s"
+                    continue
+                except Exception as e:
+                    errors[name] = f"{type(e).__name__}: {e}"
+                    continue
+                if inbox is not None and len(outputs) <= quorum:
+                    inbox.put_nowait((name, outputs[name]))
+            if len(outputs) >= quorum and quorum_time is None:
+                quorum_time = time.perf_counter() - start
+
+        for future in pending:
+            future.cancel()
+        if inbox is not None:
+            inbox.put_nowait(_DONE)
+
+        finished = list(latencies.values())
+        return {
+            "layer": index,
+            "outputs": outputs,
+            "errors": errors,
+            "latencies": latencies,
+            "cancelled": sorted(pending.values()),
+            "skipped": skipped,
+            "p50": _quantile(finished, 0.5),
+            "p95": _quantile(finished, 0.95),
+            "max": max(finished) if finished else None,
+            "quorum_time": quorum_time,
+            "wall_time": time.perf_counter() - start,
+        }
+
+    async def arun(self, task: str) -> Dict[str, Any]:
+        """
+        Runs every layer and the aggregation on a task.
+
+        Args:
+            task (str): The task given to the first layer.
+
+        Returns:
+            Dict[str, Any]: The final answer, the last layer's outputs, a report per
+            layer (latencies, p50/p95/max, cancelled agents, agents skipped because
+            they were still busy, errors, wall time), the
+            aggregation time and calls, and the total time. `output` is None if a
+            layer produced no output.
+        """
+        run_start = time.perf_counter()
+        layers: List[Dict[str, Any]] = []
+        aggregation = {"calls": 0, "folded": []}
+        outputs: Dict[str, str] = {}
+        draft: Optional[str] = None
+
+        # Leaves room for the aggregator next to a full layer
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency + 1)
+        try:
+            for index in range(self.layers):
+                last = index == self.layers - 1
+                inbox = asyncio.Queue() if last and self.incremental_aggregation else None
+                aggregator = (
+                    asyncio.ensure_future(self._aggregate(task, inbox, executor, aggregation)) if inbox else None
+                )
+
+                layer = await self._run_layer(index, self._layer_task(task, outputs), executor, inbox)
+                layers.append(layer)
+                outputs = layer["outputs"]
+
+                if aggregator:
+                    last_output_time = time.perf_counter()
+                    draft = await aggregator
+                if not outputs:
+                    break
+
+            if outputs and not self.incremental_aggregation:
+                last_output_time = time.perf_counter()
+                draft = await self._aggregate_once(task, outputs, executor, aggregation)
+        finally:
+            # Cancelled agents must not block the caller on executor shutdown
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return {
+            "output": draft if outputs else None,
+            "outputs": outputs,
+            "layers": layers,
+            "aggregation": {
+                **aggregation,
+                "time_after_last_layer": time.perf_counter() - last_output_time if outputs else None,
+            },
+            "total_time": time.perf_counter() - run_start,
+        }
+
+    async def _aggregate_once(
+        self,
+        task: str,
+        outputs: Dict[str, str],
+        executor: ThreadPoolExecutor,
+        stats: Dict[str, Any],
+    ) -> str:
+        stats["calls"] += 1
+        stats["folded"].append(list(outputs))
+        return await self._call(self.final_agent, self._aggregation_task(task, outputs, None), executor)
+
+    def run(self, task: str) -> Dict[str, Any]:
+        """
+        Synchronous wrapper around `arun` for scripts. In a notebook, `await arun(...)` instead.
+
+        Inside a running event loop `arun` runs on a worker thread with its own
+        loop, since `asyncio.run` cannot be nested.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.arun(task))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.arun(task)).result()
+
+
+def format_layer_report(result: Dict[str, Any]) -> str:
+    """
+    Formats the per-layer latencies of a run as a table.
+
+    Args:
+        result (Dict[str, Any]): Output of `ParallelMixtureOfAgents.run`.
+
+    Returns:
+        str: One line per layer, then the aggregation and total time.
+    """
+
+    def seconds(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:.2f}s"
+
+    lines = [f"{'layer':<6}{'p50':>8}{'p95':>8}{'max':>8}{'wall':>8}  cancelled / skipped / errors"]
+    for layer in result["layers"]:
+        notes = ", ".join(
+            layer["cancelled"]
+            + [f"{name} (skipped, busy)" for name in layer["skipped"]]
+            + [f"{name} ({error})" for name, error in layer["errors"].items()]
+        )
+        lines.append(
+            f"{layer['layer']:<6}{seconds(layer['p50']):>8}{seconds(layer['p95']):>8}"
+            f"{seconds(layer['max']):>8}{seconds(layer['wall_time']):>8}  {notes or '-'}"
+        )
+    aggregation = result["aggregation"]
+    lines.append(
+        f"Aggregation: {aggregation['calls']} call(s), "
+        f"{seconds(aggregation['time_after_last_layer'])} after the last layer; total {seconds(result['total_time'])}"
+    )
+    return "\n".join(lines)
+
+
+# Example usage: four agents with one slow straggler, compared across execution modes
+if __name__ == "__main__":
+
+    class SleepAgent:
+        def __init__(self, agent_name: str, latency: float):
+            self.agent_name = agent_name
+            self.latency = latency
+
+        def run(self, task: str) -> str:
+            time.sleep(self.latency)
+            return f"{self.agent_name} answer ({len(task)} chars of context)"
+
+    agents = [
+        SleepAgent("Director", 0.3),
+        SleepAgent("FinancialProjectionPreparer", 0.4),
+        SleepAgent("RiskAssessmentSpecialist", 0.5),
+        SleepAgent("ReportConsolidator", 1.5),
+    ]
+    aggregator = SleepAgent("Director", 0.3)
+    task = "Prepare detailed financial projections and perform a comprehensive risk assessment."
+
+    for label, options in [
+        ("all agents", {}),
+        ("quorum 3 of 4", {"quorum": 3}),
+        ("quorum 3 of 4, incremental aggregation", {"quorum": 3, "incremental_aggregation": True}),
+    ]:
+        result = ParallelMixtureOfAgents(agents, aggregator, layers=3, **options).run(task)
+        print(f"\n{label}\n{format_layer_report(result)}")
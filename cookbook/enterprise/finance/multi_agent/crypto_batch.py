@@ -0,0 +1,246 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+
+# Shared helpers such as agent_calls live with the workshop recipes
+WORKSHOP_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../../workshops/sep_6_workshop")
+)
+if WORKSHOP_DIR not in sys.path:
+    sys.path.append(WORKSHOP_DIR)
+
+from agent_calls import run_isolated
+
+# Can be pointed at the local fixture server (see crypto_fixture_server.py)
+COINGECKO_API_URL = os.getenv("COINGECKO_API_URL", "https://api.coingecko.com/api/v3")
+
+# Market fields passed to the LLM; the rest of the CoinGecko payload is dropped
+MARKET_FIELDS = [
+    "id",
+    "symbol",
+    "current_price",
+    "market_cap",
+    "market_cap_rank",
+    "total_volume",
+    "high_24h",
+    "low_24h",
+    "price_change_percentage_24h",
+    "circulating_supply",
+    "ath",
+    "last_updated",
+]
+
+SUMMARY_INSTRUCTION = (
+    "Summarize the market data below for a crypto investor: price action over 24h, "
+    "market cap and volume, and anything notable. Reply with only a JSON object "
+    "mapping each coin id to its summary."
+)
+
+# A Markdown code fence around the answer, e.g. ```json ... ```
+_CODE_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+class MarketDataCache:
+    """
+    A per-coin cache of market data that expires after `ttl` seconds.
+
+    Entries are also written to `path` when one is given, so separate runs of a
+    script or notebook within the TTL reuse them. Coins the API did not return
+    are cached as None, so unknown IDs are not re-requested on every run.
+
+    Args:
+        ttl (float): Seconds an entry stays valid.
+        path (Optional[str]): JSON file the cache is persisted to.
+    """
+
+    def __init__(self, ttl: float = 60.0, path: Optional[str] = None):
+        self.ttl = ttl
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                self._entries = json.load(file)
+
+    def get_many(self, coin_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Returns the fresh entries among `coin_ids`; missing or expired coins are left out.
+        """
+        now = time.time()
+        with self._lock:
+            return {
+                coin_id: self._entries[coin_id]["data"]
+                for coin_id in coin_ids
+                if coin_id in self._entries and now - self._entries[coin_id]["fetched_at"] < self.ttl
+            }
+
+    def set_many(self, data: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        now = time.time()
+        with self._lock:
+            for coin_id, value in data.items():
+                self._entries[coin_id] = {"data": value, "fetched_at": now}
+            if self.path:
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as file:
+                    json.dump(self._entries, file)
+                os.replace(tmp_path, self.path)
+
+
+def fetch_markets(
+    coin_ids: List[str],
+    cache: Optional[MarketDataCache] = None,
+    batch_size: int = 250,
+    vs_currency: str = "usd",
+    session: Optional[requests.Session] = None,
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Fetches market data for many coins with CoinGecko's bulk `/coins/markets` endpoint.
+
+    Coins that are fresh in the cache are not requested. The rest are requested
+    `batch_size` IDs at a time, so the number of API calls grows with the number
+    of batches, not coins.
+
+    Args:
+        coin_ids (List[str]): CoinGecko coin IDs, e.g. ["bitcoin", "ethereum"].
+        cache (Optional[MarketDataCache]): Cache to read from and fill.
+        batch_size (int): IDs per request. CoinGecko returns at most 250 per page.
+        vs_currency (str): Currency the prices are quoted in.
+        session (Optional[requests.Session]): Session to reuse connections with.
+
+    Returns:
+        Dict[str, Optional[Dict[str, Any]]]: Market data per coin ID, in the order given,
+        or None for IDs the API does not know.
+
+    Raises:
+        requests.exceptions.RequestException: If a request fails.
+    """
+    coin_ids = list(dict.fromkeys(coin_ids))
+    cached = cache.get_many(coin_ids) if cache else {}
+    missing = [coin_id for coin_id in coin_ids if coin_id not in cached]
+    session = session or requests.Session()
+
+    fetched: Dict[str, Optional[Dict[str, Any]]] = {}
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start : start + batch_size]
+        response = session.get(
+            f"{COINGECKO_API_URL}/coins/markets",
+            params={
+                "vs_currency": vs_currency,
+                "ids": ",".join(batch),
+                "per_page": len(batch),
+                "page": 1,
+            },
+            timeout=30,
+        )
+        response.raise_for_status()
+        by_id = {
+            item["id"]: {field: item.get(field) for field in MARKET_FIELDS}
+            for item in response.json()
+        }
+        for coin_id in batch:
+            fetched[coin_id] = by_id.get(coin_id)
+
+    if cache and fetched:
+        cache.set_many(fetched)
+
+    merged = {**cached, **fetched}
+    return {coin_id: merged[coin_id] for coin_id in coin_ids}
+
+
+def _format_batch(markets: List[Dict[str, Any]]) -> str:
+    lines = [",".join(MARKET_FIELDS)]
+    for market in markets:
+        lines.append(",".join("" if market[field] is None else str(market[field]) for field in MARKET_FIELDS))
+    return "\n".join(lines)
+
+
+def _parse_summaries(response: str, coin_ids: List[str]) -> Dict[str, str]:
+    """
+    Returns the summaries found in a reply, keyed by coin ID.
+
+    Models often wrap the JSON in a code fence or add prose around it, which
+    may itself contain braces, so the first JSON object holding any of the
+    batch's coins is used. Coins missing from it, or with an empty summary,
+    are left out; an unparseable reply yields an empty dict.
+    """
+    text = response or ""
+    fence = _CODE_FENCE.search(text)
+    if fence:
+        text = fence.group(1)
+
+    decoder = json.JSONDecoder()
+    start = text.find("{")
+    while start != -1:
+        try:
+            parsed, _ = decoder.raw_decode(text, start)
+        except json.JSONDecodeError:
+            parsed = None
+        if isinstance(parsed, dict) and any(coin_id in parsed for coin_id in coin_ids):
+            return {
+                coin_id: str(parsed[coin_id]).strip()
+                for coin_id in coin_ids
+                if parsed.get(coin_id) is not None and str(parsed[coin_id]).strip()
+            }
+        start = text.find("{", start + 1)
+    return {}
+
+
+def summarize_markets(
+    agent: Any,
+    markets: Dict[str, Optional[Dict[str, Any]]],
+    coins_per_prompt: int = 10,
+    max_workers: int = 4,
+) -> Dict[str, str]:
+    """
+    Summarizes many coins with one LLM call per batch of `coins_per_prompt` coins.
+
+    Each prompt carries a compact CSV of the batch's market data and asks for a
+    JSON object of per-coin summaries. Batches run concurrently, each as a
+    separate `run_isolated` call, so no batch sees another in the agent's
+    history. Coins missing from a batch's reply are asked for once more in a
+    smaller batch; coins still missing after that get a note instead of a summary.
+
+    Args:
+        agent (Any): An agent exposing `system_prompt`, `llm` and `run(task)`.
+        markets (Dict[str, Optional[Dict[str, Any]]]): Output of `fetch_markets`.
+        coins_per_prompt (int): Coins summarized per call.
+        max_workers (int): Concurrent LLM calls.
+
+    Returns:
+        Dict[str, str]: A summary per coin ID. Coins without market data or without
+        a summary in the replies get a note instead.
+    """
+    known = [market for market in markets.values() if market]
+    batches = [known[i : i + coins_per_prompt] for i in range(0, len(known), coins_per_prompt)]
+
+    def ask(batch: List[Dict[str, Any]]) -> Dict[str, str]:
+        response = run_isolated(agent, f"{SUMMARY_INSTRUCTION}\n\n{_format_batch(batch)}")
+        return _parse_summaries(response, [market["id"] for market in batch])
+
+    def summarize(batch: List[Dict[str, Any]]) -> Dict[str, str]:
+        summaries = ask(batch)
+        missing = [market for market in batch if market["id"] not in summaries]
+        if missing:
+            summaries.update(ask(missing))
+        return summaries
+
+    summaries: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for result in executor.map(summarize, batches):
+            summaries.update(result)
+
+    return {
+        coin_id: (
+            f"No market data found for '{coin_id}'."
+            if not market
+            else summaries.get(coin_id, f"No summary returned for '{coin_id}'.")
+        )
+        for coin_id, market in markets.items()
+    }
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def fixture_market(coin_id: str) -> dict:
+    """
+    Returns deterministic CoinGecko-style market data for a coin ID.
+
+    IDs starting with "unknown" are treated as coins the API does not list.
+    """
+    seed = int(hashlib.sha256(coin_id.encode("utf-8")).hexdigest()[:8], 16)
+    price = round(0.01 + (seed % 100_000) / 10, 4)
+    supply = 1_000_000 + seed % 1_000_000_000
+    return {
+        "id": coin_id,
+        "symbol": coin_id[:4],
+        "name": coin_id.title(),
+        "current_price": price,
+        "market_cap": round(price * supply),
+        "market_cap_rank": seed % 500 + 1,
+        "total_volume": round(price * supply * 0.05),
+        "high_24h": round(price * 1.03, 4),
+        "low_24h": round(price * 0.96, 4),
+        "price_change_percentage_24h": round((seed % 2000) / 100 - 10, 2),
+        "circulating_supply": supply,
+        "ath": round(price * 2.5, 4),
+        "last_updated": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+class CoinGeckoFixtureHandler(BaseHTTPRequestHandler):
+    """
+    Serves `/coins/markets` like CoinGecko, from generated fixture data.
+
+    Every request is counted in `server.requests`, and the number of IDs asked
+    for in `server.coins_requested`, so callers can check how many upstream
+    calls a run made.
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if not url.path.endswith("/coins/markets"):
+            self._reply(404, {"error": "not found"})
+            return
+
+        params = parse_qs(url.query)
+        ids = [i for i in params.get("ids", [""])[0].split(",") if i]
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.coins_requested += len(ids)
+
+        self._reply(200, [fixture_market(i) for i in ids if not i.startswith("unknown")])
+
+    def _reply(self, status: int, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server(port: int = 0) -> ThreadingHTTPServer:
+    """
+    Starts the fixture server on a background thread.
+
+    Args:
+        port (int): Port to listen on. 0 picks a free port.
+
+    Returns:
+        ThreadingHTTPServer: The running server. Its API base is `http://127.0.0.1:<server.server_port>/api/v3`.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), CoinGeckoFixtureHandler)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.coins_requested = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# Example usage: fetch 600 coins twice through the cache and count upstream requests
+if __name__ == "__main__":
+    import os
+
+    server = start_fixture_server()
+    os.environ["COINGECKO_API_URL"] = f"http://127.0.0.1:{server.server_port}/api/v3"
+
+    # Imported after the environment points at the fixture server
+    from crypto_batch import MarketDataCache, fetch_markets
+
+    cache = MarketDataCache(ttl=60)
+    coin_ids = [f"coin-{i}" for i in range(600)] + ["unknown-coin"]
+
+    markets = fetch_markets(coin_ids, cache=cache)
+    print(f"First run:  {server.requests} requests for {len(markets)} coins")
+    fetch_markets(coin_ids, cache=cache)
+    print(f"Second run: {server.requests} requests in total (served from cache)")
+    print(f"unknown-coin -> {markets['unknown-coin']}")
+    server.shutdown()
@@ -0,0 +1,196 @@
+import inspect
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Shared helpers such as agent_calls live with the workshop recipes
+WORKSHOP_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../../workshops/sep_6_workshop")
+)
+if WORKSHOP_DIR not in sys.path:
+    sys.path.append(WORKSHOP_DIR)
+
+from agent_calls import run_isolated
+
+
+class ParallelGraphScheduler:
+    """
+    Runs the nodes of a GraphWorkflow in dependency order, with every ready node running at once.
+
+    The graph is topologically sorted up front (cycles raise ValueError). A node is
+    submitted to the thread pool as soon as all of its upstream nodes have finished,
+    so independent experts run in parallel instead of one after another.
+
+    Each node receives only its own input plus references to the outputs of its
+    upstream nodes, so a large document never has to be copied into every node:
+    pass each entry node just the part it needs through `node_inputs`. Agents
+    are called through `run_isolated`, with their system prompt and the prompt
+    only, and the parts of a node's input run concurrently, so no part sees
+    another in the agent's history.
+
+    Args:
+        nodes (Dict[str, Any]): Nodes keyed by id. Agent nodes expose `agent`, task nodes `callable`.
+        edges (List[Any]): Edges exposing `source` and `target` node ids.
+        max_workers (int): Maximum number of nodes running at the same time.
+    """
+
+    def __init__(self, nodes: Dict[str, Any], edges: List[Any], max_workers: int = 8):
+        self.nodes = nodes
+        self.edges = edges
+        self.max_workers = max_workers
+        self.upstream: Dict[str, List[str]] = {node_id: [] for node_id in nodes}
+        self.downstream: Dict[str, List[str]] = {node_id: [] for node_id in nodes}
+
+        for edge in edges:
+            if edge.source not in nodes or edge.target not in nodes:
+                raise ValueError(f"Edge {edge.source} -> {edge.target} references an unknown node.")
+            self.upstream[edge.target].append(edge.source)
+            self.downstream[edge.source].append(edge.target)
+
+        self.order = self.topological_sort()
+
+    @classmethod
+    def from_workflow(cls, workflow: Any, max_workers: int = 8) -> "ParallelGraphScheduler":
+        """
+        Builds a scheduler from the nodes and edges of an existing GraphWorkflow.
+        """
+        return cls(workflow.nodes, workflow.edges, max_workers=max_workers)
+
+    def topological_sort(self) -> List[str]:
+        """
+        Orders the nodes so that every node comes after all of its upstream nodes.
+
+        Returns:
+            List[str]: Node ids in dependency order.
+
+        Raises:
+            ValueError: If the graph contains a cycle.
+        """
+        in_degree = {node_id: len(sources) for node_id, sources in self.upstream.items()}
+        ready = [node_id for node_id, degree in in_degree.items() if degree == 0]
+        order = []
+
+        while ready:
+            node_id = ready.pop(0)
+            order.append(node_id)
+            for target in self.downstream[node_id]:
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    ready.append(target)
+
+        if len(order) != len(self.nodes):
+            raise ValueError("The workflow graph contains a cycle.")
+        return order
+
+    def _run_node(
+        self,
+        node_id: str,
+        task: str,
+        node_input: Optional[Union[str, List[str]]],
+        upstream_outputs: Dict[str, Any],
+    ) -> Any:
+        node = self.nodes[node_id]
+        agent = getattr(node, "agent", None)
+
+        if agent is None:
+            func = node.callable
+            if inspect.signature(func).parameters:
+                return func(upstream_outputs)
+            return func()
+
+        context = "\n\n".join(f"{source}:\n{output}" for source, output in upstream_outputs.items())
+        if isinstance(node_input, list):
+            # An empty list (e.g. routing found nothing for this node) runs it on the task alone
+            parts = node_input or [None]
+        else:
+            parts = [node_input]
+        prompts = []
+        for part in parts:
+            prompt = task
+            if part:
+                prompt += f"\n\n{part}"
+            if context:
+                prompt += f"\n\nFindings from upstream nodes:\n\n{context}"
+            prompts.append(prompt)
+
+        if len(prompts) == 1:
+            return run_isolated(agent, prompts[0])
+        with ThreadPoolExecutor(max_workers=min(len(prompts), self.max_workers)) as executor:
+            outputs = list(executor.map(lambda prompt: run_isolated(agent, prompt), prompts))
+        return "\n\n".join(outputs)
+
+    def run(
+        self,
+        task: str,
+        node_inputs: Optional[Dict[str, Union[str, List[str]]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Runs the graph.
+
+        Args:
+            task (str): The instruction given to every agent node.
+            node_inputs (Optional[Dict[str, Union[str, List[str]]]]): Extra input per node id.
+                A list runs the node's agent once per item, concurrently, and joins the
+                outputs; an empty list runs it once on the task alone, like a node without input.
+
+        Returns:
+            Dict[str, Any]: Outputs per node, start/end/duration per node, total wall
+            time, and the critical path with its duration.
+        """
+        node_inputs = node_inputs or {}
+        remaining = {node_id: len(sources) for node_id, sources in self.upstream.items()}
+        outputs: Dict[str, Any] = {}
+        timings: Dict[str, Dict[str, float]] = {}
+        run_start = time.perf_counter()
+
+        def execute(node_id: str) -> Any:
+            start = time.perf_counter() - run_start
+            upstream_outputs = {source: outputs[source] for source in self.upstream[node_id]}
+            result = self._run_node(node_id, task, node_inputs.get(node_id), upstream_outputs)
+            end = time.perf_counter() - run_start
+            timings[node_id] = {"start": start, "end": end, "duration": end - start}
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {
+                executor.submit(execute, node_id): node_id
+                for node_id in self.order
+                if remaining[node_id] == 0
+            }
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node_id = running.pop(future)
+                    outputs[node_id] = future.result()
+                    for target in self.downstream[node_id]:
+                        remaining[target] -= 1
+                        if remaining[target] == 0:
+                            running[executor.submit(execute, target)] = target
+
+        path, path_time = self._critical_path(timings)
+        return {
+            "outputs": outputs,
+            "timings": timings,
+            "wall_time": time.perf_counter() - run_start,
+            "critical_path": path,
+            "critical_path_time": path_time,
+        }
+
+    def _critical_path(self, timings: Dict[str, Dict[str, float]]) -> Tuple[List[str], float]:
+        # Longest chain of node durations through the DAG
+        best: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for node_id in self.order:
+            parent = max(self.upstream[node_id], key=lambda s: best[s], default=None)
+            best[node_id] = timings[node_id]["duration"] + (best[parent] if parent else 0.0)
+            previous[node_id] = parent
+
+        node_id = max(best, key=best.get, default=None)
+        path_time = best.get(node_id, 0.0)
+        path = []
+        while node_id is not None:
+            path.append(node_id)
+            node_id = previous[node_id]
+        return list(reversed(path)), path_time
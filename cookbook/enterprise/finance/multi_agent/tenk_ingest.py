@@ -0,0 +1,231 @@
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from PyPDF2 import PdfReader
+
+# Shared helpers such as agent_calls live with the workshop recipes
+WORKSHOP_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../../workshops/sep_6_workshop")
+)
+if WORKSHOP_DIR not in sys.path:
+    sys.path.append(WORKSHOP_DIR)
+
+from agent_calls import run_isolated
+from prompt_budget import count_tokens
+
+# 10-K items and the section key each one is filed under
+ITEM_PATTERN = re.compile(
+    r"^\s*item\s+(1a|1b|1c|1|2|3|4|5|6|7a|7|8|9a|9b|9c|9|10|11|12|13|14|15|16)\b[.:\s]",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Sentence boundaries an oversized single-line paragraph is split at
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;])\s+")
+
+# Which 10-K items each analysis agent needs to see
+DEFAULT_ROUTING = {
+    "FinancialStatementsExpert": ["item_8"],
+    "ManagementDiscussionReviewer": ["item_7", "item_7a"],
+    "RiskAssessmentAnalyst": ["item_1a"],
+}
+
+
+def _extract_page_range(args: Tuple[str, int, int]) -> List[str]:
+    file_path, start, end = args
+    reader = PdfReader(file_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def extract_pages(
+    file_path: str, max_workers: Optional[int] = None, pages_per_task: int = 16
+) -> Iterator[str]:
+    """
+    Extracts the text of every page of a PDF using a process pool.
+
+    Each worker opens the file itself and extracts a contiguous range of pages,
+    so only text crosses process boundaries. Pages are yielded in order as soon
+    as their range is done.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        max_workers (Optional[int]): Number of worker processes. Defaults to the CPU count.
+        pages_per_task (int): Number of pages each worker extracts per task.
+
+    Yields:
+        str: The text of each page, in page order.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"PDF file not found: {file_path}")
+
+    page_count = len(PdfReader(file_path).pages)
+    ranges = [
+        (file_path, start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    ]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for pages in executor.map(_extract_page_range, ranges):
+            yield from pages
+
+
+def split_items(text: str) -> Dict[str, str]:
+    """
+    Splits 10-K text into its items (Item 1A Risk Factors, Item 7 MD&A, Item 8 ...).
+
+    Item headings also appear in the table of contents and in cross-references,
+    so when an item heading occurs several times the longest span is kept.
+
+    Args:
+        text (str): The full text of the 10-K.
+
+    Returns:
+        Dict[str, str]: Section text keyed by item, e.g. "item_1a", "item_7", "item_8".
+    """
+    matches = list(ITEM_PATTERN.finditer(text))
+    sections: Dict[str, str] = {}
+
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+        key = f"item_{match.group(1).lower()}"
+        body = text[match.start() : end].strip()
+        if len(body) > len(sections.get(key, "")):
+            sections[key] = body
+
+    return sections
+
+
+def _split_line(line: str, max_tokens: int) -> List[str]:
+    # Sentences first; a sentence still over budget is cut by characters
+    pieces: List[str] = []
+    for sentence in SENTENCE_BOUNDARY.split(line):
+        while sentence and count_tokens(sentence) > max_tokens:
+            size = max(1, len(sentence) * max_tokens // count_tokens(sentence))
+            while size > 1 and count_tokens(sentence[:size]) > max_tokens:
+                size = int(size * 0.9)
+            pieces.append(sentence[:size])
+            sentence = sentence[size:]
+        if sentence:
+            pieces.append(sentence)
+    return pieces
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """
+    Splits text into chunks of at most `max_tokens`, breaking on paragraph boundaries.
+
+    A single paragraph longer than the budget is split on line boundaries
+    instead, and a single line longer than the budget on sentence boundaries,
+    or by characters when one sentence alone is over budget.
+
+    Args:
+        text (str): The text to split.
+        max_tokens (int): Token budget per chunk.
+
+    Returns:
+        List[str]: The chunks, in order.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    separator_tokens = count_tokens("\n\n")
+
+    paragraphs = [p for p in re.split(r"\n\s*\n", text) if p.strip()]
+    for paragraph in paragraphs:
+        tokens = count_tokens(paragraph)
+        if tokens > max_tokens and "\n" in paragraph.strip():
+            # Oversized paragraph (usually a table): fall back to its lines
+            line_chunks = chunk_text(paragraph.replace("\n", "\n\n"), max_tokens)
+            pieces = [(piece, count_tokens(piece)) for piece in line_chunks]
+        elif tokens > max_tokens:
+            pieces = [(piece, count_tokens(piece)) for piece in _split_line(paragraph.strip(), max_tokens)]
+        else:
+            pieces = [(paragraph, tokens)]
+
+        for piece, piece_tokens in pieces:
+            # Pieces are joined with a blank line, which costs tokens of its own
+            if current and current_tokens + separator_tokens + piece_tokens > max_tokens:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current_tokens += piece_tokens + (separator_tokens if current else 0)
+            current.append(piece)
+
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def ingest_10k(
+    file_path: str,
+    routing: Optional[Dict[str, List[str]]] = None,
+    max_tokens: int = 6000,
+    max_workers: Optional[int] = None,
+) -> Dict[str, List[str]]:
+    """
+    Extracts a 10-K PDF and routes token-budgeted chunks of each item to the agent that needs it.
+
+    Args:
+        file_path (str): Path to the 10-K PDF.
+        routing (Optional[Dict[str, List[str]]]): Item keys per agent name. Defaults to DEFAULT_ROUTING.
+        max_tokens (int): Token budget per chunk.
+        max_workers (Optional[int]): Number of extraction processes.
+
+    Returns:
+        Dict[str, List[str]]: The chunks each agent should analyze, keyed by agent name.
+    """
+    routing = routing or DEFAULT_ROUTING
+    text = "\n".join(extract_pages(file_path, max_workers=max_workers))
+    sections = split_items(text)
+
+    return {
+        agent_name: [
+            chunk
+            for item in items
+            if item in sections
+            for chunk in chunk_text(sections[item], max_tokens)
+        ]
+        for agent_name, items in routing.items()
+    }
+
+
+def run_routed(
+    agents: List[Any],
+    routed: Dict[str, List[str]],
+    instruction: str,
+    max_workers: int = 8,
+) -> Dict[str, List[str]]:
+    """
+    Runs every agent concurrently on its own chunks only.
+
+    Each chunk is a separate `run_isolated` call, so no chunk sees another.
+
+    Args:
+        agents (List[Any]): Agents exposing `agent_name` and `run(task)`.
+        routed (Dict[str, List[str]]): Chunks keyed by agent name, as returned by `ingest_10k`.
+        instruction (str): Instruction placed before each chunk.
+        max_workers (int): Number of concurrent agent calls.
+
+    Returns:
+        Dict[str, List[str]]: Each agent's outputs, one per chunk, in chunk order.
+    """
+    jobs = [
+        (agent, chunk)
+        for agent in agents
+        for chunk in routed.get(agent.agent_name, [])
+    ]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        outputs = list(
+            executor.map(
+                lambda job: run_isolated(job[0], f"{instruction}\n\n{job[1]}"),
+                jobs,
+            )
+        )
+
+    results: Dict[str, List[str]] = {agent.agent_name: [] for agent in agents}
+    for (agent, _), output in zip(jobs, outputs):
+        results[agent.agent_name].append(output)
+    return results
@@ -0,0 +1,142 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+# Shared helpers such as agent_calls live with the workshop recipes
+WORKSHOP_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../../workshops/sep_6_workshop")
+)
+if WORKSHOP_DIR not in sys.path:
+    sys.path.append(WORKSHOP_DIR)
+
+from agent_calls import isolated_prompt, run_isolated
+from prompt_budget import count_tokens
+
+MAP_INSTRUCTION = "Analyze this section of the 10-K report and summarize your findings:"
+REDUCE_INSTRUCTION = (
+    "Merge these partial analyses of the same 10-K into one analysis. "
+    "Keep every key metric, risk and red flag, and remove repetition:"
+)
+SUMMARY_INSTRUCTION = "Consolidate these 10-K findings into a summary report:"
+
+
+class _PhaseStats:
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.wall_time = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "wall_time": self.wall_time,
+        }
+
+
+def _run_all(
+    jobs: List[Tuple[Any, str]], stats: _PhaseStats, max_workers: int
+) -> List[str]:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        outputs = list(executor.map(lambda job: run_isolated(job[0], job[1]), jobs))
+
+    stats.calls += len(jobs)
+    # Counted on what is sent: the agent's system prompt plus the task
+    stats.prompt_tokens += sum(count_tokens(isolated_prompt(agent, prompt)) for agent, prompt in jobs)
+    stats.completion_tokens += sum(count_tokens(output) for output in outputs)
+    stats.wall_time += time.perf_counter() - start
+    return outputs
+
+
+def map_reduce_10k(
+    experts: List[Any],
+    summary_agent: Any,
+    routed: Dict[str, List[str]],
+    fan_in: int = 4,
+    max_workers: int = 8,
+) -> Dict[str, Any]:
+    """
+    Analyzes a chunked 10-K with a map phase, a hierarchical reduce phase and a final summary.
+
+    Map: every expert summarizes each of its chunks, all concurrently.
+    Reduce: each expert merges its partial summaries `fan_in` at a time, level by
+    level, until one analysis per expert remains. Merges at the same level run
+    concurrently. Summary: `summary_agent` writes the report from the merged
+    analyses, so no agent ever receives the raw filing as one prompt.
+
+    Every call goes through `run_isolated`, so a call sees only its own chunk
+    or partials, never the agent's earlier calls. Token counts are estimated
+    with `count_tokens` on the prompts as sent (system prompt plus task) and
+    on the outputs.
+
+    Args:
+        experts (List[Any]): Agents exposing `agent_name` and `run(task)`.
+        summary_agent (Any): Agent that writes the final report.
+        routed (Dict[str, List[str]]): Chunks keyed by agent name, as returned by `ingest_10k`.
+        fan_in (int): Number of partial summaries merged per reduce call.
+        max_workers (int): Number of concurrent agent calls.
+
+    Returns:
+        Dict[str, Any]: The report, each expert's merged analysis, and per-phase
+        calls, prompt/completion tokens and wall time.
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2.")
+
+    phases = {"map": _PhaseStats(), "reduce": _PhaseStats(), "summary": _PhaseStats()}
+
+    # Map: one call per (expert, chunk)
+    jobs = [
+        (agent, f"{MAP_INSTRUCTION}\n\n{chunk}")
+        for agent in experts
+        for chunk in routed.get(agent.agent_name, [])
+    ]
+    outputs = _run_all(jobs, phases["map"], max_workers)
+
+    partials: Dict[str, List[str]] = {agent.agent_name: [] for agent in experts}
+    for (agent, _), output in zip(jobs, outputs):
+        partials[agent.agent_name].append(output)
+
+    # Reduce: merge fan_in partials at a time until every expert has one analysis
+    agents_by_name = {agent.agent_name: agent for agent in experts}
+    while any(len(summaries) > 1 for summaries in partials.values()):
+        jobs, slots = [], []
+        next_partials: Dict[str, List[str]] = {}
+        for name, summaries in partials.items():
+            next_partials[name] = []
+            for i in range(0, len(summaries), fan_in):
+                group = summaries[i : i + fan_in]
+                if len(group) == 1:
+                    # A leftover single summary is carried to the next level as-is
+                    next_partials[name].append(group[0])
+                    continue
+                prompt = f"{REDUCE_INSTRUCTION}\n\n" + "\n\n---\n\n".join(group)
+                jobs.append((agents_by_name[name], prompt))
+                slots.append((name, len(next_partials[name])))
+                next_partials[name].append("")
+
+        outputs = _run_all(jobs, phases["reduce"], max_workers)
+        for (name, index), output in zip(slots, outputs):
+            next_partials[name][index] = output
+        partials = next_partials
+
+    analyses = {name: summaries[0] for name, summaries in partials.items() if summaries}
+
+    # Summary: one call over the merged analyses
+    findings = "\n\n".join(f"{name}:\n{analysis}" for name, analysis in analyses.items())
+    (report,) = _run_all(
+        [(summary_agent, f"{SUMMARY_INSTRUCTION}\n\n{findings}")],
+        phases["summary"],
+        max_workers,
+    )
+
+    return {
+        "output": report,
+        "analyses": analyses,
+        "phases": {name: stats.as_dict() for name, stats in phases.items()},
+    }
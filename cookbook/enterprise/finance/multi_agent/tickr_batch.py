@@ -0,0 +1,255 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Shared helpers such as agent_calls live with the workshop recipes
+WORKSHOP_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../../workshops/sep_6_workshop")
+)
+if WORKSHOP_DIR not in sys.path:
+    sys.path.append(WORKSHOP_DIR)
+
+from agent_calls import run_isolated
+
+# Columns stored per symbol; dates are kept as int64 days since the epoch
+COLUMNS = ["close", "volume"]
+
+# Source signature: (symbol, start, end) -> DataFrame with a DatetimeIndex and close/volume columns
+PriceSource = Callable[[str, str, str], pd.DataFrame]
+
+ANALYSIS_INSTRUCTION = (
+    "Conduct an analysis on this stock from its indicator digest and say whether it's a buy or not and why."
+)
+
+
+def yfinance_source(symbol: str, start: str, end: str) -> pd.DataFrame:
+    """
+    Downloads daily price history from Yahoo Finance (requires `yfinance`).
+    """
+    import yfinance
+
+    history = yfinance.Ticker(symbol).history(start=start, end=end, auto_adjust=True)
+    return history.rename(columns={"Close": "close", "Volume": "volume"})[COLUMNS]
+
+
+def csv_source(directory: str) -> PriceSource:
+    """
+    Returns a source that reads `<directory>/<SYMBOL>.csv` with Date, Close and Volume columns.
+
+    Args:
+        directory (str): Directory of per-symbol CSV files, e.g. from `tickr_fixtures.py`.
+
+    Returns:
+        PriceSource: The source function.
+    """
+
+    def source(symbol: str, start: str, end: str) -> pd.DataFrame:
+        frame = pd.read_csv(
+            os.path.join(directory, f"{symbol}.csv"),
+            usecols=["Date", "Close", "Volume"],
+            parse_dates=["Date"],
+            index_col="Date",
+        )
+        frame = frame.rename(columns={"Close": "close", "Volume": "volume"})
+        return frame.loc[start:end]
+
+    return source
+
+
+class PriceStore:
+    """
+    An on-disk columnar cache of price history, read back as memory-mapped NumPy arrays.
+
+    Each (symbol, start, end) is stored as one `.npy` file per column under
+    `<directory>/<symbol>/<start>_<end>/`, so a second run maps the files
+    instead of downloading again, and only the pages actually read are loaded.
+
+    Args:
+        directory (str): Root directory of the store.
+    """
+
+    def __init__(self, directory: str = "tickr_price_store"):
+        self.directory = directory
+
+    def _path(self, symbol: str, start: str, end: str) -> str:
+        return os.path.join(self.directory, symbol, f"{start}_{end}")
+
+    def load(self, symbol: str, start: str, end: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Returns the memory-mapped columns for the key, or None if it is not stored.
+        """
+        path = self._path(symbol, start, end)
+        if not os.path.exists(os.path.join(path, "dates.npy")):
+            return None
+        return {
+            column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode="r")
+            for column in ["dates"] + COLUMNS
+        }
+
+    def save(self, symbol: str, start: str, end: str, frame: pd.DataFrame) -> None:
+        path = self._path(symbol, start, end)
+        os.makedirs(path, exist_ok=True)
+        index = pd.DatetimeIndex(frame.index).tz_localize(None).normalize()
+        columns = {"dates": index.values.astype("datetime64[D]").astype(np.int64)}
+        for column in COLUMNS:
+            columns[column] = frame[column].to_numpy(dtype=np.float64)
+        # Written last, so a half-written entry is never seen as complete
+        for column in COLUMNS + ["dates"]:
+            tmp_path = os.path.join(path, f"{column}.tmp.npy")
+            np.save(tmp_path, columns[column])
+            os.replace(tmp_path, os.path.join(path, f"{column}.npy"))
+
+
+def download_all(
+    symbols: List[str],
+    start: str,
+    end: str,
+    source: PriceSource = yfinance_source,
+    store: Optional[PriceStore] = None,
+    max_workers: int = 16,
+) -> Tuple[Dict[str, Dict[str, np.ndarray]], Dict[str, str]]:
+    """
+    Loads price history for every symbol, downloading the ones not in the store concurrently.
+
+    Args:
+        symbols (List[str]): Ticker symbols.
+        start (str): First date, e.g. "2024-01-01".
+        end (str): Last date.
+        source (PriceSource): Where missing history is downloaded from.
+        store (Optional[PriceStore]): The cache. Defaults to `tickr_price_store/`.
+        max_workers (int): Concurrent downloads.
+
+    Returns:
+        Tuple[Dict[str, Dict[str, np.ndarray]], Dict[str, str]]: Columns per symbol,
+        and the error for each symbol that could not be loaded.
+    """
+    store = store or PriceStore()
+
+    def load(symbol: str) -> Dict[str, np.ndarray]:
+        columns = store.load(symbol, start, end)
+        if columns is None:
+            frame = source(symbol, start, end)
+            if frame.empty:
+                raise ValueError(f"No price history for {symbol} between {start} and {end}.")
+            store.save(symbol, start, end, frame)
+            columns = store.load(symbol, start, end)
+        return columns
+
+    prices, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {symbol: executor.submit(load, symbol) for symbol in dict.fromkeys(symbols)}
+        for symbol, future in futures.items():
+            try:
+                prices[symbol] = future.result()
+            except Exception as e:
+                errors[symbol] = f"{type(e).__name__}: {e}"
+    return prices, errors
+
+
+def compute_indicators(prices: Dict[str, Dict[str, np.ndarray]]) -> pd.DataFrame:
+    """
+    Computes the latest technical indicators for all symbols at once.
+
+    The closes and volumes are aligned into date x symbol matrices, and every
+    indicator is a rolling or element-wise operation over the whole matrix.
+
+    Args:
+        prices (Dict[str, Dict[str, np.ndarray]]): Output of `download_all`.
+
+    Returns:
+        pd.DataFrame: One row per symbol with the last close, 1/5/20-day returns,
+        SMA 20/50 and the close's distance from them, RSI 14, 20-day annualized
+        volatility, distance from the 252-day high and low, and 20-day average volume.
+    """
+    close = pd.DataFrame(
+        {s: pd.Series(c["close"], index=c["dates"]) for s, c in prices.items()}
+    ).sort_index().ffill()
+    volume = pd.DataFrame(
+        {s: pd.Series(c["volume"], index=c["dates"]) for s, c in prices.items()}
+    ).sort_index()
+
+    returns = close.pct_change(fill_method=None)
+    sma20 = close.rolling(20).mean()
+    sma50 = close.rolling(50).mean()
+
+    # Wilder's RSI: exponential averages of gains and losses with alpha 1/14
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False).mean()
+    rsi = 100 - 100 / (1 + gain / loss.replace(0, np.nan))
+
+    last = close.iloc[-1]
+    high = close.rolling(252, min_periods=1).max().iloc[-1]
+    low = close.rolling(252, min_periods=1).min().iloc[-1]
+    indicators = pd.DataFrame(
+        {
+            "close": last,
+            "return_1d": close.pct_change(1, fill_method=None).iloc[-1],
+            "return_5d": close.pct_change(5, fill_method=None).iloc[-1],
+            "return_20d": close.pct_change(20, fill_method=None).iloc[-1],
+            "sma_20": sma20.iloc[-1],
+            "sma_50": sma50.iloc[-1],
+            "vs_sma_20": last / sma20.iloc[-1] - 1,
+            "vs_sma_50": last / sma50.iloc[-1] - 1,
+            "rsi_14": rsi.iloc[-1],
+            "volatility_20d": returns.rolling(20).std().iloc[-1] * np.sqrt(252),
+            "from_high": last / high - 1,
+            "from_low": last / low - 1,
+            "avg_volume_20d": volume.rolling(20, min_periods=1).mean().iloc[-1],
+        }
+    )
+    indicators.index.name = "symbol"
+    return indicators
+
+
+def digest(symbol: str, row: pd.Series) -> str:
+    """
+    Renders one symbol's indicators as a short text digest for the LLM.
+    """
+
+    def pct(value: float) -> str:
+        return "n/a" if pd.isna(value) else f"{value:+.1%}"
+
+    def num(value: float, fmt: str = ".2f") -> str:
+        return "n/a" if pd.isna(value) else format(value, fmt)
+
+    return (
+        f"{symbol}: close {num(row['close'])}; returns 1d {pct(row['return_1d'])}, "
+        f"5d {pct(row['return_5d'])}, 20d {pct(row['return_20d'])}; "
+        f"SMA20 {num(row['sma_20'])} ({pct(row['vs_sma_20'])}), "
+        f"SMA50 {num(row['sma_50'])} ({pct(row['vs_sma_50'])}); RSI14 {num(row['rsi_14'], '.1f')}; "
+        f"20d volatility {num(row['volatility_20d'] * 100, '.1f')}% annualized; "
+        f"{pct(row['from_high'])} from 52w high, {pct(row['from_low'])} from 52w low; "
+        f"avg volume 20d {num(row['avg_volume_20d'], ',.0f')}"
+    )
+
+
+def analyze_symbols(
+    agent: Any,
+    indicators: pd.DataFrame,
+    instruction: str = ANALYSIS_INSTRUCTION,
+    max_workers: int = 8,
+) -> Dict[str, str]:
+    """
+    Sends each symbol's digest to the agent, with the calls running concurrently.
+
+    Each symbol is a separate `run_isolated` call, so no symbol sees another's
+    digest or analysis in the agent's history.
+
+    Args:
+        agent (Any): An agent exposing `system_prompt`, `llm` and `run(task)`.
+        indicators (pd.DataFrame): Output of `compute_indicators`.
+        instruction (str): The analysis request placed before each digest.
+        max_workers (int): Concurrent LLM calls.
+
+    Returns:
+        Dict[str, str]: The analysis per symbol.
+    """
+    tasks = {symbol: f"{instruction}\n\n{digest(symbol, row)}" for symbol, row in indicators.iterrows()}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(lambda task: run_isolated(agent, task), tasks.values())
+        return dict(zip(tasks, results))
@@ -0,0 +1,69 @@
+import os
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+
+def write_fixture_csvs(
+    directory: str,
+    symbols: List[str],
+    start: str = "2023-01-02",
+    days: int = 400,
+    seed: int = 0,
+) -> None:
+    """
+    Writes a deterministic random-walk price history per symbol as `<directory>/<SYMBOL>.csv`.
+
+    The files have Yahoo Finance's Date, Open, High, Low, Close and Volume columns
+    and can be read with `tickr_batch.csv_source`.
+
+    Args:
+        directory (str): Where the CSV files are written.
+        symbols (List[str]): Symbols to generate.
+        start (str): First business day.
+        days (int): Number of business days per symbol.
+        seed (int): Seed for the random walks.
+    """
+    os.makedirs(directory, exist_ok=True)
+    dates = pd.bdate_range(start, periods=days)
+    rng = np.random.default_rng(seed)
+
+    for symbol in symbols:
+        drift, vol = rng.normal(0.0005, 0.0005), rng.uniform(0.01, 0.04)
+        close = rng.uniform(10, 500) * np.exp(np.cumsum(rng.normal(drift, vol, days)))
+        spread = close * rng.uniform(0.0, vol, days)
+        pd.DataFrame(
+            {
+                "Date": dates.strftime("%Y-%m-%d"),
+                "Open": (close + rng.normal(0, 0.5, days) * spread).round(2),
+                "High": (close + spread).round(2),
+                "Low": (close - spread).round(2),
+                "Close": close.round(2),
+                "Volume": rng.integers(100_000, 50_000_000, days),
+            }
+        ).to_csv(os.path.join(directory, f"{symbol}.csv"), index=False)
+
+
+# Example usage: load and score 300 fixture symbols, cold and then from the store
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from tickr_batch import PriceStore, compute_indicators, csv_source, digest, download_all
+
+    with tempfile.TemporaryDirectory() as workdir:
+        symbols = [f"SYM{i:03d}" for i in range(300)]
+        write_fixture_csvs(os.path.join(workdir, "csv"), symbols)
+        source = csv_source(os.path.join(workdir, "csv"))
+        store = PriceStore(os.path.join(workdir, "store"))
+
+        for label in ("Cold", "Cached"):
+            start = time.perf_counter()
+            prices, errors = download_all(symbols, "2023-01-01", "2024-12-31", source=source, store=store)
+            print(f"{label} load of {len(prices)} symbols: {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        indicators = compute_indicators(prices)
+        print(f"Indicators for {len(indicators)} symbols: {time.perf_counter() - start:.3f}s")
+        print(digest("SYM000", indicators.loc["SYM000"]))
@@ -0,0 +1,150 @@
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+_WORDS = (
+    "model release safety research funding partnership chips data center enterprise customers "
+    "regulators policy benchmark open weights agents reasoning pricing launch revenue compute "
+    "training inference startup investors board developers platform api update announced"
+).split()
+
+
+def _story(rng: random.Random, topic: str, n: int) -> Dict[str, str]:
+    body = " ".join(rng.choice(_WORDS) for _ in range(80))
+    return {
+        "title": f"{topic} story {n}: {' '.join(rng.choice(_WORDS) for _ in range(6))}",
+        "description": f"{topic} {body[:160]}",
+        "content": f"{body} [+{rng.randint(1000, 9000)} chars]",
+    }
+
+
+class NewsFixtureHandler(BaseHTTPRequestHandler):
+    """
+    Serves `/v2/everything` like NewsAPI, from the generated stories in `server.stories`.
+
+    Every request is counted in `server.requests`.
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if not url.path.endswith("/everything"):
+            self._reply(404, {"status": "error", "message": "not found"})
+            return
+
+        topic = parse_qs(url.query).get("q", [""])[0]
+        with self.server.lock:
+            self.server.requests += 1
+            articles = list(self.server.stories.get(topic, []))
+        self._reply(200, {"status": "ok", "totalResults": len(articles), "articles": articles})
+
+    def _reply(self, status: int, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def publish(server: ThreadingHTTPServer, topic: str, count: int, syndicate_to: List[str] = ()) -> None:
+    """
+    Adds `count` new stories for a topic, as if an hour of news had passed.
+
+    Args:
+        server (ThreadingHTTPServer): A server from `start_fixture_server`.
+        topic (str): The topic the stories are found under.
+        count (int): Number of stories.
+        syndicate_to (List[str]): Topics that also get a copy of each story under
+            another outlet's URL, with a different content-length marker.
+    """
+    with server.lock:
+        for _ in range(count):
+            server.published += 1
+            n = server.published
+            story = _story(server.rng, topic, n)
+            server.stories.setdefault(topic, []).insert(
+                0,
+                {
+                    "source": {"name": "Fixture Wire"},
+                    "url": f"https://news.example.com/{n}",
+                    "publishedAt": f"2026-01-01T{n % 24:02d}:00:00Z",
+                    **story,
+                },
+            )
+            for other in syndicate_to:
+                copy = dict(story, content=story["content"].rsplit("[+", 1)[0] + "[+4321 chars]")
+                server.stories.setdefault(other, []).insert(
+                    0,
+                    {
+                        "source": {"name": "Fixture Daily"},
+                        "url": f"https://daily.example.com/{n}",
+                        "publishedAt": f"2026-01-01T{n % 24:02d}:05:00Z",
+                        **copy,
+                    },
+                )
+
+
+def start_fixture_server(port: int = 0, seed: int = 0) -> ThreadingHTTPServer:
+    """
+    Starts the fixture server on a background thread, with no stories published yet.
+
+    Args:
+        port (int): Port to listen on. 0 picks a free port.
+        seed (int): Seed for the generated stories.
+
+    Returns:
+        ThreadingHTTPServer: The running server. Its API base is `http://127.0.0.1:<server.server_port>/v2`.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), NewsFixtureHandler)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.published = 0
+    server.stories = {}
+    server.rng = random.Random(seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# Example usage: two "hourly" runs over overlapping topics, counting the LLM calls
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    server = start_fixture_server()
+    os.environ["NEWSAPI_URL"] = f"http://127.0.0.1:{server.server_port}/v2"
+
+    # Imported after the environment points at the fixture server
+    from news_index import ArticleIndex, IncrementalNewsRunner
+
+    class CountingAgent:
+        calls = 0
+
+        def run(self, task: str) -> str:
+            CountingAgent.calls += 1
+            return f"Summary of: {task.splitlines()[2][:60]}"
+
+    publish(server, "OpenAI", 20, syndicate_to=["Anthropic"])
+    publish(server, "Anthropic", 20)
+
+    with tempfile.TemporaryDirectory() as directory:
+        runner = IncrementalNewsRunner(
+            CountingAgent(), "fixture-key", index=ArticleIndex(os.path.join(directory, "news_index.json"))
+        )
+        for hour in range(2):
+            calls_before = CountingAgent.calls
+            results = runner.run_concurrently(["OpenAI", "Anthropic"])
+            articles = sum(len(result["articles"]) for result in results.values())
+            print(
+                f"Hour {hour}: {articles} articles, {CountingAgent.calls - calls_before} summarized, "
+                f"stats {[result['stats'] for result in results.values()]}"
+            )
+            publish(server, "OpenAI", 2)
+            publish(server, "Anthropic", 1)
+
+    server.shutdown()
@@ -0,0 +1,392 @@
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+# Shared helpers such as agent_calls live with the workshop recipes
+WORKSHOP_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../../workshops/sep_6_workshop")
+)
+if WORKSHOP_DIR not in sys.path:
+    sys.path.append(WORKSHOP_DIR)
+
+from agent_calls import run_isolated
+
+# Can be pointed at the local fixture server (see news_fixture_server.py)
+NEWSAPI_URL = os.getenv("NEWSAPI_URL", "https://newsapi.org/v2")
+
+SUMMARY_INSTRUCTION = (
+    "Summarize the news article below in 2-3 sentences for a business reader. "
+    "Focus on what happened, who is involved and why it matters."
+)
+
+SIMHASH_BITS = 64
+
+# The fingerprint is split into this many bands; two fingerprints within
+# `bands - 1` bits of each other are guaranteed to share at least one band
+SIMHASH_BANDS = 4
+
+
+def fetch_articles(
+    topic: str,
+    api_key: str,
+    page_size: int = 50,
+    session: Optional[requests.Session] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetches the latest articles for a topic from NewsAPI's `/everything` endpoint.
+
+    Args:
+        topic (str): The search query.
+        api_key (str): NewsAPI key.
+        page_size (int): Number of articles to request.
+        session (Optional[requests.Session]): Session to reuse connections with.
+
+    Returns:
+        List[Dict[str, Any]]: Articles with url, title, source, published_at and text.
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails.
+    """
+    session = session or requests.Session()
+    response = session.get(
+        f"{NEWSAPI_URL}/everything",
+        params={"q": topic, "sortBy": "publishedAt", "pageSize": page_size, "language": "en"},
+        headers={"X-Api-Key": api_key},
+        timeout=30,
+    )
+    response.raise_for_status()
+
+    articles = []
+    for item in response.json().get("articles", []):
+        if not item.get("url"):
+            continue
+        parts = (item.get("title"), item.get("description"), item.get("content"))
+        text = "\n\n".join(part for part in parts if part)
+        articles.append(
+            {
+                "url": item["url"],
+                "title": item.get("title") or "",
+                "source": (item.get("source") or {}).get("name", ""),
+                "published_at": item.get("publishedAt", ""),
+                "text": text,
+            }
+        )
+    return articles
+
+
+def _normalize(text: str) -> str:
+    # NewsAPI truncates content with a "[+1234 chars]" marker that changes between fetches
+    text = re.sub(r"\[\+\d+ chars\]", "", text)
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def content_hash(text: str) -> str:
+    """
+    Returns a hash of the article text that ignores case, punctuation and whitespace.
+    """
+    return hashlib.sha256(_normalize(text).encode("utf-8")).hexdigest()
+
+
+def simhash(text: str, bits: int = SIMHASH_BITS, shingle_size: int = 3) -> int:
+    """
+    Computes a SimHash fingerprint of the text from overlapping word shingles.
+
+    Texts that share most of their shingles get fingerprints that differ in only a
+    few bits, so near-duplicates (syndicated copies, light edits) can be found by
+    Hamming distance.
+
+    Args:
+        text (str): The article text.
+        bits (int): Fingerprint size.
+        shingle_size (int): Words per shingle.
+
+    Returns:
+        int: The fingerprint.
+    """
+    words = _normalize(text).split()
+    shingles = [" ".join(words[i : i + shingle_size]) for i in range(max(len(words) - shingle_size + 1, 1))]
+
+    weights = [0] * bits
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=bits // 8).digest(), "big")
+        for bit in range(bits):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    return sum(1 << bit for bit in range(bits) if weights[bit] > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class ArticleIndex:
+    """
+    A local index of the articles already seen, used to skip re-summarizing them.
+
+    Each article is stored by URL with a hash of its normalized text, its SimHash
+    fingerprint, the topics it was found under and its summary. Fingerprints are
+    also bucketed by band, so a near-duplicate lookup only compares against the
+    few articles that share a band instead of the whole index.
+
+    Args:
+        path (Optional[str]): JSON file the index is persisted to.
+        max_distance (int): Largest Hamming distance between two fingerprints that
+            still counts as the same story. Must be below `SIMHASH_BANDS`.
+    """
+
+    def __init__(self, path: Optional[str] = "news_index.json", max_distance: int = 3):
+        if max_distance >= SIMHASH_BANDS:
+            raise ValueError(
+                f"max_distance must be below {SIMHASH_BANDS} for the band lookup to find every match."
+            )
+
+        self.path = path
+        self.max_distance = max_distance
+        self.articles: Dict[str, Dict[str, Any]] = {}
+        self._bands: Dict[Tuple[int, int], set] = {}
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                for url, entry in json.load(file).items():
+                    self._put(url, entry)
+
+    def _band_keys(self, fingerprint: int) -> List[Tuple[int, int]]:
+        width = SIMHASH_BITS // SIMHASH_BANDS
+        mask = (1 << width) - 1
+        return [(band, fingerprint >> (band * width) & mask) for band in range(SIMHASH_BANDS)]
+
+    def _put(self, url: str, entry: Dict[str, Any]) -> None:
+        previous = self.articles.get(url)
+        if previous:
+            for key in self._band_keys(previous["simhash"]):
+                self._bands.get(key, set()).discard(url)
+        self.articles[url] = entry
+        for key in self._band_keys(entry["simhash"]):
+            self._bands.setdefault(key, set()).add(url)
+
+    def find_near_duplicate(self, fingerprint: int, exclude: Optional[str] = None) -> Optional[str]:
+        """
+        Returns the URL of an indexed article within `max_distance` of the fingerprint, if any.
+        """
+        candidates = set()
+        for key in self._band_keys(fingerprint):
+            candidates |= self._bands.get(key, set())
+        candidates.discard(exclude)
+        for url in sorted(candidates):
+            if hamming_distance(fingerprint, self.articles[url]["simhash"]) <= self.max_distance:
+                return url
+        return None
+
+    def classify(self, article: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        """
+        Decides whether an article needs summarizing.
+
+        Args:
+            article (Dict[str, Any]): An article from `fetch_articles`.
+
+        Returns:
+            Tuple[str, Optional[str]]: The status and the indexed URL it matched:
+            "new" (not seen), "changed" (same URL, materially different text),
+            "unchanged" (same URL, same or lightly edited text) or "duplicate"
+            (another URL with near-identical text, e.g. a syndicated copy).
+        """
+        fingerprint = simhash(article["text"])
+        with self._lock:
+            entry = self.articles.get(article["url"])
+            if entry:
+                if entry["content_hash"] == content_hash(article["text"]):
+                    return "unchanged", article["url"]
+                if hamming_distance(fingerprint, entry["simhash"]) <= self.max_distance:
+                    return "unchanged", article["url"]
+                return "changed", article["url"]
+
+            match = self.find_near_duplicate(fingerprint)
+            if match:
+                return "duplicate", match
+            return "new", None
+
+    def add(self, article: Dict[str, Any], topic: str, summary: Optional[str] = None) -> None:
+        """
+        Records an article under a topic, keeping the existing summary unless a new one is given.
+        """
+        with self._lock:
+            entry = dict(self.articles.get(article["url"], {}))
+            entry.update(
+                {
+                    "title": article["title"],
+                    "content_hash": content_hash(article["text"]),
+                    "simhash": simhash(article["text"]),
+                    "topics": sorted(set(entry.get("topics", [])) | {topic}),
+                    "last_seen": time.time(),
+                }
+            )
+            entry.setdefault("first_seen", entry["last_seen"])
+            if summary is not None:
+                entry["summary"] = summary
+            self._put(article["url"], entry)
+
+    def restore(self, url: str, entry: Optional[Dict[str, Any]]) -> None:
+        """
+        Puts back an entry taken before `add`, or removes the URL if it was not indexed then.
+        """
+        with self._lock:
+            if entry is not None:
+                self._put(url, entry)
+            elif url in self.articles:
+                for key in self._band_keys(self.articles.pop(url)["simhash"]):
+                    self._bands.get(key, set()).discard(url)
+
+    def add_topic(self, url: str, topic: str) -> None:
+        with self._lock:
+            entry = self.articles[url]
+            entry["topics"] = sorted(set(entry["topics"]) | {topic})
+            entry["last_seen"] = time.time()
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(self.articles, file)
+            os.replace(tmp_path, self.path)
+
+
+class IncrementalNewsRunner:
+    """
+    Fetches news for several topics and summarizes only the articles not seen before.
+
+    Topics are fetched concurrently. Every article is then checked against the
+    index, in topic order, so a story that appears under two topics or from two
+    outlets is summarized once. New and materially changed articles are
+    summarized concurrently; everything else reuses the summary from the index.
+
+    Each summary is a separate `run_isolated` call, with the agent's system
+    prompt and the article only, so no article is resent with the next one. A
+    failed summary is reported on its article and the article's index entry is
+    put back as it was, so the next run summarizes it again.
+
+    Args:
+        agent (Any): An agent exposing `system_prompt`, `llm` and `run(task)`, used to summarize articles.
+        newsapi_api_key (str): NewsAPI key.
+        index (Optional[ArticleIndex]): The seen-article index. Defaults to `news_index.json`.
+        page_size (int): Articles fetched per topic.
+        max_workers (int): Concurrent fetches and LLM calls.
+    """
+
+    def __init__(
+        self,
+        agent: Any,
+        newsapi_api_key: str,
+        index: Optional[ArticleIndex] = None,
+        page_size: int = 50,
+        max_workers: int = 4,
+    ):
+        self.agent = agent
+        self.newsapi_api_key = newsapi_api_key
+        self.index = index or ArticleIndex()
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.session = requests.Session()
+
+    def _summarize(self, article: Dict[str, Any]) -> str:
+        header = f"{article['title']} ({article['source']}, {article['published_at']})"
+        return run_isolated(self.agent, f"{SUMMARY_INSTRUCTION}\n\n{header}\n\n{article['text']}")
+
+    def _try_summarize(self, article: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        try:
+            return self._summarize(article), None
+        except Exception as e:
+            return None, f"{type(e).__name__}: {e}"
+
+    def run(self, topic: str) -> Dict[str, Any]:
+        """
+        Runs a single topic incrementally. See `run_concurrently`.
+        """
+        return self.run_concurrently([topic])[topic]
+
+    def run_concurrently(self, topics: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Runs several topics, summarizing only new or materially changed articles.
+
+        Args:
+            topics (List[str]): Search queries.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per topic, the articles with their status,
+            summary (fresh or from the index) and error (None unless their summary
+            failed), and counts per status plus "failed".
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            fetched = dict(
+                zip(
+                    topics,
+                    executor.map(
+                        lambda topic: fetch_articles(topic, self.newsapi_api_key, self.page_size, self.session),
+                        topics,
+                    ),
+                )
+            )
+
+        results = {topic: {"articles": [], "stats": {}} for topic in topics}
+        to_summarize: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        # Index entries as they were before this run, put back if their summary fails
+        previous: Dict[str, Optional[Dict[str, Any]]] = {}
+        for topic, articles in fetched.items():
+            for article in articles:
+                if article["url"] in to_summarize:
+                    status, match = "duplicate", article["url"]
+                else:
+                    status, match = self.index.classify(article)
+
+                if status in ("new", "changed"):
+                    to_summarize[article["url"]] = (topic, article)
+                    previous[article["url"]] = self.index.articles.get(article["url"])
+                    # Indexed now, so copies later in this run are caught as duplicates
+                    self.index.add(article, topic)
+                elif status == "unchanged":
+                    self.index.add(article, topic)
+                else:
+                    self.index.add_topic(match, topic)
+
+                results[topic]["articles"].append(
+                    {"url": article["url"], "title": article["title"], "status": status, "match": match}
+                )
+                stats = results[topic]["stats"]
+                stats[status] = stats.get(status, 0) + 1
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            summaries = dict(
+                zip(to_summarize, executor.map(lambda item: self._try_summarize(item[1]), to_summarize.values()))
+            )
+        errors = {}
+        for url, (topic, article) in to_summarize.items():
+            summary, error = summaries[url]
+            if error is None:
+                self.index.add(article, topic, summary=summary)
+            else:
+                errors[url] = error
+                self.index.restore(url, previous[url])
+        self.index.save()
+
+        for topic in topics:
+            stats = results[topic]["stats"]
+            stats["failed"] = 0
+            for article in results[topic]["articles"]:
+                source_url = article["match"] or article["url"]
+                article["error"] = errors.get(source_url)
+                if article["error"]:
+                    article["summary"] = ""
+                    stats["failed"] += 1
+                else:
+                    article["summary"] = self.index.articles.get(source_url, {}).get("summary", "")
+        return results
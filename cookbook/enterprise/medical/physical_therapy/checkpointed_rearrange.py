@@ -0,0 +1,355 @@
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+# Shared helpers such as agent_calls live with the workshop recipes
+WORKSHOP_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../../workshops/sep_6_workshop")
+)
+if WORKSHOP_DIR not in sys.path:
+    sys.path.append(WORKSHOP_DIR)
+
+from agent_calls import run_isolated
+
+# Case statuses
+RUNNING = "running"
+AWAITING_REVIEW = "awaiting_review"
+COMPLETED = "completed"
+REJECTED = "rejected"
+FAILED = "failed"
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    # Replaced atomically, so a crash never leaves a half-written file behind
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+    os.replace(tmp_path, path)
+
+
+class CaseStore:
+    """
+    Persists each case of a checkpointed flow as one JSON file.
+
+    Layout under `directory`:
+
+    - `cases/<case_id>.json`: the case's task, status, step and outputs so far.
+    - `reviews/<case_id>.json`: a reviewer's decision waiting to be applied.
+
+    Reviews are plain files, so any process (a web form, a script, a person
+    with an editor) can answer a case by writing one.
+
+    Args:
+        directory (str): Root directory of the store.
+    """
+
+    def __init__(self, directory: str = "pt_cases"):
+        self.directory = directory
+        self.cases_dir = os.path.join(directory, "cases")
+        self.reviews_dir = os.path.join(directory, "reviews")
+        os.makedirs(self.cases_dir, exist_ok=True)
+        os.makedirs(self.reviews_dir, exist_ok=True)
+
+    def save(self, case: Dict[str, Any]) -> None:
+        case["updated_at"] = time.time()
+        _write_json(os.path.join(self.cases_dir, f"{case['case_id']}.json"), case)
+
+    def exists(self, case_id: str) -> bool:
+        return os.path.exists(os.path.join(self.cases_dir, f"{case_id}.json"))
+
+    def load(self, case_id: str) -> Dict[str, Any]:
+        """
+        Raises:
+            KeyError: If the case does not exist.
+        """
+        path = os.path.join(self.cases_dir, f"{case_id}.json")
+        if not os.path.exists(path):
+            raise KeyError(f"Case '{case_id}' not found.")
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+
+    def list_cases(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        cases = []
+        for filename in sorted(os.listdir(self.cases_dir)):
+            if filename.endswith(".json"):
+                case = self.load(filename[: -len(".json")])
+                if status is None or case["status"] == status:
+                    cases.append(case)
+        return cases
+
+    def submit_review(self, case_id: str, review: str, approved: bool = True) -> None:
+        """
+        Records a reviewer's decision for a case waiting at the human step.
+
+        Args:
+            case_id (str): The case.
+            review (str): Notes or corrections passed to the following agents.
+            approved (bool): False stops the case instead of continuing it.
+        """
+        _write_json(
+            os.path.join(self.reviews_dir, f"{case_id}.json"),
+            {"review": review, "approved": approved, "submitted_at": time.time()},
+        )
+
+    def pending_reviews(self) -> Dict[str, Dict[str, Any]]:
+        reviews = {}
+        for filename in sorted(os.listdir(self.reviews_dir)):
+            if filename.endswith(".json") and ".tmp" not in filename:
+                with open(os.path.join(self.reviews_dir, filename), encoding="utf-8") as file:
+                    reviews[filename[: -len(".json")]] = json.load(file)
+        return reviews
+
+    def discard_review(self, case_id: str) -> None:
+        path = os.path.join(self.reviews_dir, f"{case_id}.json")
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class CheckpointedRearrange:
+    """
+    Runs an AgentRearrange flow whose human step is a durable checkpoint instead of a blocking prompt.
+
+    When a case reaches the human step (`H`), its state is written to the
+    `CaseStore` and the call returns, so nothing is held in memory or on a thread
+    while the reviewer takes minutes or days. When the review arrives, through
+    a file in the store or a direct `resume` call (e.g. from a local queue
+    consumer), the case is loaded and continues with the review appended to the
+    previous output. Agents in a comma-separated step run concurrently. Cases
+    are checkpointed after every step, so `recover` can restart a case that was
+    interrupted mid-flow from its last completed step.
+
+    Each agent is called through `run_isolated`, with its system prompt and the
+    case's input only, so no conversation history is shared between patients'
+    cases. Agents with tools, or without a model, use `agent.run`, one case at
+    a time, with the history each run added removed again.
+
+    Args:
+        agents (List[Any]): Agents exposing `agent_name`, `system_prompt`, `llm` and `run(task)`.
+        flow (str): The flow, e.g. "SymptomAnalyzer -> H -> TreatmentAdvisor, RecoveryPlanner".
+        store (Optional[CaseStore]): Where cases and reviews are kept. Defaults to `pt_cases/`.
+        human_token (str): The flow step that waits for a human.
+        max_workers (int): Maximum number of agents running at the same time, across cases.
+    """
+
+    def __init__(
+        self,
+        agents: List[Any],
+        flow: str,
+        store: Optional[CaseStore] = None,
+        human_token: str = "H",
+        max_workers: int = 8,
+    ):
+        self.agents = {agent.agent_name: agent for agent in agents}
+        self.flow = flow
+        self.store = store or CaseStore()
+        self.human_token = human_token
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._case_locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+        self.steps = []
+        for step in flow.split("->"):
+            names = [name.strip() for name in step.split(",") if name.strip()]
+            if not names:
+                raise ValueError(f"Flow '{flow}' contains an empty step.")
+            for name in names:
+                if name != human_token and name not in self.agents:
+                    raise ValueError(f"Agent '{name}' in flow is not in the agents list.")
+            if human_token in names and len(names) > 1:
+                raise ValueError(f"The human step '{human_token}' cannot run in parallel with agents.")
+            self.steps.append(names)
+
+    def _case_lock(self, case_id: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._case_locks.setdefault(case_id, threading.Lock())
+
+    def _advance(self, case: Dict[str, Any]) -> Dict[str, Any]:
+        # Runs steps from the case's current one until the human step or the end
+        while case["step"] < len(self.steps):
+            names = self.steps[case["step"]]
+            if names == [self.human_token]:
+                case["status"] = AWAITING_REVIEW
+                self.store.save(case)
+                return case
+
+            try:
+                futures = {name: self.executor.submit(run_isolated, self.agents[name], case["context"]) for name in names}
+                outputs = {name: future.result() for name, future in futures.items()}
+            except Exception as e:
+                case["status"] = FAILED
+                case["error"] = f"{type(e).__name__}: {e}"
+                self.store.save(case)
+                return case
+
+            case["outputs"].update(outputs)
+            # Same hand-off as AgentRearrange: parallel results are joined for the next step
+            case["context"] = "; ".join(outputs.values())
+            case["step"] += 1
+            self.store.save(case)
+
+        case["status"] = COMPLETED
+        self.store.save(case)
+        return case
+
+    def start(self, task: str, case_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Opens a case and runs it until the human step.
+
+        Args:
+            task (str): The task given to the first step.
+            case_id (Optional[str]): An ID such as a patient or ticket number. Generated if omitted.
+
+        Returns:
+            Dict[str, Any]: The case, normally with status "awaiting_review".
+
+        Raises:
+            ValueError: If a case with `case_id` already exists.
+        """
+        case = {
+            "case_id": case_id or uuid.uuid4().hex[:12],
+            "flow": self.flow,
+            "task": task,
+            "status": RUNNING,
+            "step": 0,
+            "context": task,
+            "outputs": {},
+            "review": None,
+            "error": None,
+            "created_at": time.time(),
+        }
+        with self._case_lock(case["case_id"]):
+            if self.store.exists(case["case_id"]):
+                raise ValueError(f"Case '{case['case_id']}' already exists; use resume or recover to continue it.")
+            return self._advance(case)
+
+    def resume(self, case_id: str, review: str, approved: bool = True) -> Dict[str, Any]:
+        """
+        Applies a reviewer's decision and runs the rest of the flow.
+
+        Args:
+            case_id (str): A case waiting at the human step.
+            review (str): Notes or corrections, appended to the output the reviewer saw.
+            approved (bool): False closes the case as "rejected".
+
+        Returns:
+            Dict[str, Any]: The case after the remaining steps.
+
+        Raises:
+            ValueError: If the case is not waiting for a review.
+        """
+        with self._case_lock(case_id):
+            case = self.store.load(case_id)
+            if case["status"] != AWAITING_REVIEW:
+                raise ValueError(f"Case '{case_id}' is {case['status']}, not waiting for a review.")
+
+            case["review"] = {"review": review, "approved": approved, "applied_at": time.time()}
+            case["step"] += 1
+            if not approved:
+                case["status"] = REJECTED
+                self.store.save(case)
+                return case
+
+            case["status"] = RUNNING
+            case["context"] = f"{case['context']}\n\nHuman review: {review}"
+            self.store.save(case)
+            return self._advance(case)
+
+    def process_reviews(self) -> List[Dict[str, Any]]:
+        """
+        Resumes every case with a review waiting in the store, concurrently.
+
+        Review files for unknown cases, or cases not waiting for a review, are removed.
+
+        Returns:
+            List[Dict[str, Any]]: The resumed cases.
+        """
+
+        def apply(case_id: str, review: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            try:
+                case = self.resume(case_id, review["review"], review.get("approved", True))
+            except (KeyError, ValueError):
+                case = None
+            # Removed only once the resumed case is persisted, so a crash replays the review
+            self.store.discard_review(case_id)
+            return case
+
+        reviews = self.store.pending_reviews()
+        # Cases wait on their own pool, so they never hold a slot of the agent pool while waiting
+        with ThreadPoolExecutor(max_workers=min(max(len(reviews), 1), 64)) as executor:
+            cases = list(executor.map(lambda item: apply(*item), reviews.items()))
+        return [case for case in cases if case is not None]
+
+    def recover(self) -> List[Dict[str, Any]]:
+        """
+        Continues cases left "running" by a process that stopped, from their last completed step.
+        """
+        recovered = []
+        for case in self.store.list_cases(RUNNING):
+            with self._case_lock(case["case_id"]):
+                recovered.append(self._advance(case))
+        return recovered
+
+    def serve(self, poll_interval: float = 1.0, stop: Optional[threading.Event] = None) -> None:
+        """
+        Recovers interrupted cases, then applies incoming reviews until `stop` is set.
+        """
+        stop = stop or threading.Event()
+        self.recover()
+        while not stop.is_set():
+            self.process_reviews()
+            stop.wait(poll_interval)
+
+
+# Example usage: 200 open cases handled by one process, with stand-in agents
+if __name__ == "__main__":
+    import tempfile
+
+    class StubLLM:
+        def run(self, prompt: str) -> str:
+            time.sleep(0.05)
+            return f"answer to {len(prompt)} chars"
+
+    class StubAgent:
+        def __init__(self, agent_name: str):
+            self.agent_name = agent_name
+            self.system_prompt = f"You are {agent_name}."
+            self.llm = StubLLM()
+
+    with tempfile.TemporaryDirectory() as directory:
+        flow = CheckpointedRearrange(
+            [StubAgent("SymptomAnalyzer"), StubAgent("TreatmentAdvisor"), StubAgent("RecoveryPlanner")],
+            "SymptomAnalyzer -> H -> TreatmentAdvisor, RecoveryPlanner",
+            store=CaseStore(directory),
+            max_workers=32,
+        )
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            opened = list(
+                executor.map(
+                    lambda i: flow.start(f"Athlete {i}: nausea and fatigue after an ultramarathon.", f"case-{i:03d}"),
+                    range(200),
+                )
+            )
+        print(
+            f"Opened {len(opened)} cases in {time.perf_counter() - start:.2f}s; "
+            f"{len(flow.store.list_cases(AWAITING_REVIEW))} waiting for review"
+        )
+
+        # Reviewers answer by dropping files; one case is rejected
+        for case in opened:
+            approved = case["case_id"] != "case-007"
+            flow.store.submit_review(case["case_id"], "Diagnosis confirmed; avoid NSAIDs.", approved=approved)
+
+        start = time.perf_counter()
+        resumed = flow.process_reviews()
+        statuses = {}
+        for case in resumed:
+            statuses[case["status"]] = statuses.get(case["status"], 0) + 1
+        print(f"Resumed {len(resumed)} cases in {time.perf_counter() - start:.2f}s: {statuses}")
+        flow.executor.shutdown()
@@ -0,0 +1,261 @@
+import asyncio
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Can be pointed at the local mock server (see literature_mock_server.py)
+PUBMED_API_URL = os.getenv("PUBMED_API_URL", "https://eutils.ncbi.nlm.nih.gov/entrez/eutils")
+SEMANTIC_SCHOLAR_API_URL = os.getenv("SEMANTIC_SCHOLAR_API_URL", "https://api.semanticscholar.org/graph/v1")
+
+SEMANTIC_SCHOLAR_FIELDS = "title,abstract,year,venue,externalIds,url"
+
+
+class AsyncRateLimiter:
+    """
+    Spaces requests to one API at least `1 / rate` seconds apart and caps how many are in flight.
+
+    Slots are handed out in the order callers ask for them. After a 429 the
+    limiter is paused for the server's `Retry-After` delay.
+
+    Args:
+        rate (float): Requests per second.
+        max_concurrency (int): Maximum number of requests in flight.
+    """
+
+    def __init__(self, rate: float, max_concurrency: int = 3):
+        self.rate = rate
+        self.max_concurrency = max_concurrency
+        self._next_slot = 0.0
+        self._in_flight = 0
+        self.waited = 0.0
+
+    async def acquire(self) -> None:
+        while self._in_flight >= self.max_concurrency:
+            await asyncio.sleep(1 / self.rate)
+        # No await between reading and moving the slot, so the event loop cannot interleave callers
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1 / self.rate
+        self._in_flight += 1
+        if slot > now:
+            self.waited += slot - now
+            await asyncio.sleep(slot - now)
+
+    def release(self) -> None:
+        self._in_flight -= 1
+
+    def block(self, retry_after: float) -> None:
+        self._next_slot = max(self._next_slot, time.monotonic() + retry_after)
+
+
+class LiteratureFetcher:
+    """
+    Searches PubMed and Semantic Scholar concurrently, each under its own rate limit.
+
+    PubMed allows 3 requests per second without an API key and 10 with one;
+    Semantic Scholar's keyed limit is 1 per second. Requests run on worker
+    threads through `asyncio.to_thread`, share one pooled session, and are retried
+    after a 429 once the `Retry-After` delay has passed. A source that fails is
+    reported in `last_errors` and does not stop the other.
+
+    Args:
+        pubmed_api_key (Optional[str]): NCBI API key.
+        semantic_scholar_api_key (Optional[str]): Semantic Scholar API key.
+        email (Optional[str]): Contact address NCBI asks clients to send.
+        limit (int): Papers requested from each source per query.
+        max_retries (int): Retries after rate-limit responses.
+    """
+
+    def __init__(
+        self,
+        pubmed_api_key: Optional[str] = None,
+        semantic_scholar_api_key: Optional[str] = None,
+        email: Optional[str] = None,
+        limit: int = 20,
+        max_retries: int = 3,
+    ):
+        self.pubmed_api_key = pubmed_api_key
+        self.semantic_scholar_api_key = semantic_scholar_api_key
+        self.email = email
+        self.limit = limit
+        self.max_retries = max_retries
+        self.limiters = {
+            "pubmed": AsyncRateLimiter(10.0 if pubmed_api_key else 3.0),
+            "semantic_scholar": AsyncRateLimiter(1.0, max_concurrency=1),
+        }
+        self.requests = {"pubmed": 0, "semantic_scholar": 0}
+        self.last_errors: Dict[str, str] = {}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    async def _get(self, source: str, url: str, params: Dict[str, Any], headers: Dict[str, str]) -> requests.Response:
+        limiter = self.limiters[source]
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire()
+            try:
+                self.requests[source] += 1
+                response = await asyncio.to_thread(self.session.get, url, params=params, headers=headers, timeout=30)
+            finally:
+                limiter.release()
+
+            if response.status_code == 429 and attempt < self.max_retries:
+                limiter.block(float(response.headers.get("Retry-After", 1)))
+                continue
+            response.raise_for_status()
+            return response
+
+    async def search_pubmed(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Finds PubMed articles for the query and fetches their abstracts.
+
+        Returns:
+            List[Dict[str, Any]]: Papers with id, title, abstract, year, venue, doi, url and source.
+        """
+        params = {"db": "pubmed"}
+        if self.pubmed_api_key:
+            params["api_key"] = self.pubmed_api_key
+        if self.email:
+            params["email"] = self.email
+
+        response = await self._get(
+            "pubmed",
+            f"{PUBMED_API_URL}/esearch.fcgi",
+            {**params, "term": query, "retmax": self.limit, "retmode": "json", "sort": "relevance"},
+            {},
+        )
+        ids = response.json()["esearchresult"]["idlist"]
+        if not ids:
+            return []
+
+        response = await self._get(
+            "pubmed",
+            f"{PUBMED_API_URL}/efetch.fcgi",
+            {**params, "id": ",".join(ids), "retmode": "xml", "rettype": "abstract"},
+            {},
+        )
+        return _parse_pubmed_xml(response.text)
+
+    async def search_semantic_scholar(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Searches Semantic Scholar for papers with abstracts.
+
+        Returns:
+            List[Dict[str, Any]]: Papers with id, title, abstract, year, venue, doi, url and source.
+        """
+        headers = {"x-api-key": self.semantic_scholar_api_key} if self.semantic_scholar_api_key else {}
+        response = await self._get(
+            "semantic_scholar",
+            f"{SEMANTIC_SCHOLAR_API_URL}/paper/search",
+            {"query": query, "limit": self.limit, "fields": SEMANTIC_SCHOLAR_FIELDS},
+            headers,
+        )
+        papers = []
+        for item in response.json().get("data", []):
+            if not item.get("abstract"):
+                continue
+            papers.append(
+                {
+                    "id": f"s2:{item['paperId']}",
+                    "title": item.get("title") or "",
+                    "abstract": item["abstract"],
+                    "year": item.get("year"),
+                    "venue": item.get("venue") or "",
+                    "doi": ((item.get("externalIds") or {}).get("DOI") or "").lower() or None,
+                    "url": item.get("url") or "",
+                    "source": "semantic_scholar",
+                }
+            )
+        return papers
+
+    async def afetch(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Searches both sources concurrently and merges the results.
+
+        Papers found by both are kept once, matched by DOI or normalized title,
+        preferring the PubMed record.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            List[Dict[str, Any]]: The merged papers.
+
+        Raises:
+            Exception: The first source's error, if every source failed.
+        """
+        sources = {"pubmed": self.search_pubmed, "semantic_scholar": self.search_semantic_scholar}
+        results = await asyncio.gather(*(search(query) for search in sources.values()), return_exceptions=True)
+
+        self.last_errors = {}
+        papers, seen = [], set()
+        for source, result in zip(sources, results):
+            if isinstance(result, Exception):
+                self.last_errors[source] = f"{type(result).__name__}: {result}"
+                continue
+            for paper in result:
+                keys = {_title_key(paper["title"])} | ({paper["doi"]} if paper["doi"] else set())
+                if keys & seen:
+                    continue
+                seen |= keys
+                papers.append(paper)
+
+        if len(self.last_errors) == len(sources):
+            raise next(result for result in results if isinstance(result, Exception))
+        return papers
+
+    def fetch(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Synchronous wrapper around `afetch`.
+
+        Inside a running event loop (e.g. a Jupyter cell) `afetch` runs on a worker
+        thread with its own loop, since `asyncio.run` cannot be nested.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.afetch(query))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.afetch(query)).result()
+
+
+def _title_key(title: str) -> str:
+    return " ".join(re.findall(r"\w+", title.lower()))
+
+
+def _parse_pubmed_xml(text: str) -> List[Dict[str, Any]]:
+    papers = []
+    for article in ET.fromstring(text).iter("PubmedArticle"):
+        pmid = article.findtext(".//PMID")
+        # Structured abstracts have one labelled AbstractText per section
+        sections = []
+        for part in article.iter("AbstractText"):
+            content = "".join(part.itertext()).strip()
+            label = part.get("Label")
+            sections.append(f"{label}: {content}" if label else content)
+        if not pmid or not sections:
+            continue
+
+        doi = article.findtext(".//ArticleId[@IdType='doi']") or article.findtext(".//ELocationID[@EIdType='doi']")
+        year = article.findtext(".//PubDate/Year")
+        papers.append(
+            {
+                "id": f"pubmed:{pmid}",
+                "title": "".join(article.find(".//ArticleTitle").itertext()).strip(),
+                "abstract": "\n".join(sections),
+                "year": int(year) if year and year.isdigit() else None,
+                "venue": article.findtext(".//Journal/Title") or "",
+                "doi": doi.lower() if doi else None,
+                "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+                "source": "pubmed",
+            }
+        )
+    return papers
@@ -0,0 +1,270 @@
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import requests
+
+# Embedder signature: list of texts -> (n, dim) float array
+Embedder = Callable[[List[str]], np.ndarray]
+
+OPENAI_EMBEDDINGS_URL = os.getenv("OPENAI_EMBEDDINGS_URL", "https://api.openai.com/v1/embeddings")
+
+
+def openai_embedder(
+    api_key: Optional[str] = None,
+    model: str = "text-embedding-3-small",
+    batch_size: int = 256,
+) -> Embedder:
+    """
+    Returns an embedder that calls OpenAI's embeddings endpoint in batches.
+
+    Args:
+        api_key (Optional[str]): OpenAI API key. Defaults to OPENAI_API_KEY.
+        model (str): Embedding model.
+        batch_size (int): Texts per request.
+
+    Returns:
+        Embedder: The embedder.
+    """
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    session = requests.Session()
+
+    def embed(texts: List[str]) -> np.ndarray:
+        vectors = []
+        for start in range(0, len(texts), batch_size):
+            response = session.post(
+                OPENAI_EMBEDDINGS_URL,
+                headers={"Authorization": f"Bearer {api_key}"},
+                json={"model": model, "input": texts[start : start + batch_size]},
+                timeout=60,
+            )
+            response.raise_for_status()
+            data = sorted(response.json()["data"], key=lambda item: item["index"])
+            vectors.extend(item["embedding"] for item in data)
+        return np.asarray(vectors, dtype=np.float32)
+
+    return embed
+
+
+def hashing_embedder(dim: int = 1024) -> Embedder:
+    """
+    Returns an offline embedder that hashes words and word pairs into a fixed-size vector.
+
+    It only captures shared vocabulary, not meaning, but needs no API key, which
+    makes it useful with the mock server and for trying the index out.
+
+    Args:
+        dim (int): Vector size.
+
+    Returns:
+        Embedder: The embedder.
+    """
+
+    def embed(texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            # Dropping a plural "s" lets "antivirals" match "antiviral"
+            words = [w[:-1] if len(w) > 3 and w.endswith("s") else w for w in re.findall(r"\w+", text.lower())]
+            for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                vectors[row, int.from_bytes(digest, "big") % dim] += 1.0
+        return vectors
+
+    return embed
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class VectorIndex:
+    """
+    A local store of paper abstracts and their embeddings, searched by cosine similarity.
+
+    Papers are embedded once, when first added; the unit-normalized vectors are
+    kept in one NumPy matrix so a search is a single matrix-vector product. The
+    queries that triggered a fetch are stored too, with their embeddings and
+    time, so later queries can tell whether the index already covers them.
+
+    Args:
+        embed (Embedder): Embeds texts. Must be the same for the life of the index.
+        path (Optional[str]): Directory the index is persisted to.
+    """
+
+    def __init__(self, embed: Embedder, path: Optional[str] = "medinsight_index"):
+        self.embed = embed
+        self.path = path
+        self.papers: List[Dict[str, Any]] = []
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self.queries: List[Dict[str, Any]] = []
+        self.query_vectors = np.zeros((0, 0), dtype=np.float32)
+        self._ids: Dict[str, int] = {}
+
+        if path and os.path.exists(os.path.join(path, "papers.json")):
+            with open(os.path.join(path, "papers.json"), encoding="utf-8") as file:
+                stored = json.load(file)
+            self.papers, self.queries = stored["papers"], stored["queries"]
+            self.vectors = np.load(os.path.join(path, "vectors.npy"))
+            self.query_vectors = np.load(os.path.join(path, "query_vectors.npy"))
+            self._ids = {paper["id"]: i for i, paper in enumerate(self.papers)}
+
+    def __len__(self) -> int:
+        return len(self.papers)
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Returns the unit-normalized embeddings of the texts.
+        """
+        return _normalize_rows(np.asarray(self.embed(texts), dtype=np.float32))
+
+    def add(self, papers: List[Dict[str, Any]]) -> int:
+        """
+        Embeds and stores the papers not already in the index.
+
+        Returns:
+            int: Number of papers added.
+        """
+        new = [paper for paper in papers if paper["id"] not in self._ids]
+        new = list({paper["id"]: paper for paper in new}.values())
+        if not new:
+            return 0
+
+        vectors = self.embed_texts([f"{paper['title']}\n\n{paper['abstract']}" for paper in new])
+        self.vectors = vectors if not len(self.papers) else np.vstack([self.vectors, vectors])
+        for paper in new:
+            self._ids[paper["id"]] = len(self.papers)
+            self.papers.append(paper)
+        return len(new)
+
+    def record_query(self, query: str, vector: Optional[np.ndarray] = None) -> None:
+        """
+        Remembers that results for the query were fetched now.
+        """
+        vector = self.embed_texts([query]) if vector is None else vector.reshape(1, -1)
+        self.queries.append({"query": query, "fetched_at": time.time()})
+        self.query_vectors = vector if not self.queries[:-1] else np.vstack([self.query_vectors, vector])
+
+    def closest_query(self, vector: np.ndarray, max_age: float) -> Tuple[Optional[str], float]:
+        """
+        Returns the most similar query fetched within `max_age` seconds, and its similarity.
+        """
+        if not self.queries:
+            return None, 0.0
+        cutoff = time.time() - max_age
+        fresh = np.array([query["fetched_at"] >= cutoff for query in self.queries])
+        scores = np.where(fresh, self.query_vectors @ vector.ravel(), -1.0)
+        best = int(np.argmax(scores))
+        return (self.queries[best]["query"], float(scores[best])) if scores[best] > -1 else (None, 0.0)
+
+    def search(self, vector: np.ndarray, k: int = 8) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Returns the k papers most similar to a query vector, best first.
+        """
+        if not self.papers:
+            return []
+        scores = self.vectors @ vector.ravel()
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), self.papers[i]) for i in top]
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        np.save(os.path.join(self.path, "vectors.npy"), self.vectors)
+        np.save(os.path.join(self.path, "query_vectors.npy"), self.query_vectors)
+        # Written last, so the JSON never lists papers whose vectors are missing
+        tmp_path = os.path.join(self.path, "papers.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"papers": self.papers, "queries": self.queries}, file)
+        os.replace(tmp_path, os.path.join(self.path, "papers.json"))
+
+
+class LiteratureRetriever:
+    """
+    Answers a research question with the most relevant abstracts, fetching only when needed.
+
+    If a query at least `query_threshold` similar to this one was fetched within
+    `max_age` seconds (e.g. "COVID-19 antivirals" after "COVID-19 treatments"),
+    the index is searched directly. Otherwise both sources are searched, new
+    abstracts are embedded and added, and then the index is searched, so papers
+    from earlier overlapping queries can also make the top k.
+
+    Args:
+        fetcher (Any): A `LiteratureFetcher`, or anything with `fetch(query)`.
+        index (VectorIndex): The local index.
+        k (int): Abstracts returned per question.
+        query_threshold (float): Cosine similarity at which an earlier query covers this one.
+            Depends on the embedder; 0.55 suits both `openai_embedder` and `hashing_embedder`.
+        max_age (float): Seconds an earlier fetch stays valid for covering new queries.
+    """
+
+    def __init__(
+        self,
+        fetcher: Any,
+        index: VectorIndex,
+        k: int = 8,
+        query_threshold: float = 0.55,
+        max_age: float = 7 * 24 * 3600,
+    ):
+        self.fetcher = fetcher
+        self.index = index
+        self.k = k
+        self.query_threshold = query_threshold
+        self.max_age = max_age
+
+    def retrieve(self, query: str) -> Dict[str, Any]:
+        """
+        Returns the top-k abstracts for the query.
+
+        Returns:
+            Dict[str, Any]: The scored papers, whether the sources were queried,
+            the earlier query that covered this one (if any) and papers added.
+        """
+        vector = self.index.embed_texts([query])
+        covered_by, similarity = self.index.closest_query(vector, self.max_age)
+        fetched, added = False, 0
+
+        if similarity < self.query_threshold:
+            added = self.index.add(self.fetcher.fetch(query))
+            self.index.record_query(query, vector)
+            self.index.save()
+            fetched, covered_by = True, None
+
+        return {
+            "query": query,
+            "results": self.index.search(vector, self.k),
+            "fetched": fetched,
+            "covered_by": covered_by,
+            "added": added,
+        }
+
+
+def build_prompt(question: str, results: List[Tuple[float, Dict[str, Any]]]) -> str:
+    """
+    Builds the summarization prompt from the question and the retrieved abstracts.
+
+    Args:
+        question (str): The research question.
+        results (List[Tuple[float, Dict[str, Any]]]): Scored papers from `LiteratureRetriever.retrieve`.
+
+    Returns:
+        str: The prompt, with the abstracts numbered for citation.
+    """
+    blocks = []
+    for number, (_, paper) in enumerate(results, start=1):
+        details = ", ".join(str(part) for part in (paper["venue"], paper["year"]) if part)
+        blocks.append(f"[{number}] {paper['title']} ({details})\n{paper['url']}\n{paper['abstract']}")
+    sources = "\n\n".join(blocks)
+    return (
+        f"{question}\n\n"
+        "Base the answer only on the abstracts below and cite them by number, e.g. [2]. "
+        "Say so if they do not answer the question.\n\n"
+        f"{sources}"
+    )
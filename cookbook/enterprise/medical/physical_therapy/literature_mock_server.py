@@ -0,0 +1,243 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+# Condition -> interventions studied for it in the generated corpus
+_TOPICS = {
+    "COVID-19": [
+        "nirmatrelvir-ritonavir antiviral",
+        "remdesivir antiviral",
+        "dexamethasone",
+        "tocilizumab",
+        "molnupiravir antiviral",
+    ],
+    "long COVID": [
+        "graded exercise therapy",
+        "pulmonary rehabilitation",
+        "cognitive rehabilitation",
+        "breathing exercises",
+    ],
+    "ACL reconstruction": [
+        "early weight bearing",
+        "neuromuscular training",
+        "blood flow restriction training",
+        "eccentric quadriceps exercise",
+    ],
+    "low back pain": ["spinal manipulation", "motor control exercise", "pain neuroscience education", "yoga"],
+    "influenza": ["oseltamivir antiviral", "baloxavir antiviral", "high-dose vaccination"],
+}
+_DESIGNS = ["randomized controlled trial", "systematic review and meta-analysis"]
+
+
+def build_corpus() -> List[Dict[str, Any]]:
+    """
+    Returns the deterministic set of papers both mock APIs search.
+
+    Every third paper is only in PubMed, every third only in Semantic Scholar,
+    and the rest are in both with the same DOI.
+    """
+    papers = []
+    for condition, interventions in _TOPICS.items():
+        for intervention in interventions:
+            for design in _DESIGNS:
+                n = len(papers)
+                papers.append(
+                    {
+                        "pmid": str(30_000_000 + n),
+                        "paper_id": f"{n:040x}",
+                        "doi": f"10.5555/mock.{n}",
+                        "title": f"{intervention.capitalize()} for {condition}: a {design}",
+                        "abstract": (
+                            f"Background: Treatments for {condition} remain an active area of research. "
+                            f"Methods: We conducted a {design} of {intervention} in patients with {condition}, "
+                            f"enrolling {120 + 37 * n} participants. "
+                            f"Results: {intervention.capitalize()} improved the primary outcome compared with usual care "
+                            f"(effect size {0.2 + (n % 7) / 10:.1f}). "
+                            f"Conclusions: {intervention.capitalize()} is a promising option for {condition}."
+                        ),
+                        "year": 2019 + n % 6,
+                        "venue": ["The Lancet", "JAMA", "BMJ", "J Orthop Sports Phys Ther"][n % 4],
+                        "sources": [["pubmed"], ["semantic_scholar"], ["pubmed", "semantic_scholar"]][n % 3],
+                    }
+                )
+    return papers
+
+
+def _search(papers: List[Dict[str, Any]], source: str, query: str, limit: int) -> List[Dict[str, Any]]:
+    terms = set(re.findall(r"\w+", query.lower()))
+    scored = []
+    for paper in papers:
+        if source not in paper["sources"]:
+            continue
+        words = set(re.findall(r"\w+", f"{paper['title']} {paper['abstract']}".lower()))
+        score = len(terms & words)
+        if score:
+            scored.append((-score, paper["pmid"], paper))
+    return [paper for _, _, paper in sorted(scored)[:limit]]
+
+
+class LiteratureMockHandler(BaseHTTPRequestHandler):
+    """
+    Serves PubMed E-utilities (`/pubmed/esearch.fcgi`, `/pubmed/efetch.fcgi`) and
+    Semantic Scholar (`/s2/graph/v1/paper/search`) from the generated corpus.
+
+    Each API enforces its own rate limit and answers 429 with `Retry-After` when
+    requests come faster. Requests and 429s are counted per API in
+    `server.requests` and `server.rejected`.
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if url.path.startswith("/pubmed/"):
+            source = "pubmed"
+        elif url.path.startswith("/s2/"):
+            source = "semantic_scholar"
+        else:
+            self._reply(404, "application/json", json.dumps({"error": "not found"}))
+            return
+
+        if not self._admit(source, has_key=bool(params.get("api_key"))):
+            return
+
+        if url.path.endswith("/esearch.fcgi"):
+            papers = _search(self.server.papers, "pubmed", params.get("term", ""), int(params.get("retmax", 20)))
+            body = {"esearchresult": {"count": str(len(papers)), "idlist": [paper["pmid"] for paper in papers]}}
+            self._reply(200, "application/json", json.dumps(body))
+        elif url.path.endswith("/efetch.fcgi"):
+            ids = set(params.get("id", "").split(","))
+            self._reply(200, "text/xml", _pubmed_xml([p for p in self.server.papers if p["pmid"] in ids]))
+        elif url.path.endswith("/paper/search"):
+            query, limit = params.get("query", ""), int(params.get("limit", 20))
+            papers = _search(self.server.papers, "semantic_scholar", query, limit)
+            data = [
+                {
+                    "paperId": paper["paper_id"],
+                    "title": paper["title"],
+                    "abstract": paper["abstract"],
+                    "year": paper["year"],
+                    "venue": paper["venue"],
+                    "externalIds": {"DOI": paper["doi"]},
+                    "url": f"https://www.semanticscholar.org/paper/{paper['paper_id']}",
+                }
+                for paper in papers
+            ]
+            self._reply(200, "application/json", json.dumps({"total": len(data), "data": data}))
+        else:
+            self._reply(404, "application/json", json.dumps({"error": "not found"}))
+
+    def _admit(self, source: str, has_key: bool) -> bool:
+        # PubMed allows 3 requests per second, or 10 with an API key; Semantic Scholar 1
+        rate = {"pubmed": 10.0 if has_key else 3.0, "semantic_scholar": 1.0}[source]
+        with self.server.lock:
+            now = time.monotonic()
+            # A small tolerance for client-side timer jitter
+            allowed = now - self.server.last_request[source] >= 1 / rate * 0.9
+            self.server.requests[source] += 1
+            if allowed:
+                self.server.last_request[source] = now
+            else:
+                self.server.rejected[source] += 1
+        if not allowed:
+            data = json.dumps({"error": "Too Many Requests"}).encode("utf-8")
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        return allowed
+
+    def _reply(self, status: int, content_type: str, body: str):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _pubmed_xml(papers: List[Dict[str, Any]]) -> str:
+    articles = []
+    for paper in papers:
+        sections = "".join(
+            f'<AbstractText Label="{escape(label.upper())}">{escape(text.strip())}</AbstractText>'
+            for label, text in re.findall(r"(\w+): (.*?)(?=\s\w+: |$)", paper["abstract"])
+        )
+        articles.append(
+            "<PubmedArticle><MedlineCitation>"
+            f"<PMID>{paper['pmid']}</PMID><Article>"
+            f"<Journal><Title>{escape(paper['venue'])}</Title>"
+            f"<JournalIssue><PubDate><Year>{paper['year']}</Year></PubDate></JournalIssue></Journal>"
+            f"<ArticleTitle>{escape(paper['title'])}</ArticleTitle><Abstract>{sections}</Abstract>"
+            "</Article></MedlineCitation><PubmedData><ArticleIdList>"
+            f'<ArticleId IdType="pubmed">{paper["pmid"]}</ArticleId>'
+            f'<ArticleId IdType="doi">{paper["doi"]}</ArticleId>'
+            "</ArticleIdList></PubmedData></PubmedArticle>"
+        )
+    return f"<PubmedArticleSet>{''.join(articles)}</PubmedArticleSet>"
+
+
+def start_mock_server(port: int = 0) -> ThreadingHTTPServer:
+    """
+    Starts the mock server on a background thread.
+
+    Args:
+        port (int): Port to listen on. 0 picks a free port.
+
+    Returns:
+        ThreadingHTTPServer: The running server. Point `PUBMED_API_URL` at
+        `http://127.0.0.1:<port>/pubmed` and `SEMANTIC_SCHOLAR_API_URL` at
+        `http://127.0.0.1:<port>/s2/graph/v1`.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), LiteratureMockHandler)
+    server.lock = threading.Lock()
+    server.papers = build_corpus()
+    server.requests = {"pubmed": 0, "semantic_scholar": 0}
+    server.rejected = {"pubmed": 0, "semantic_scholar": 0}
+    server.last_request = {"pubmed": 0.0, "semantic_scholar": 0.0}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# Example usage: overlapping questions against the mock APIs with the offline embedder
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    server = start_mock_server()
+    os.environ["PUBMED_API_URL"] = f"http://127.0.0.1:{server.server_port}/pubmed"
+    os.environ["SEMANTIC_SCHOLAR_API_URL"] = f"http://127.0.0.1:{server.server_port}/s2/graph/v1"
+
+    # Imported after the environment points at the mock server
+    from literature_fetch import LiteratureFetcher
+    from literature_index import LiteratureRetriever, VectorIndex, build_prompt, hashing_embedder
+
+    with tempfile.TemporaryDirectory() as directory:
+        retriever = LiteratureRetriever(
+            LiteratureFetcher(limit=10),
+            VectorIndex(hashing_embedder(), path=os.path.join(directory, "index")),
+            k=5,
+        )
+        for question in ["COVID-19 treatments", "COVID-19 antivirals", "ACL reconstruction rehabilitation"]:
+            start = time.perf_counter()
+            retrieval = retriever.retrieve(question)
+            source = "fetched" if retrieval["fetched"] else f"index (covered by '{retrieval['covered_by']}')"
+            print(
+                f"{question!r}: {source}, +{retrieval['added']} papers, "
+                f"{len(retriever.index)} indexed, {time.perf_counter() - start:.2f}s"
+            )
+            for score, paper in retrieval["results"][:3]:
+                print(f"  {score:.2f} {paper['title']}")
+
+        print(f"Requests {server.requests}, rejected with 429: {server.rejected}")
+        print(f"Prompt size for the last question: {len(build_prompt(question, retrieval['results']))} characters")
+    server.shutdown()
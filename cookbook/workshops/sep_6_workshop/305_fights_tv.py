@@ -1,21 +1,36 @@
 import os
-from swarms import OpenAIChat, Agent, SpreadSheetSwarm
+from swarms import OpenAIChat, Agent
 from dotenv import load_dotenv
+from llm_cache import CachedLLM
+from batched_spreadsheet_swarm import CSV_COLUMNS, BatchedSpreadSheetSwarm
+from streaming_csv_writer import StreamingResultWriter
+from prompt_budget import PromptAssembler, format_report
+from llm_telemetry import TelemetryRecorder, instrument_agent
 
 load_dotenv()
 
 api_key = os.getenv("OPENAI_API_KEY")
 # Ensure your .env file contains: OPENAI_API_KEY="sk-..."
 
-model = OpenAIChat(
-    model_name="gpt-4o-mini",  # Corrected model name
-    openai_api_key=api_key,
-    max_tokens=4000,
-    temperature=0.1,
+# Identical prompts are answered from the local response cache (llm_cache.sqlite)
+model = CachedLLM(
+    OpenAIChat(
+        model_name="gpt-4o-mini",  # Corrected model name
+        openai_api_key=api_key,
+        max_tokens=4000,
+        temperature=0.1,
+    )
 )
 
+# Context every agent shares. It is sent first and identically in each system
+# prompt so provider-side prompt caching can reuse it across the fan-out once it
+# reaches the provider's minimum (1024 tokens for OpenAI).
+SHARED_CONTEXT = """
+305FightsTV hosts and promotes amateur fighting events in Miami.
+"""
+
 # Define system prompts for each social media platform
-system_prompts = {
+platform_instructions = {
     "Facebook-Agent": """
     You are a Social Media Marketing Agent specialized in promoting 305FightsTV on Facebook.
     Your tasks include creating engaging posts, managing Facebook Ads, interacting with followers, and organizing live events for amateur fighters in Miami.
@@ -66,34 +81,67 @@ system_prompts = {
     """,
 }
 
+# Each agent-specific part is checked against a 300-token budget; a longer one
+# raises instead of being cut
+assembler = PromptAssembler(SHARED_CONTEXT)
+
+# Records latency and token counts for every LLM call the agents make
+telemetry = TelemetryRecorder()
+
 # Create agents for each social media platform
 agents = []
 
-for agent_name, system_prompt in system_prompts.items():
+for agent_name, instructions in platform_instructions.items():
     agent = Agent(
         agent_name=agent_name,
         description=f"Agent responsible for managing and promoting 305FightsTV on {agent_name.replace('-Agent', '')}.",
-        system_prompt=system_prompt,
+        system_prompt=assembler.build(agent_name, instructions),
         llm=model,
         max_loops=1,
         dashboard=False,
         stopping_token="<DONE>",
     )
-    agents.append(agent)
+    agents.append(instrument_agent(agent, telemetry))
 
 task = "November 2nd Manuel art time theater Little Havana 6pm "
 
-# Create a Swarm with the list of agents
-swarm = SpreadSheetSwarm(
+# Append one row per finished task to fight_night.csv, rotating at 10 MB, with a
+# fight_night.jsonl sidecar that pandas can read via pd.read_json(lines=True)
+writer = StreamingResultWriter(
+    "fight_night.csv",
+    fieldnames=CSV_COLUMNS,
+    max_bytes=10 * 1024 * 1024,
+    jsonl_sidecar=True,
+)
+
+# Create a Swarm with the list of agents. All 12 tasks (6 agents x 2 repeats) run
+# concurrently, and every task records its real start/end time.
+swarm = BatchedSpreadSheetSwarm(
     name="305FightsTV-Social-Media-Swarm",
     description="Swarm of agents responsible for managing and promoting 305FightsTV across various social media platforms.",
     agents=agents,
     autosave_on=True,
     save_file_path="fight_night.csv",
-    run_all_agents=False,
     repeat_count=2,
+    writer=writer,
+    telemetry=telemetry,
 )
 
 prompt = f"Create posts to advertise the upcoming fight night event: {task} "
 
-swarm.run(prompt)
+# System prompt tokens of this run (6 agents x 2 repeats)
+print(format_report(assembler.report(calls_per_agent=swarm.repeat_count)))
+
+# Closed even if the run fails, so the files are flushed and complete
+try:
+    metadata = swarm.run(prompt)
+finally:
+    writer.close()
+telemetry.write_openmetrics("agent_workspace/305fightstv_metrics.prom")
+# Cache hits are not recorded as calls, so there is no latency when every task was answered from the cache
+latency_p95 = metadata["telemetry"]["total"]["latency_p95"]
+print(
+    f"{metadata['tasks_completed']} tasks in {metadata['wall_time']:.1f}s "
+    f"({metadata['tasks_per_second']:.2f} tasks/s), "
+    f"LLM p95 latency {'-' if latency_p95 is None else f'{latency_p95:.2f}s'}"
+)
@@ -0,0 +1,86 @@
+import threading
+from typing import Any, Dict, Iterator
+
+_agent_locks: Dict[int, threading.Lock] = {}
+_agent_locks_lock = threading.Lock()
+
+
+def isolated_prompt(agent: Any, task: str) -> str:
+    """
+    Returns the prompt `run_isolated` sends: the agent's system prompt followed by the task.
+    """
+    system_prompt = (getattr(agent, "system_prompt", None) or "").strip()
+    return f"{system_prompt}\n\n{task}" if system_prompt else task
+
+
+def _begin_run(llm: Any) -> None:
+    # A model instrumented by llm_telemetry counts each isolated call as its own agent run
+    begin_run = getattr(llm, "begin_run", None)
+    if callable(begin_run):
+        begin_run()
+
+
+def _run_with_fresh_history(agent: Any, task: str) -> str:
+    # agent.run keeps per-agent state, so one task at a time, with the history it adds removed again
+    with _agent_locks_lock:
+        lock = _agent_locks.setdefault(id(agent), threading.Lock())
+    with lock:
+        history = getattr(getattr(agent, "short_memory", None), "conversation_history", None)
+        baseline = len(history) if isinstance(history, list) else None
+        try:
+            return str(agent.run(task))
+        finally:
+            if baseline is not None:
+                del history[baseline:]
+
+
+def run_isolated(agent: Any, task: str) -> str:
+    """
+    Runs one task on an agent without the agent's conversation history.
+
+    `Agent.run` appends every task to the agent's memory and resends it, so
+    running one agent on many tasks (chunks, batches, tickers, cases) would put
+    the earlier tasks into every later prompt, and concurrent calls would race
+    on that memory. Instead the agent's model is called with its system prompt
+    and the task only. Agents with tools, or without a model, fall back to
+    `agent.run`, one call at a time per agent, and the history the call added
+    is removed afterwards.
+
+    Args:
+        agent (Any): An agent exposing `system_prompt`, `llm` and `run(task)`.
+        task (str): The task.
+
+    Returns:
+        str: The output.
+    """
+    llm = getattr(agent, "llm", None)
+    if getattr(agent, "tools", None) or llm is None:
+        return _run_with_fresh_history(agent, task)
+    _begin_run(llm)
+    prompt = isolated_prompt(agent, task)
+    return str(llm.run(prompt) if hasattr(llm, "run") else llm(prompt))
+
+
+def stream_isolated(agent: Any, task: str) -> Iterator[str]:
+    """
+    Streams one task on an agent without the agent's conversation history.
+
+    Like `run_isolated`, but models with a `stream(prompt)` method are streamed.
+    Agents with tools, or whose model cannot stream, yield their output as one chunk.
+
+    Args:
+        agent (Any): An agent exposing `system_prompt`, `llm` and `run(task)`.
+        task (str): The task.
+
+    Yields:
+        str: The output chunks.
+    """
+    llm = getattr(agent, "llm", None)
+    if getattr(agent, "tools", None) or not hasattr(llm, "stream"):
+        yield run_isolated(agent, task)
+        return
+
+    _begin_run(llm)
+    for chunk in llm.stream(isolated_prompt(agent, task)):
+        # Chat models yield message chunks, completion models yield strings
+        yield str(getattr(chunk, "content", chunk))
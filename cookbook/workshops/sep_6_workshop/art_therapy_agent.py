@@ -1,6 +1,8 @@
+import csv
 import os
-from swarms import OpenAIChat, Agent
 from dotenv import load_dotenv
+from llm_cache import CachedLLM
+from outreach_batch import OutreachBatcher, SentLog
 
 load_dotenv()
 
@@ -53,23 +55,72 @@ No worries if not, but if you do, feel free to reach out anytime! I truly apprec
 
 """
 
-model = OpenAIChat(
-    model_name="gpt-4o-mini", openai_api_key=api_key, max_tokens=4000, temperature=0.1
-)
-
-agent = Agent(
-    agent_name="Art Therapy Agent",
-    system_prompt=ART_THERAPY_AGENT_SYS_PROMPT,
-    llm=model,
-    max_loops=1,
-    dashboard=False,
-    stopping_token="<DONE>",
-    # tools = [send_instagram_dm],
-)
-
-
-# Run the agent
-out = agent.run(
-    "Jasmine: told me that you're offering art therapy, I wanted to try it out:"
-)
-print(out)
+def build_model():
+    """
+    Builds the model, importing swarms only when it is actually needed.
+    """
+    from swarms import OpenAIChat
+
+    # Identical prompts are answered from the local response cache (llm_cache.sqlite)
+    return CachedLLM(
+        OpenAIChat(
+            model_name="gpt-4o-mini", openai_api_key=api_key, max_tokens=4000, temperature=0.1
+        )
+    )
+
+
+def build_agent():
+    """
+    Builds the outreach agent, importing swarms only when it is actually needed.
+    """
+    from swarms import Agent
+
+    return Agent(
+        agent_name="Art Therapy Agent",
+        system_prompt=ART_THERAPY_AGENT_SYS_PROMPT,
+        llm=build_model(),
+        max_loops=1,
+        dashboard=False,
+        stopping_token="<DONE>",
+        # tools = [send_instagram_dm],
+    )
+
+
+def build_batcher(batch_size: int = 20, sent_log_path: str = None) -> OutreachBatcher:
+    """
+    Builds a drafter that writes messages for many recipients per request,
+    skipping the recipients already in the sent log (OUTREACH_SENT_LOG).
+    """
+    sent_log = SentLog(sent_log_path) if sent_log_path else SentLog()
+    return OutreachBatcher(build_model(), ART_THERAPY_AGENT_SYS_PROMPT, batch_size=batch_size, sent_log=sent_log)
+
+
+if __name__ == "__main__":
+    if os.getenv("OUTREACH_RECIPIENTS"):
+        # Batch mode: a CSV of recipients with username, name and bio columns,
+        # e.g. OUTREACH_RECIPIENTS=contacts.csv OUTREACH_SEND=true
+        with open(os.getenv("OUTREACH_RECIPIENTS"), newline="", encoding="utf-8") as file:
+            profiles = list(csv.DictReader(file))
+
+        batcher = build_batcher(batch_size=int(os.getenv("OUTREACH_BATCH_SIZE", "20")))
+        drafts = [draft for draft in batcher.draft(profiles) if draft["error"] is None]
+        for draft in drafts:
+            print(f"--- @{draft['recipient']}\n{draft['message']}")
+        print(batcher.format_stats())
+
+        if os.getenv("OUTREACH_SEND", "false").lower() == "true":
+            from ig_tool import send_instagram_dms
+
+            # Each message is logged as soon as it went out, so a run killed midway
+            # resumes with the recipients not yet messaged; failed ones are retried
+            send_instagram_dms(
+                drafts, on_sent=lambda draft: batcher.sent_log.record(draft["recipient"], draft["message"])
+            )
+    else:
+        agent = build_agent()
+
+        # Run the agent
+        out = agent.run(
+            "Jasmine: told me that you're offering art therapy, I wanted to try it out:"
+        )
+        print(out)
@@ -0,0 +1,175 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+
+def parse_flow(flow: str) -> List[List[str]]:
+    """
+    Parses an AgentRearrange flow string into its sequential steps.
+
+    Args:
+        flow (str): A flow such as "A -> B, C -> D".
+
+    Returns:
+        List[List[str]]: One list of agent names per step, e.g. [["A"], ["B", "C"], ["D"]].
+
+    Raises:
+        ValueError: If the flow is empty or contains an empty step.
+    """
+    if not flow or not flow.strip():
+        raise ValueError("Flow cannot be empty.")
+
+    steps = []
+    for step in flow.split("->"):
+        names = [name.strip() for name in step.split(",") if name.strip()]
+        if not names:
+            raise ValueError(f"Flow '{flow}' contains an empty step.")
+        steps.append(names)
+    return steps
+
+
+class AsyncAgentRearrange:
+    """
+    Runs an AgentRearrange flow with the comma-separated steps fanned out as asyncio tasks.
+
+    Agents in the same step run concurrently on a dedicated thread pool, bounded by
+    `max_concurrency`. Each branch gets its own timeout, and a failing or timed-out
+    branch is recorded in the result instead of aborting the whole step, so the
+    outputs of the remaining branches are still returned.
+
+    Args:
+        agents (List[Any]): Agents exposing `agent_name` and a synchronous `run(task)`.
+        flow (str): The flow string, in the same format as AgentRearrange.
+        max_concurrency (int): Maximum number of agents running at the same time.
+        branch_timeout (Optional[float]): Seconds each agent may take before it is abandoned.
+    """
+
+    def __init__(
+        self,
+        agents: List[Any],
+        flow: str,
+        max_concurrency: int = 8,
+        branch_timeout: Optional[float] = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+
+        self.agents = {agent.agent_name: agent for agent in agents}
+        self.flow = flow
+        self.steps = parse_flow(flow)
+        self.max_concurrency = max_concurrency
+        self.branch_timeout = branch_timeout
+
+        for step in self.steps:
+            for name in step:
+                if name not in self.agents:
+                    raise ValueError(f"Agent '{name}' in flow is not in the agents list.")
+
+    async def _run_branch(
+        self,
+        name: str,
+        task: str,
+        semaphore: asyncio.Semaphore,
+        executor: ThreadPoolExecutor,
+    ) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                # The worker thread cannot be interrupted, so a timed-out branch keeps
+                # running in the background but its output is discarded.
+                output = await asyncio.wait_for(
+                    loop.run_in_executor(executor, self.agents[name].run, task),
+                    timeout=self.branch_timeout,
+                )
+                error = None
+            except asyncio.TimeoutError:
+                output = None
+                error = f"Timed out after {self.branch_timeout}s"
+            except Exception as e:
+                output = None
+                error = f"{type(e).__name__}: {e}"
+
+        return {
+            "agent_name": name,
+            "output": output,
+            "error": error,
+            "duration": time.perf_counter() - start,
+        }
+
+    async def arun(self, task: str) -> Dict[str, Any]:
+        """
+        Runs the flow on a task.
+
+        Args:
+            task (str): The initial task given to the first step.
+
+        Returns:
+            Dict[str, Any]: The final output, per-agent outputs, per-agent errors and
+            per-step timings. `output` is None if a step produced no successful branch.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        outputs: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        timings: List[Dict[str, Any]] = []
+        current_task = task
+        flow_start = time.perf_counter()
+
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        try:
+            for index, step in enumerate(self.steps):
+                step_start = time.perf_counter()
+                branches = await asyncio.gather(
+                    *[
+                        self._run_branch(name, current_task, semaphore, executor)
+                        for name in step
+                    ]
+                )
+
+                step_outputs = []
+                for branch in branches:
+                    if branch["error"] is None:
+                        outputs[branch["agent_name"]] = branch["output"]
+                        step_outputs.append(str(branch["output"]))
+                    else:
+                        errors[branch["agent_name"]] = branch["error"]
+
+                timings.append(
+                    {
+                        "step": index,
+                        "agents": {b["agent_name"]: b["duration"] for b in branches},
+                        "wall_time": time.perf_counter() - step_start,
+                    }
+                )
+
+                if not step_outputs:
+                    current_task = None
+                    break
+
+                # Same hand-off as AgentRearrange: parallel results are joined for the next step
+                current_task = "; ".join(step_outputs)
+        finally:
+            # Abandoned branches must not block the caller on executor shutdown
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return {
+            "flow": self.flow,
+            "output": current_task,
+            "outputs": outputs,
+            "errors": errors,
+            "timings": timings,
+            "total_time": time.perf_counter() - flow_start,
+        }
+
+    def run(self, task: str) -> Dict[str, Any]:
+        """
+        Synchronous wrapper around `arun` for scripts that are not already async.
+
+        Args:
+            task (str): The initial task given to the first step.
+
+        Returns:
+            Dict[str, Any]: See `arun`.
+        """
+        return asyncio.run(self.arun(task))
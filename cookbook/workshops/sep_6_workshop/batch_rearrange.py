@@ -0,0 +1,251 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List
+
+from agent_calls import run_isolated
+from async_rearrange import parse_flow
+
+# Marks the end of the batch on the stage queues
+_DONE = object()
+
+
+class BatchAgentRearrange:
+    """
+    Pushes many tasks through one AgentRearrange flow as a pipeline.
+
+    The flow is parsed and validated once, when the object is created. Each
+    step then runs on its own worker threads, connected by bounded queues:
+    while step 2 works on company A, step 1 already works on company B. A full
+    queue makes the step before it wait, so a slow step throttles the whole
+    batch instead of letting work pile up in memory. Tasks are read from the
+    iterable only as the first step has room, and results are yielded as they
+    leave the last step, so the batch is never held in memory.
+
+    Agents in a comma-separated step run concurrently on each task and their
+    outputs are joined for the next step, as in AgentRearrange. Each agent is
+    called through `run_isolated`, with its system prompt and the task only, so
+    no conversation history carries over from one task to the next. Agents with
+    tools, or without a model, use `agent.run`, one task at a time, and their
+    conversation is cut back to its starting length after each task.
+
+    Args:
+        agents (List[Any]): Agents exposing `agent_name`, `system_prompt`, `llm` and `run(task)`.
+        flow (str): The flow, e.g. "A -> B -> C".
+        queue_size (int): Tasks that may wait between two steps.
+        workers_per_step (int): Tasks each step works on at the same time.
+    """
+
+    def __init__(
+        self,
+        agents: List[Any],
+        flow: str,
+        queue_size: int = 8,
+        workers_per_step: int = 1,
+    ):
+        if queue_size < 1 or workers_per_step < 1:
+            raise ValueError("queue_size and workers_per_step must be at least 1.")
+
+        self.agents = {agent.agent_name: agent for agent in agents}
+        self.flow = flow
+        self.steps = parse_flow(flow)
+        self.queue_size = queue_size
+        self.workers_per_step = workers_per_step
+        self.stats: Dict[str, Any] = {}
+
+        for step in self.steps:
+            for name in step:
+                if name not in self.agents:
+                    raise ValueError(f"Agent '{name}' in flow is not in the agents list.")
+
+    @property
+    def max_in_flight(self) -> int:
+        """
+        The most tasks the pipeline holds at once: every queue full, every worker busy
+        and one task read by the feeder while it waits for room.
+        """
+        return (len(self.steps) + 1) * self.queue_size + len(self.steps) * self.workers_per_step + 1
+
+    def _put(self, target: "queue.Queue", item: Any, cancelled: threading.Event) -> bool:
+        # Bounded put that gives up when the batch is cancelled
+        while not cancelled.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _feed(self, tasks: Iterable[str], first: "queue.Queue", cancelled: threading.Event) -> None:
+        try:
+            for index, task in enumerate(tasks):
+                item = {"index": index, "task": task, "input": task, "outputs": {}, "error": None}
+                if not self._put(first, item, cancelled):
+                    return
+        except Exception as e:
+            # A failing task source ends the batch with the tasks read so far
+            self.stats["feed_error"] = f"{type(e).__name__}: {e}"
+        finally:
+            for _ in range(self.workers_per_step):
+                self._put(first, _DONE, cancelled)
+
+    def _run_step(
+        self,
+        index: int,
+        inbox: "queue.Queue",
+        outbox: "queue.Queue",
+        executor: ThreadPoolExecutor,
+        finished: List[int],
+        lock: threading.Lock,
+        cancelled: threading.Event,
+    ) -> None:
+        names = self.steps[index]
+        busy = 0.0
+        while not cancelled.is_set():
+            try:
+                item = inbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                break
+
+            if item["error"] is None:
+                start = time.perf_counter()
+                try:
+                    if len(names) == 1:
+                        outputs = {names[0]: run_isolated(self.agents[names[0]], item["input"])}
+                    else:
+                        futures = {
+                            name: executor.submit(run_isolated, self.agents[name], item["input"]) for name in names
+                        }
+                        outputs = {name: future.result() for name, future in futures.items()}
+                    item["outputs"].update(outputs)
+                    item["input"] = "; ".join(outputs.values())
+                except Exception as e:
+                    item["error"] = f"{', '.join(names)}: {type(e).__name__}: {e}"
+                busy += time.perf_counter() - start
+            if not self._put(outbox, item, cancelled):
+                break
+
+        with lock:
+            self.stats["step_busy_time"][index] += busy
+            finished[index] += 1
+            # The last worker of a step tells the next step's workers that the batch is over
+            last_worker = finished[index] == self.workers_per_step
+        if last_worker:
+            for _ in range(self.workers_per_step if index + 1 < len(self.steps) else 1):
+                self._put(outbox, _DONE, cancelled)
+
+    def run_batch(self, tasks: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Runs every task through the flow and yields each result as it completes.
+
+        With one worker per step, results come out in input order; with more,
+        use `index` to match them to their task. `stats` is updated as results
+        arrive, with completed and failed counts, elapsed time, tasks per minute
+        and the time each step spent working.
+
+        Args:
+            tasks (Iterable[str]): The tasks, e.g. a generator over client companies.
+
+        Yields:
+            Dict[str, Any]: The task's index, task, final output, per-agent outputs,
+            and error (None on success). A failed task skips its remaining steps.
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.steps) + 1)]
+        cancelled = threading.Event()
+        lock = threading.Lock()
+        finished = [0] * len(self.steps)
+        parallel_agents = max(len(step) for step in self.steps) * self.workers_per_step * len(self.steps)
+        executor = ThreadPoolExecutor(max_workers=parallel_agents)
+        start = time.perf_counter()
+        self.stats = {
+            "completed": 0,
+            "failed": 0,
+            "elapsed": 0.0,
+            "tasks_per_minute": 0.0,
+            "step_busy_time": [0.0] * len(self.steps),
+        }
+
+        threads = [threading.Thread(target=self._feed, args=(tasks, queues[0], cancelled), daemon=True)]
+        for index in range(len(self.steps)):
+            for _ in range(self.workers_per_step):
+                threads.append(
+                    threading.Thread(
+                        target=self._run_step,
+                        args=(index, queues[index], queues[index + 1], executor, finished, lock, cancelled),
+                        daemon=True,
+                    )
+                )
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _DONE:
+                    break
+                self.stats["failed" if item["error"] else "completed"] += 1
+                elapsed = time.perf_counter() - start
+                done = self.stats["completed"] + self.stats["failed"]
+                self.stats["elapsed"] = elapsed
+                self.stats["tasks_per_minute"] = done / elapsed * 60 if elapsed else 0.0
+                yield {
+                    "index": item["index"],
+                    "task": item["task"],
+                    "output": item["input"] if item["error"] is None else None,
+                    "outputs": item["outputs"],
+                    "error": item["error"],
+                }
+        finally:
+            # Stops the workers if the caller stops iterating early
+            cancelled.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def format_stats(self) -> str:
+        """
+        Formats the throughput of the last batch and how busy each step was.
+        """
+        stats = self.stats
+        elapsed = stats.get("elapsed") or 0.0
+        lines = [
+            f"{stats.get('completed', 0)} completed, {stats.get('failed', 0)} failed in {elapsed:.1f}s "
+            f"({stats.get('tasks_per_minute', 0.0):.1f} tasks/min)"
+        ]
+        for step, busy in zip(self.steps, stats.get("step_busy_time", [])):
+            utilization = busy / (elapsed * self.workers_per_step) if elapsed else 0.0
+            lines.append(f"  {', '.join(step)}: busy {utilization:.0%}")
+        return "\n".join(lines)
+
+
+# Example usage: 40 companies through a 4-step flow with stand-in agents
+if __name__ == "__main__":
+    class StubLLM:
+        def __init__(self, latency: float):
+            self.latency = latency
+
+        def run(self, prompt: str) -> str:
+            time.sleep(self.latency)
+            return f"done ({len(prompt)} chars)"
+
+    class StubAgent:
+        def __init__(self, agent_name: str, latency: float):
+            self.agent_name = agent_name
+            self.system_prompt = f"You are {agent_name}."
+            self.llm = StubLLM(latency)
+
+    stub_agents = [
+        StubAgent("AccountingDirector", 0.05),
+        StubAgent("BalanceSheetAnalyzer", 0.1),
+        StubAgent("CashFlowAnalyzer", 0.1),
+        StubAgent("ReportGenerator", 0.05),
+    ]
+    flow = "AccountingDirector -> BalanceSheetAnalyzer -> CashFlowAnalyzer -> ReportGenerator"
+    companies = (f"Analyze the Q4 cash flow statement and balance sheet of client company #{i}." for i in range(40))
+
+    pipeline = BatchAgentRearrange(stub_agents, flow, queue_size=4)
+    for result in pipeline.run_batch(companies):
+        pass
+    print(f"Sequential would take ~{40 * 0.3:.1f}s")
+    print(pipeline.format_stats())
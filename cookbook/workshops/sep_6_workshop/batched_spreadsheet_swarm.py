@@ -0,0 +1,207 @@
+import csv
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from agent_calls import run_isolated
+from streaming_csv_writer import StreamingResultWriter
+
+if TYPE_CHECKING:
+    from llm_telemetry import TelemetryRecorder
+
+CSV_COLUMNS = [
+    "Run ID",
+    "Agent Name",
+    "Task",
+    "Result",
+    "Timestamp",
+    "Repeat",
+    "End Time",
+    "Duration (s)",
+]
+
+
+class BatchedSpreadSheetSwarm:
+    """
+    A drop-in variant of SpreadSheetSwarm that runs every agent concurrently.
+
+    SpreadSheetSwarm stamps all outputs with the run's start time, so its metadata
+    cannot be used for throughput analysis. This variant submits the
+    `len(agents) * repeat_count` tasks to one thread pool and records the real
+    start time, end time and duration of each task, plus the run's throughput.
+    Every task is a separate `run_isolated` call, with the agent's system
+    prompt and the task only, so the repeats of one agent run at the same time
+    as each other and as the other agents, without sharing the agent's
+    conversation. The CSV keeps
+    SpreadSheetSwarm's columns and appends the timing columns. An existing CSV
+    with other columns (e.g. written by SpreadSheetSwarm) is renamed to
+    `<name>.<n>.csv` instead of being appended to under the wrong header.
+
+    When a StreamingResultWriter is given, each row is appended as soon as its
+    task finishes instead of writing the whole CSV at the end of the run. When
+    a TelemetryRecorder is given (see `instrument_agent`), the LLM calls made
+    during the run are rolled up into the metadata under "telemetry".
+
+    Args:
+        name (str): Name of the swarm, used for the metadata directory.
+        description (str): Description stored in the metadata.
+        agents (List[Any]): Agents exposing `agent_name`, `system_prompt`, `llm` and `run(task)`.
+        save_file_path (str): CSV file the outputs are written to.
+        repeat_count (int): Number of times each agent runs the task.
+        max_workers (Optional[int]): Concurrent requests. Defaults to one per task.
+        autosave_on (bool): Whether to write the CSV and metadata JSON after the run.
+        workspace_dir (str): Root directory for the metadata JSON.
+        writer (Optional[StreamingResultWriter]): Streams rows to disk as tasks finish.
+        telemetry (Optional[TelemetryRecorder]): Recorder the agents' LLM calls are logged to.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        agents: List[Any],
+        save_file_path: str,
+        repeat_count: int = 1,
+        max_workers: Optional[int] = None,
+        autosave_on: bool = True,
+        workspace_dir: str = os.getenv("WORKSPACE_DIR", "agent_workspace"),
+        writer: Optional[StreamingResultWriter] = None,
+        telemetry: Optional["TelemetryRecorder"] = None,
+    ):
+        if not agents:
+            raise ValueError("At least one agent is required.")
+        if repeat_count < 1:
+            raise ValueError("repeat_count must be at least 1.")
+
+        self.name = name
+        self.description = description
+        self.agents = agents
+        self.save_file_path = save_file_path
+        self.repeat_count = repeat_count
+        self.max_workers = max_workers or len(agents) * repeat_count
+        self.autosave_on = autosave_on
+        self.workspace_dir = workspace_dir
+        self.writer = writer
+        self.telemetry = telemetry
+
+    def _run_task(self, agent: Any, task: str, repeat: int) -> Dict[str, Any]:
+        start = time.perf_counter()
+        start_time = datetime.now().isoformat()
+        try:
+            result = run_isolated(agent, task)
+            error = None
+        except Exception as e:
+            result = None
+            error = f"{type(e).__name__}: {e}"
+
+        return {
+            "agent_name": agent.agent_name,
+            "task": task,
+            "repeat": repeat,
+            "result": result,
+            "error": error,
+            "start_time": start_time,
+            "end_time": datetime.now().isoformat(),
+            "duration": time.perf_counter() - start,
+        }
+
+    def run(self, task: str) -> Dict[str, Any]:
+        """
+        Runs every agent `repeat_count` times on the task concurrently.
+
+        Args:
+            task (str): The task given to every agent.
+
+        Returns:
+            Dict[str, Any]: Run metadata in SpreadSheetSwarm's format, with per-task timings.
+        """
+        run_id = f"spreadsheet_swarm_run_{datetime.now().isoformat()}"
+        csv_run_id = str(uuid.uuid4())
+        start = time.perf_counter()
+        start_time = datetime.now().isoformat()
+        first_record = len(self.telemetry.records) if self.telemetry else 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._run_task, agent, task, repeat)
+                # Repeat-major, so with fewer workers than tasks the first ones belong to different agents
+                for repeat in range(self.repeat_count)
+                for agent in self.agents
+            ]
+            outputs = []
+            for future in as_completed(futures):
+                output = future.result()
+                outputs.append(output)
+                if self.autosave_on and self.writer:
+                    self.writer.write(self._to_row(csv_run_id, output))
+
+        wall_time = time.perf_counter() - start
+        completed = sum(1 for output in outputs if output["error"] is None)
+        metadata = {
+            "run_id": run_id,
+            "name": self.name,
+            "description": self.description,
+            "agents": [agent.agent_name for agent in self.agents],
+            "start_time": start_time,
+            "end_time": datetime.now().isoformat(),
+            "tasks_completed": completed,
+            "tasks_failed": len(outputs) - completed,
+            "wall_time": wall_time,
+            "tasks_per_second": completed / wall_time if wall_time else 0.0,
+            "outputs": outputs,
+        }
+        if self.telemetry:
+            metadata["telemetry"] = self.telemetry.summary(start=first_record)
+
+        if self.autosave_on:
+            if not self.writer:
+                self._save_csv(csv_run_id, outputs)
+            self._save_metadata(metadata)
+
+        return metadata
+
+    @staticmethod
+    def _to_row(run_id: str, output: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "Run ID": run_id,
+            "Agent Name": output["agent_name"],
+            "Task": output["task"],
+            "Result": output["result"] if output["error"] is None else output["error"],
+            "Timestamp": output["start_time"],
+            "Repeat": output["repeat"],
+            "End Time": output["end_time"],
+            "Duration (s)": f"{output['duration']:.3f}",
+        }
+
+    def _save_csv(self, run_id: str, outputs: List[Dict[str, Any]]) -> None:
+        file_exists = os.path.exists(self.save_file_path) and os.path.getsize(self.save_file_path) > 0
+        if file_exists:
+            with open(self.save_file_path, newline="", encoding="utf-8") as file:
+                header = next(csv.reader(file), [])
+            if header != CSV_COLUMNS:
+                base, _ = os.path.splitext(self.save_file_path)
+                index = 1
+                while os.path.exists(f"{base}.{index}.csv"):
+                    index += 1
+                os.replace(self.save_file_path, f"{base}.{index}.csv")
+                file_exists = False
+
+        with open(self.save_file_path, "a", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=CSV_COLUMNS)
+            if not file_exists:
+                writer.writeheader()
+            for output in outputs:
+                writer.writerow(self._to_row(run_id, output))
+
+    def _save_metadata(self, metadata: Dict[str, Any]) -> None:
+        directory = os.path.join(self.workspace_dir, "Spreedsheet-Swarm", self.name)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(
+            directory, f"spreedsheet-swarm-{metadata['run_id']}_metadata.json"
+        )
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(metadata, file, indent=4, ensure_ascii=False)
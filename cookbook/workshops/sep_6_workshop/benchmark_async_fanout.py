@@ -0,0 +1,75 @@
+import argparse
+import time
+
+from swarms import Agent, AgentRearrange
+
+from async_rearrange import AsyncAgentRearrange
+from fake_llm import FakeLLM
+
+PLATFORMS = [
+    "Telegram",
+    "Discord",
+    "Twitter",
+    "Instagram",
+    "LinkedIn",
+    "YouTube",
+    "Website",
+]
+
+
+def build_agents(latency: float) -> list:
+    """
+    Builds the GPTuesday generator and platform optimizers on top of a fake model.
+
+    Args:
+        latency (float): Seconds each fake LLM call sleeps.
+
+    Returns:
+        list: The generator agent followed by one optimizer agent per platform.
+    """
+    model = FakeLLM(latency=latency)
+    names = ["Post-Generator-Agent"] + [f"{p}-Optimizer-Agent" for p in PLATFORMS]
+    return [
+        Agent(
+            agent_name=name,
+            system_prompt=f"You are the {name}.",
+            llm=model,
+            max_loops=1,
+            dashboard=False,
+            stopping_token="<DONE>",
+        )
+        for name in names
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare sequential and asyncio fan-out for the GPTuesday flow."
+    )
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--max-concurrency", type=int, default=7)
+    args = parser.parse_args()
+
+    agents = build_agents(args.latency)
+    flow = "Post-Generator-Agent -> " + ", ".join(
+        f"{p}-Optimizer-Agent" for p in PLATFORMS
+    )
+    task = "Create posts to advertise the upcoming GPTuesday event."
+
+    start = time.perf_counter()
+    AgentRearrange(agents=agents, flow=flow).run(task)
+    sequential = time.perf_counter() - start
+
+    result = AsyncAgentRearrange(
+        agents=agents, flow=flow, max_concurrency=args.max_concurrency
+    ).run(task)
+    concurrent = result["total_time"]
+
+    print(f"Fake LLM latency:   {args.latency:.2f}s per call")
+    print(f"Sequential:         {sequential:.2f}s")
+    print(f"Async fan-out:      {concurrent:.2f}s")
+    print(f"Speedup:            {sequential / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
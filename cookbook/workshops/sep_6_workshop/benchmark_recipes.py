@@ -0,0 +1,257 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from fake_llm import FakeLLM
+
+RECIPE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Recipes that run end to end with only OpenAIChat swapped out
+RECIPES = [
+    "agent_example.py",
+    "gptuesday_swarm.py",
+    "305_fights_tv.py",
+    "test_rearrange.py",
+]
+
+# Input files a recipe reads from its working directory
+FIXTURES = {"test_rearrange.py": ["data.csv"]}
+
+
+def run_recipe(recipe: str, model_options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Runs one recipe in this process with every OpenAIChat replaced by a FakeLLM.
+
+    The recipe's own output is captured rather than printed.
+
+    Args:
+        recipe (str): File name of the recipe in this directory.
+        model_options (Dict[str, Any]): Keyword arguments for FakeLLM.
+
+    Returns:
+        Dict[str, Any]: Wall time, calls, failures, simulated LLM time, peak RSS and any error.
+    """
+    import swarms
+
+    models: List[FakeLLM] = []
+
+    def fake_openai_chat(*args, **kwargs) -> FakeLLM:
+        model = FakeLLM(model_name=kwargs.get("model_name", "fake-llm"), **model_options)
+        models.append(model)
+        return model
+
+    swarms.OpenAIChat = fake_openai_chat
+    sys.path.insert(0, RECIPE_DIR)
+
+    error = None
+    output = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output):
+            runpy.run_path(os.path.join(RECIPE_DIR, recipe), run_name="__main__")
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    wall_time = time.perf_counter() - start
+
+    return {
+        "wall_time": wall_time,
+        "calls": sum(m.calls for m in models),
+        "failures": sum(m.failures for m in models),
+        "simulated_llm_time": sum(m.simulated_time for m in models),
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "error": error,
+    }
+
+
+def run_isolated(recipe: str, model_options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Runs a recipe in a fresh interpreter inside a scratch directory.
+
+    Each run gets its own process (so peak memory is per recipe) and its own
+    working directory and response cache (so files and cached answers from one
+    run do not leak into the next).
+
+    Args:
+        recipe (str): File name of the recipe in this directory.
+        model_options (Dict[str, Any]): Keyword arguments for FakeLLM.
+
+    Returns:
+        Dict[str, Any]: The result of `run_recipe` in the child process.
+    """
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        for name in FIXTURES.get(recipe, []):
+            shutil.copy(os.path.join(RECIPE_DIR, name), workdir)
+
+        env = dict(os.environ, LLM_CACHE_PATH=os.path.join(workdir, "llm_cache.sqlite"))
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [RECIPE_DIR, env.get("PYTHONPATH")]))
+        completed = subprocess.run(
+            [
+                sys.executable,
+                os.path.abspath(__file__),
+                "--child",
+                recipe,
+                "--model-options",
+                json.dumps(model_options),
+            ],
+            cwd=workdir,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines()
+        return {"error": lines[-1] if lines else "child process failed"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def benchmark(
+    recipes: List[str], model_options: Dict[str, Any], repeats: int = 1
+) -> Dict[str, Any]:
+    """
+    Benchmarks each recipe with the configured fake model and with a zero-latency one.
+
+    The zero-latency run measures orchestration overhead: the time the recipe
+    spends outside the model (agent setup, prompt building, scheduling, I/O).
+
+    Args:
+        recipes (List[str]): Recipes to run.
+        model_options (Dict[str, Any]): Keyword arguments for FakeLLM.
+        repeats (int): Runs per recipe; the fastest is reported.
+
+    Returns:
+        Dict[str, Any]: The fake model settings and one result per recipe.
+    """
+    instant = dict(model_options, latency=0.0, tokens_per_second=None)
+    results = {}
+    for recipe in recipes:
+        runs = [run_isolated(recipe, model_options) for _ in range(repeats)]
+        overhead_runs = [run_isolated(recipe, instant) for _ in range(repeats)]
+
+        errors = [r["error"] for r in runs + overhead_runs if r.get("error")]
+        if any("wall_time" not in r for r in runs + overhead_runs):
+            results[recipe] = {"error": errors[0]}
+            continue
+
+        best = min(runs, key=lambda r: r["wall_time"])
+        results[recipe] = {
+            "wall_time": best["wall_time"],
+            "overhead_time": min(r["wall_time"] for r in overhead_runs),
+            "calls": best["calls"],
+            "failures": best["failures"],
+            "calls_per_second": best["calls"] / best["wall_time"] if best["wall_time"] else 0.0,
+            "simulated_llm_time": best["simulated_llm_time"],
+            "peak_rss_mb": max(r["peak_rss_mb"] for r in runs),
+            "errors": errors,
+        }
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "model": model_options,
+        "repeats": repeats,
+        "recipes": results,
+    }
+
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any]) -> str:
+    """
+    Formats the change in wall time and overhead against a previous results file.
+
+    Args:
+        current (Dict[str, Any]): Results of this run.
+        previous (Dict[str, Any]): Results loaded from an earlier run.
+
+    Returns:
+        str: One line per recipe present in both.
+    """
+    lines = []
+    for recipe, result in current["recipes"].items():
+        before = previous.get("recipes", {}).get(recipe)
+        if not before or "wall_time" not in before or "wall_time" not in result:
+            continue
+        lines.append(
+            f"{recipe:<22} wall {_delta(before['wall_time'], result['wall_time'])}  "
+            f"overhead {_delta(before['overhead_time'], result['overhead_time'])}"
+        )
+    return "\n".join(lines)
+
+
+def _delta(before: float, after: float) -> str:
+    change = (after - before) / before * 100 if before else 0.0
+    return f"{before:.2f}s -> {after:.2f}s ({change:+.0f}%)"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the workshop recipes end to end against a fake LLM and record timings."
+    )
+    parser.add_argument("recipes", nargs="*", default=RECIPES)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per call before output.")
+    parser.add_argument("--output-tokens", type=int, default=200)
+    parser.add_argument("--tokens-per-second", type=float, default=100.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--output", help="Results file. Defaults to benchmark_results/<timestamp>.json.")
+    parser.add_argument("--compare", help="A previous results file to compare against.")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--model-options", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_recipe(args.child, json.loads(args.model_options))))
+        return
+
+    model_options = {
+        "latency": args.latency,
+        "output_tokens": args.output_tokens,
+        "tokens_per_second": args.tokens_per_second,
+        "failure_rate": args.failure_rate,
+        "seed": args.seed,
+    }
+    results = benchmark(args.recipes, model_options, repeats=args.repeats)
+
+    print(
+        f"{'recipe':<22} {'wall':>7} {'overhead':>9} {'calls':>6} {'failed':>7} "
+        f"{'calls/s':>8} {'peak MB':>8}"
+    )
+    for recipe, result in results["recipes"].items():
+        if "wall_time" not in result:
+            print(f"{recipe:<22} failed: {result['error']}")
+            continue
+        print(
+            f"{recipe:<22} {result['wall_time']:>6.2f}s {result['overhead_time']:>8.2f}s "
+            f"{result['calls']:>6} {result['failures']:>7} {result['calls_per_second']:>8.1f} "
+            f"{result['peak_rss_mb']:>8.1f}"
+        )
+        for error in result["errors"]:
+            print(f"  {error}")
+
+    output = args.output or os.path.join(
+        "benchmark_results", datetime.now().strftime("%Y%m%d-%H%M%S") + ".json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(results, file, indent=4)
+    print(f"Results saved to {output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            print(compare(results, json.load(file)))
+
+
+if __name__ == "__main__":
+    main()
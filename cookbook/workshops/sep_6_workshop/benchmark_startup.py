@@ -0,0 +1,153 @@
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+RECIPE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# What a short-lived job imports on each path
+IMPORT_PATHS = {
+    "interpreter only": "pass",
+    "eager (from swarms import ...)": "import swarms",
+    "recipe module (deferred swarms import)": "import art_therapy_agent",
+    "runner client": "import recipe_runner",
+}
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    Parses the output of `python -X importtime`.
+
+    Args:
+        stderr (str): The interpreter's stderr.
+
+    Returns:
+        List[Dict[str, Any]]: One entry per imported module with its self and
+        cumulative time in seconds and its nesting depth (0 = imported directly).
+    """
+    modules = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append(
+                {
+                    "module": name,
+                    "self": int(self_us) / 1e6,
+                    "cumulative": int(cumulative_us) / 1e6,
+                    # The first level of nesting is one space; each level adds two
+                    "depth": (len(indent) - 1) // 2,
+                }
+            )
+    return modules
+
+
+def measure_import(statement: str, runs: int = 3) -> Dict[str, Any]:
+    """
+    Runs `statement` in fresh interpreters with `-X importtime`.
+
+    Args:
+        statement (str): Python code to time, e.g. "import swarms".
+        runs (int): Number of interpreters started; the median is reported.
+
+    Returns:
+        Dict[str, Any]: Median wall time of the whole interpreter, median import
+        time of the top-level modules, the heaviest top-level packages of the last
+        run, and the error if the statement failed.
+    """
+    walls, import_times, modules = [], [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            cwd=RECIPE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        walls.append(time.perf_counter() - start)
+        if completed.returncode != 0:
+            return {"error": completed.stderr.strip().splitlines()[-1]}
+        modules = parse_importtime(completed.stderr)
+        import_times.append(sum(m["cumulative"] for m in modules if m["depth"] == 0))
+
+    heaviest = {}
+    for module in modules:
+        package = module["module"].split(".")[0]
+        heaviest[package] = heaviest.get(package, 0.0) + module["self"]
+    return {
+        "wall_time": statistics.median(walls),
+        "import_time": statistics.median(import_times),
+        "heaviest": sorted(heaviest.items(), key=lambda item: -item[1])[:5],
+        "error": None,
+    }
+
+
+def measure_round_trips(recipe: str, task: str, socket_path: str, runs: int) -> Optional[Dict[str, float]]:
+    """
+    Times complete client invocations against a running recipe runner.
+
+    Each run starts a fresh interpreter, as a cron or serverless job would, and
+    sends one task.
+
+    Returns:
+        Optional[Dict[str, float]]: Median and max seconds per invocation, or None
+        if no runner is listening.
+    """
+    if not os.path.exists(socket_path):
+        return None
+    statement = (
+        "from recipe_runner import run_remote; "
+        f"run_remote({recipe!r}, {task!r}, {socket_path!r})"
+    )
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], cwd=RECIPE_DIR, check=True)
+        times.append(time.perf_counter() - start)
+    return {"median": statistics.median(times), "max": max(times)}
+
+
+# Example usage:
+#   python benchmark_startup.py
+#   python recipe_runner.py serve &  python benchmark_startup.py --round-trips 5
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the workshop recipes.")
+    parser.add_argument("--runs", type=int, default=3, help="Interpreters started per measurement.")
+    parser.add_argument("--round-trips", type=int, default=0, help="Client invocations against a running runner.")
+    parser.add_argument("--recipe", default="agent_example", help="Recipe used for the round trips.")
+    parser.add_argument("--task", default="What are interesting ways to deduct taxes for a small business?")
+    parser.add_argument("--socket", default=None, help="Runner socket (default: RECIPE_RUNNER_SOCKET).")
+    args = parser.parse_args()
+
+    print(f"{'path':<42}{'imports':>10}{'process':>10}{'added':>10}  heaviest packages (self time)")
+    baseline = None
+    for label, statement in IMPORT_PATHS.items():
+        result = measure_import(statement, args.runs)
+        if result["error"]:
+            print(f"{label:<42}{'failed':>10}{'':>20}  {result['error']}")
+            continue
+        # Startup cost on top of a bare interpreter
+        baseline = result["wall_time"] if baseline is None else baseline
+        heaviest = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in result["heaviest"])
+        print(
+            f"{label:<42}{result['import_time']:>9.3f}s{result['wall_time']:>9.3f}s"
+            f"{result['wall_time'] - baseline:>9.3f}s  {heaviest}"
+        )
+
+    if args.round_trips:
+        from recipe_runner import SOCKET_PATH
+
+        trips = measure_round_trips(args.recipe, args.task, args.socket or SOCKET_PATH, args.round_trips)
+        if trips is None:
+            print("No recipe runner is listening; start one with `python recipe_runner.py serve`.")
+        else:
+            print(
+                f"Client invocation via the warm runner ({args.recipe}): "
+                f"median {trips['median']:.3f}s, max {trips['max']:.3f}s (includes the LLM call)"
+            )
@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+
+class DiscordStubHandler(BaseHTTPRequestHandler):
+    """
+    Imitates Discord's create-message endpoint and its per-route rate limit.
+
+    Every route allows `bucket_size` messages, then answers 429 with `Retry-After`
+    until `reset_after` seconds have passed. Received messages are recorded on
+    the server as `server.messages`.
+    """
+
+    bucket_size = 5
+    reset_after = 0.5
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+
+        with self.server.lock:
+            remaining, reset_at = self.server.buckets.get(self.path, (self.bucket_size, 0.0))
+            now = self.server.clock()
+            if now >= reset_at:
+                remaining, reset_at = self.bucket_size, now + self.reset_after
+
+            if remaining == 0:
+                self.server.rate_limited += 1
+                self._reply(
+                    429,
+                    {"message": "You are being rate limited.", "retry_after": reset_at - now, "global": False},
+                    [("Retry-After", f"{reset_at - now:.3f}")],
+                )
+                return
+
+            remaining -= 1
+            self.server.buckets[self.path] = (remaining, reset_at)
+            self.server.messages.append(payload.get("content"))
+
+        self._reply(
+            200,
+            {"id": str(len(self.server.messages)), "content": payload.get("content")},
+            [
+                ("X-RateLimit-Limit", str(self.bucket_size)),
+                ("X-RateLimit-Remaining", str(remaining)),
+                ("X-RateLimit-Reset-After", f"{reset_at - now:.3f}"),
+            ],
+        )
+
+    def _reply(self, status: int, body: dict, headers: List[Tuple[str, str]]):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port: int = 0) -> ThreadingHTTPServer:
+    """
+    Starts the stub server on a background thread.
+
+    Args:
+        port (int): Port to listen on. 0 picks a free port.
+
+    Returns:
+        ThreadingHTTPServer: The running server. Its URL is `http://127.0.0.1:<server.server_port>`.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), DiscordStubHandler)
+    server.lock = threading.Lock()
+    server.clock = time.monotonic
+    server.buckets = {}
+    server.messages = []
+    server.rate_limited = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# Example usage: send a burst of messages through the pooled sender against the stub
+if __name__ == "__main__":
+    import os
+
+    server = start_stub_server()
+    os.environ["DISCORD_API_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ.setdefault("DISCORD_BOT_TOKEN", "stub-token")
+    os.environ.setdefault("DISCORD_CHANNEL_ID", "123")
+
+    # Imported after the environment points at the stub
+    from discord_tool import send_discord_messages
+
+    start = time.perf_counter()
+    errors = send_discord_messages([f"Message {i}" for i in range(20)], max_workers=5)
+    print(
+        f"Sent {len(server.messages)}/20 messages in {time.perf_counter() - start:.2f}s, "
+        f"{server.rate_limited} rate-limited responses, "
+        f"{sum(e is not None for e in errors)} errors"
+    )
+    server.shutdown()
@@ -1,6 +1,13 @@
+import asyncio
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 # Load environment variables from .env file
 load_dotenv()
@@ -9,40 +16,201 @@ load_dotenv()
 TOKEN = os.getenv("DISCORD_BOT_TOKEN")
 CHANNEL_ID = os.getenv("DISCORD_CHANNEL_ID")
 
-DISCORD_API_URL = "https://discord.com/api/v10"
+# Can be pointed at a local stub server (see discord_stub_server.py)
+DISCORD_API_URL = os.getenv("DISCORD_API_URL", "https://discord.com/api/v10")
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size: int = 10) -> requests.Session:
+    """
+    Returns the process-wide HTTP session, creating it on first use.
+
+    Reusing one session keeps TCP/TLS connections to Discord alive between messages.
+
+    Args:
+        pool_size (int): Maximum number of pooled connections.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+class RateLimiter:
+    """
+    A token-bucket limiter that also follows Discord's rate-limit headers.
+
+    The bucket allows `rate` requests per second with bursts up to `capacity`.
+    On top of that, each route is paused until its reset time when Discord reports
+    `X-RateLimit-Remaining: 0`, and all routes are paused on a global 429.
+
+    Args:
+        rate (float): Requests per second allowed across all routes.
+        capacity (int): Maximum burst size.
+    """
+
+    def __init__(self, rate: float = 5.0, capacity: int = 5):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._route_resets: Dict[str, float] = {}
+        self._global_reset = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, route: str) -> None:
+        """
+        Blocks until a request to the route is allowed.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                wait_until = max(self._global_reset, self._route_resets.get(route, 0.0))
+                if wait_until <= now and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                delay = max(wait_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(delay)
 
+    def update(self, route: str, headers: Dict[str, str]) -> None:
+        """
+        Pauses the route until its reset time if Discord reports no remaining requests.
+        """
+        if headers.get("X-RateLimit-Remaining") == "0":
+            reset_after = float(headers.get("X-RateLimit-Reset-After", 1))
+            with self._lock:
+                self._route_resets[route] = time.monotonic() + reset_after
 
-def send_discord_message(message: str) -> None:
+    def block(self, route: str, retry_after: float, is_global: bool = False) -> None:
+        """
+        Pauses the route (or every route) for `retry_after` seconds after a 429.
+        """
+        with self._lock:
+            until = time.monotonic() + retry_after
+            if is_global:
+                self._global_reset = max(self._global_reset, until)
+            else:
+                self._route_resets[route] = max(self._route_resets.get(route, 0.0), until)
+
+
+_limiter = RateLimiter()
+
+
+def send_discord_message(
+    message: str,
+    channel_id: Optional[str] = None,
+    max_retries: int = 3,
+) -> None:
     """
     Sends a message to a Discord channel using Discord's HTTP API.
 
+    Uses the shared pooled session and rate limiter, and retries after a 429
+    response once the `Retry-After` delay has passed.
+
     Args:
         message (str): The message to send to the Discord channel.
+        channel_id (Optional[str]): The channel to send to. Defaults to DISCORD_CHANNEL_ID.
+        max_retries (int): Number of retries after rate-limit responses.
 
     Raises:
         ValueError: If the channel ID or message is invalid.
         requests.exceptions.RequestException: If an issue occurs while making the HTTP request.
     """
+    channel_id = channel_id or CHANNEL_ID
     if not TOKEN:
         raise ValueError("Discord bot token is not set in the .env file.")
-    if not CHANNEL_ID:
+    if not channel_id:
         raise ValueError("Discord channel ID is not set in the .env file.")
     if not message:
         raise ValueError("Message cannot be empty.")
 
-    url = f"{DISCORD_API_URL}/channels/{CHANNEL_ID}/messages"
+    route = f"/channels/{channel_id}/messages"
+    url = f"{DISCORD_API_URL}{route}"
     headers = {"Authorization": f"Bot {TOKEN}", "Content-Type": "application/json"}
     payload = {"content": message}
+    session = get_session()
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()  # Raise an exception for non-2xx status codes
-        print(f"Message sent: {message}")
+        for attempt in range(max_retries + 1):
+            _limiter.acquire(route)
+            response = session.post(url, headers=headers, json=payload)
+            _limiter.update(route, response.headers)
+
+            if response.status_code == 429 and attempt < max_retries:
+                body = response.json() if response.content else {}
+                retry_after = float(
+                    response.headers.get("Retry-After", body.get("retry_after", 1))
+                )
+                _limiter.block(route, retry_after, bool(body.get("global")))
+                continue
+
+            response.raise_for_status()  # Raise an exception for non-2xx status codes
+            print(f"Message sent: {message}")
+            return
     except requests.exceptions.RequestException as e:
         print(f"RequestException: {e}")
         raise
 
 
+def send_discord_messages(
+    messages: List[str],
+    channel_id: Optional[str] = None,
+    max_workers: int = 5,
+) -> List[Optional[Exception]]:
+    """
+    Sends many messages concurrently, bounded by `max_workers` and the shared rate limiter.
+
+    Discord does not guarantee ordering for concurrent sends; use `max_workers=1`
+    when the messages must appear in order.
+
+    Args:
+        messages (List[str]): The messages to send.
+        channel_id (Optional[str]): The channel to send to. Defaults to DISCORD_CHANNEL_ID.
+        max_workers (int): Maximum number of requests in flight.
+
+    Returns:
+        List[Optional[Exception]]: None for each message that was sent, or the error it raised.
+    """
+
+    def send(message: str) -> Optional[Exception]:
+        try:
+            send_discord_message(message, channel_id=channel_id)
+            return None
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(send, messages))
+
+
+async def asend_discord_messages(
+    messages: List[str],
+    channel_id: Optional[str] = None,
+    max_workers: int = 5,
+) -> List[Optional[Exception]]:
+    """
+    Async variant of `send_discord_messages` for use inside an event loop.
+    """
+    return await asyncio.to_thread(
+        send_discord_messages, messages, channel_id, max_workers
+    )
+
+
 # Example usage:
 if __name__ == "__main__":
     try:
@@ -0,0 +1,172 @@
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+MONTHS = [
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+]
+
+
+def load_ledger(file_path: str) -> pd.DataFrame:
+    """
+    Loads an expense ledger with Vendor, Service, Expense ($) and Month columns.
+
+    Text columns are stored as categoricals, so millions of rows with a few
+    thousand distinct vendors stay small in memory and group quickly.
+
+    Args:
+        file_path (str): Path to the CSV file.
+
+    Returns:
+        pd.DataFrame: The ledger with columns vendor, service, expense and month.
+    """
+    df = pd.read_csv(
+        file_path,
+        usecols=["Vendor", "Service", "Expense ($)", "Month"],
+        dtype={"Vendor": "category", "Service": "category", "Expense ($)": "float64"},
+    )
+    df = df.rename(
+        columns={
+            "Vendor": "vendor",
+            "Service": "service",
+            "Expense ($)": "expense",
+            "Month": "month",
+        }
+    )
+    df["month"] = pd.Categorical(df["month"], categories=MONTHS, ordered=True)
+    return df
+
+
+def build_digest(
+    df: pd.DataFrame,
+    recurring_min_months: int = 3,
+    outlier_threshold: float = 3.5,
+    top_n: int = 10,
+) -> Dict[str, Any]:
+    """
+    Computes a compact statistical digest of the ledger with vectorized group-bys.
+
+    Args:
+        df (pd.DataFrame): The ledger, as returned by `load_ledger`.
+        recurring_min_months (int): Distinct months a vendor must appear in to count as recurring.
+        outlier_threshold (float): Robust z-score (median/MAD within a service) above which
+            an expense is flagged as an unusually high outlier.
+        top_n (int): Number of vendors and outliers to include.
+
+    Returns:
+        Dict[str, Any]: Totals, per-service and per-month totals, top vendors, recurring
+        vendors and outliers.
+    """
+    by_service = (
+        df.groupby("service", observed=True)["expense"]
+        .agg(["sum", "count", "mean"])
+        .sort_values("sum", ascending=False)
+    )
+    by_month = df.groupby("month", observed=True)["expense"].sum()
+
+    by_vendor = df.groupby("vendor", observed=True).agg(
+        total=("expense", "sum"),
+        transactions=("expense", "size"),
+        months=("month", "nunique"),
+    )
+    recurring = by_vendor[by_vendor["months"] >= recurring_min_months].sort_values(
+        "total", ascending=False
+    )
+
+    # Robust z-score within each service: 0.6745 * (x - median) / MAD
+    grouped = df.groupby("service", observed=True)["expense"]
+    median = grouped.transform("median")
+    mad = (df["expense"] - median).abs().groupby(df["service"], observed=True).transform("median")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = np.where(mad > 0, 0.6745 * (df["expense"] - median) / mad, 0.0)
+    outliers = (
+        df.assign(score=score)[score > outlier_threshold]
+        .sort_values("score", ascending=False)
+        .head(top_n)
+    )
+
+    return {
+        "rows": len(df),
+        "total": float(df["expense"].sum()),
+        "by_service": by_service,
+        "by_month": by_month,
+        "top_vendors": by_vendor.sort_values("total", ascending=False).head(top_n),
+        "recurring_vendors": recurring.head(top_n),
+        "outliers": outliers,
+    }
+
+
+def digest_to_text(digest: Dict[str, Any]) -> str:
+    """
+    Renders a digest as compact markdown for an agent prompt.
+
+    Args:
+        digest (Dict[str, Any]): The digest returned by `build_digest`.
+
+    Returns:
+        str: A few kilobytes of text, independent of the number of ledger rows.
+    """
+
+    def table(frame: pd.DataFrame) -> str:
+        return frame.round(2).to_csv()
+
+    lines = [
+        f"Transactions: {digest['rows']}",
+        f"Total spend: ${digest['total']:,.2f}",
+        "",
+        "Spend by service (sum, count, mean):",
+        table(digest["by_service"]),
+        "Spend by month:",
+        table(digest["by_month"].to_frame("total")),
+        "Top vendors (total, transactions, distinct months):",
+        table(digest["top_vendors"]),
+        "Recurring vendors:",
+        table(digest["recurring_vendors"]) if len(digest["recurring_vendors"]) else "None\n",
+        "Outlier transactions (robust z-score within service):",
+        table(digest["outliers"].set_index("vendor")) if len(digest["outliers"]) else "None\n",
+    ]
+    return "\n".join(lines)
+
+
+def drill_down(
+    df: pd.DataFrame,
+    vendor: Optional[str] = None,
+    service: Optional[str] = None,
+    month: Optional[str] = None,
+    limit: int = 25,
+) -> str:
+    """
+    Returns the raw ledger rows matching a vendor, service and/or month, largest first.
+
+    Args:
+        df (pd.DataFrame): The ledger, as returned by `load_ledger`.
+        vendor (Optional[str]): Vendor to filter on.
+        service (Optional[str]): Service to filter on.
+        month (Optional[str]): Month to filter on.
+        limit (int): Maximum number of rows returned.
+
+    Returns:
+        str: The matching rows as CSV.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    if vendor:
+        mask &= (df["vendor"] == vendor).to_numpy()
+    if service:
+        mask &= (df["service"] == service).to_numpy()
+    if month:
+        mask &= (df["month"] == month).to_numpy()
+
+    rows = df[mask].nlargest(limit, "expense")
+    return rows.to_csv(index=False)
@@ -0,0 +1,127 @@
+import hashlib
+import random
+import threading
+import time
+from typing import Iterator, Optional
+
+
+class FakeLLMError(RuntimeError):
+    """
+    Raised by FakeLLM for an injected failure.
+    """
+
+
+class FakeLLM:
+    """
+    A deterministic stand-in for OpenAIChat that sleeps instead of calling an API.
+
+    The response is derived from a hash of the prompt, so the same prompt always
+    produces the same text, and every call takes `latency` seconds plus the time
+    to "generate" its output at `tokens_per_second`. This makes orchestration
+    code measurable offline without API keys.
+
+    Args:
+        latency (float): Seconds to sleep per call to simulate a network round-trip.
+        model_name (str): Name reported by the fake model.
+        output_tokens (Optional[int]): Approximate length of each response in tokens.
+            None returns a short one-line response.
+        tokens_per_second (Optional[float]): Simulated generation speed. None adds no generation time.
+        failure_rate (float): Probability that a call raises FakeLLMError.
+        seed (Optional[int]): Seed for the failure draws, so failing calls repeat between runs.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.5,
+        model_name: str = "fake-llm",
+        output_tokens: Optional[int] = None,
+        tokens_per_second: Optional[float] = None,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = 0,
+    ):
+        self.latency = latency
+        self.model_name = model_name
+        self.output_tokens = output_tokens
+        self.tokens_per_second = tokens_per_second
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self.failures = 0
+        self.simulated_time = 0.0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def run(self, task: str, *args, **kwargs) -> str:
+        """
+        Returns a deterministic response for the given task after sleeping.
+
+        Args:
+            task (str): The prompt sent to the model.
+
+        Returns:
+            str: A response that identifies the prompt it answers.
+
+        Raises:
+            FakeLLMError: For the fraction of calls set by `failure_rate`.
+        """
+        delay = self.latency
+        if self.output_tokens and self.tokens_per_second:
+            delay += self.output_tokens / self.tokens_per_second
+
+        with self._lock:
+            self.calls += 1
+            self.simulated_time += delay
+            failed = self._random.random() < self.failure_rate
+            if failed:
+                self.failures += 1
+
+        time.sleep(delay)
+        if failed:
+            raise FakeLLMError(f"{self.model_name}: injected failure")
+
+        return self._response(task)
+
+    def _response(self, task: str) -> str:
+        digest = hashlib.sha256(str(task).encode("utf-8")).hexdigest()[:12]
+        response = f"[{self.model_name}:{digest}] Response to: {str(task)[:80]}"
+        if self.output_tokens:
+            # Roughly one token per filler word, in paragraphs of 50 words
+            words = [digest[i % 12 : i % 12 + 4] for i in range(self.output_tokens)]
+            paragraphs = [" ".join(words[i : i + 50]) for i in range(0, len(words), 50)]
+            response = "\n\n".join([response] + paragraphs)
+        return response
+
+    def stream(self, task: str, *args, **kwargs) -> Iterator[str]:
+        """
+        Yields the response to the task word by word.
+
+        The first word arrives after `latency` seconds and the rest at
+        `tokens_per_second`, as with a streamed API response.
+
+        Args:
+            task (str): The prompt sent to the model.
+
+        Yields:
+            str: The next word of the response, with its trailing space.
+        """
+        with self._lock:
+            self.calls += 1
+            self.simulated_time += self.latency
+            failed = self._random.random() < self.failure_rate
+            if failed:
+                self.failures += 1
+
+        time.sleep(self.latency)
+        if failed:
+            raise FakeLLMError(f"{self.model_name}: injected failure")
+
+        response = self._response(task)
+        delay = 1 / self.tokens_per_second if self.tokens_per_second else 0.0
+        for index, word in enumerate(response.split(" ")):
+            if index and delay:
+                time.sleep(delay)
+                with self._lock:
+                    self.simulated_time += delay
+            yield word + " "
+
+    def __call__(self, task: str, *args, **kwargs) -> str:
+        return self.run(task, *args, **kwargs)
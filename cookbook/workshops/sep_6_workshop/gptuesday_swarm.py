@@ -1,6 +1,9 @@
 import os
-from swarms import OpenAIChat, Agent, AgentRearrange
+from swarms import OpenAIChat, Agent
 from dotenv import load_dotenv
+from async_rearrange import AsyncAgentRearrange
+from llm_cache import CachedLLM
+from prompt_budget import PromptAssembler, format_report
 
 load_dotenv()
 
@@ -8,28 +11,45 @@ load_dotenv()
 api_key = os.getenv("OPENAI_API_KEY")
 
 # Define the model to be used
-model = OpenAIChat(
-    model_name="gpt-4o-mini", openai_api_key=api_key, max_tokens=4000, temperature=0.1
+# Identical prompts are answered from the local response cache (llm_cache.sqlite)
+model = CachedLLM(
+    OpenAIChat(
+        model_name="gpt-4o-mini", openai_api_key=api_key, max_tokens=4000, temperature=0.1
+    )
 )
 
+# Context every agent shares. It is sent first and identically in each system
+# prompt so provider-side prompt caching can reuse it across the fan-out once it
+# reaches the provider's minimum (1024 tokens for OpenAI).
+SHARED_CONTEXT = """
+GPTuesday hosts weekly AI educational events and workshops in Miami.
+"""
+
+# Each agent-specific part is checked against a 300-token budget; a longer one
+# raises instead of being cut
+assembler = PromptAssembler(SHARED_CONTEXT)
+
 # Generator Agent - generates the core post
 post_generator_agent = Agent(
     agent_name="Post-Generator-Agent",
     description="Generates core social media posts to promote GPTuesday's weekly AI events and workshops.",
-    system_prompt="""
-    Your task is to generate an engaging, clear, and informative post to promote GPTuesday's weekly AI educational events and community. Include the following platforms and event links:
-    
-    • Telegram: https://t.me/+w7NqSJA2WmgxMzdh
-    • Discord: https://discord.gg/F8sSH4Gh
-    • Twitter: https://twitter.com/GPTuesdays
-    • Instagram: https://www.instagram.com/gptuesdays
-    • LinkedIn: https://www.linkedin.com/company/gptuesdays
-    • YouTube: https://www.youtube.com/@GPTuesdays
-    • Website: https://gptuesdays.com/
-    • Luma: https://lu.ma/GPTuesdays
-    
-    The tone should be professional yet friendly, encouraging people to join the events and connect on social platforms.
-    """,
+    system_prompt=assembler.build(
+        "Post-Generator-Agent",
+        """
+        Your task is to generate an engaging, clear, and informative post to promote GPTuesday's weekly AI educational events and community. Include the following platforms and event links:
+
+        • Telegram: https://t.me/+w7NqSJA2WmgxMzdh
+        • Discord: https://discord.gg/F8sSH4Gh
+        • Twitter: https://twitter.com/GPTuesdays
+        • Instagram: https://www.instagram.com/gptuesdays
+        • LinkedIn: https://www.linkedin.com/company/gptuesdays
+        • YouTube: https://www.youtube.com/@GPTuesdays
+        • Website: https://gptuesdays.com/
+        • Luma: https://lu.ma/GPTuesdays
+
+        The tone should be professional yet friendly, encouraging people to join the events and connect on social platforms.
+        """,
+    ),
     llm=model,
     max_loops=1,
     dashboard=False,
@@ -40,12 +60,15 @@ post_generator_agent = Agent(
 telegram_optimizer_agent = Agent(
     agent_name="Telegram-Optimizer-Agent",
     description="Optimizes posts for the casual and conversational tone of Telegram.",
-    system_prompt="""
-    Your task is to optimize the given post for Telegram. Telegram posts should be informal and community-oriented. Use conversational language and encourage users to join the community.
-    
-    Example:
-    "🚀 Join us for GPTuesday's weekly AI events and workshops! Explore the latest in AI, meet other enthusiasts, and learn something new. Join the chat: [Telegram link]."
-    """,
+    system_prompt=assembler.build(
+        "Telegram-Optimizer-Agent",
+        """
+        Your task is to optimize the given post for Telegram. Telegram posts should be informal and community-oriented. Use conversational language and encourage users to join the community.
+
+        Example:
+        "🚀 Join us for GPTuesday's weekly AI events and workshops! Explore the latest in AI, meet other enthusiasts, and learn something new. Join the chat: [Telegram link]."
+        """,
+    ),
     llm=model,
     max_loops=1,
     dashboard=False,
@@ -56,12 +79,15 @@ telegram_optimizer_agent = Agent(
 discord_optimizer_agent = Agent(
     agent_name="Discord-Optimizer-Agent",
     description="Optimizes posts for the vibrant and community-driven nature of Discord.",
-    system_prompt="""
-    Your task is to optimize the post for Discord. Keep it short, fun, and engaging, and be sure to encourage conversation and participation in the Discord server.
-    
-    Example:
-    "🎉 Get ready for GPTuesday's AI events! We're hosting weekly workshops and discussions. Connect with fellow AI enthusiasts and expand your knowledge. Join the server: [Discord link]."
-    """,
+    system_prompt=assembler.build(
+        "Discord-Optimizer-Agent",
+        """
+        Your task is to optimize the post for Discord. Keep it short, fun, and engaging, and be sure to encourage conversation and participation in the Discord server.
+
+        Example:
+        "🎉 Get ready for GPTuesday's AI events! We're hosting weekly workshops and discussions. Connect with fellow AI enthusiasts and expand your knowledge. Join the server: [Discord link]."
+        """,
+    ),
     llm=model,
     max_loops=1,
     dashboard=False,
@@ -72,12 +98,15 @@ discord_optimizer_agent = Agent(
 twitter_optimizer_agent = Agent(
     agent_name="Twitter-Optimizer-Agent",
     description="Optimizes posts for Twitter, ensuring concise and engaging messaging.",
-    system_prompt="""
-    Your task is to optimize the post for Twitter. Ensure that it is brief, uses clear language, and includes a call to action. Limit to 280 characters.
-    
-    Example:
-    "🚀 Join GPTuesday for weekly AI workshops & events in Miami! Connect with the AI community and learn the latest trends. Follow us: [Twitter link] #AI #GPTuesday"
-    """,
+    system_prompt=assembler.build(
+        "Twitter-Optimizer-Agent",
+        """
+        Your task is to optimize the post for Twitter. Ensure that it is brief, uses clear language, and includes a call to action. Limit to 280 characters.
+
+        Example:
+        "🚀 Join GPTuesday for weekly AI workshops & events in Miami! Connect with the AI community and learn the latest trends. Follow us: [Twitter link] #AI #GPTuesday"
+        """,
+    ),
     llm=model,
     max_loops=1,
     dashboard=False,
@@ -88,12 +117,15 @@ twitter_optimizer_agent = Agent(
 instagram_optimizer_agent = Agent(
     agent_name="Instagram-Optimizer-Agent",
     description="Optimizes posts for Instagram, with a focus on visual engagement and concise messaging.",
-    system_prompt="""
-    Your task is to optimize the post for Instagram. Use engaging language, encourage visual engagement, and suggest using event photos or graphics. Ensure a clear call to action.
-    
-    Example:
-    "📸 Join us every week for AI events in Miami with GPTuesday! Expand your skills, network with others, and explore the future of AI. Check out our upcoming events: [Instagram link]."
-    """,
+    system_prompt=assembler.build(
+        "Instagram-Optimizer-Agent",
+        """
+        Your task is to optimize the post for Instagram. Use engaging language, encourage visual engagement, and suggest using event photos or graphics. Ensure a clear call to action.
+
+        Example:
+        "📸 Join us every week for AI events in Miami with GPTuesday! Expand your skills, network with others, and explore the future of AI. Check out our upcoming events: [Instagram link]."
+        """,
+    ),
     llm=model,
     max_loops=1,
     dashboard=False,
@@ -104,12 +136,15 @@ instagram_optimizer_agent = Agent(
 linkedin_optimizer_agent = Agent(
     agent_name="LinkedIn-Optimizer-Agent",
     description="Optimizes posts for the professional tone of LinkedIn.",
-    system_prompt="""
-    Your task is to optimize the post for LinkedIn. Focus on a professional tone, highlighting networking opportunities and skill development. Encourage sign-ups and participation.
-    
-    Example:
-    "🌟 Expand your AI knowledge with GPTuesday's weekly workshops and events. Engage with AI professionals, network, and enhance your skills. Sign up for upcoming events here: [LinkedIn link]."
-    """,
+    system_prompt=assembler.build(
+        "LinkedIn-Optimizer-Agent",
+        """
+        Your task is to optimize the post for LinkedIn. Focus on a professional tone, highlighting networking opportunities and skill development. Encourage sign-ups and participation.
+
+        Example:
+        "🌟 Expand your AI knowledge with GPTuesday's weekly workshops and events. Engage with AI professionals, network, and enhance your skills. Sign up for upcoming events here: [LinkedIn link]."
+        """,
+    ),
     llm=model,
     max_loops=1,
     dashboard=False,
@@ -120,12 +155,15 @@ linkedin_optimizer_agent = Agent(
 youtube_optimizer_agent = Agent(
     agent_name="YouTube-Optimizer-Agent",
     description="Optimizes posts for YouTube, ensuring a focus on video content and event highlights.",
-    system_prompt="""
-    Your task is to optimize the post for YouTube. Emphasize the value of video content, such as event highlights or tutorials, and encourage subscriptions.
-    
-    Example:
-    "🎥 Want to dive deeper into AI? Check out GPTuesday's weekly workshops and event highlights on our YouTube channel. Subscribe for more insights and tutorials: [YouTube link]."
-    """,
+    system_prompt=assembler.build(
+        "YouTube-Optimizer-Agent",
+        """
+        Your task is to optimize the post for YouTube. Emphasize the value of video content, such as event highlights or tutorials, and encourage subscriptions.
+
+        Example:
+        "🎥 Want to dive deeper into AI? Check out GPTuesday's weekly workshops and event highlights on our YouTube channel. Subscribe for more insights and tutorials: [YouTube link]."
+        """,
+    ),
     llm=model,
     max_loops=1,
     dashboard=False,
@@ -136,12 +174,15 @@ youtube_optimizer_agent = Agent(
 website_optimizer_agent = Agent(
     agent_name="Website-Optimizer-Agent",
     description="Optimizes posts for the GPTuesday website, ensuring clarity and engagement.",
-    system_prompt="""
-    Your task is to optimize the post for the website. The content should be clear, informative, and engaging, ensuring users can easily find event details and sign-up links.
-    
-    Example:
-    "🚀 GPTuesday hosts weekly AI workshops and events in Miami. Join us to explore the latest in AI technology, network with others, and build your skills. Check out our upcoming events here: [Website link]."
-    """,
+    system_prompt=assembler.build(
+        "Website-Optimizer-Agent",
+        """
+        Your task is to optimize the post for the website. The content should be clear, informative, and engaging, ensuring users can easily find event details and sign-up links.
+
+        Example:
+        "🚀 GPTuesday hosts weekly AI workshops and events in Miami. Join us to explore the latest in AI technology, network with others, and build your skills. Check out our upcoming events here: [Website link]."
+        """,
+    ),
     llm=model,
     max_loops=1,
     dashboard=False,
@@ -160,13 +201,26 @@ agents = [
     website_optimizer_agent,
 ]
 
-swarm = AgentRearrange(
+# The seven optimizers only depend on the generator, so they run as concurrent
+# asyncio tasks. A failing or slow optimizer is reported in "errors" while the
+# other posts are still returned.
+swarm = AsyncAgentRearrange(
     agents=agents,
     flow="Post-Generator-Agent -> Telegram-Optimizer-Agent, Discord-Optimizer-Agent, Twitter-Optimizer-Agent, Instagram-Optimizer-Agent, LinkedIn-Optimizer-Agent, YouTube-Optimizer-Agent, Website-Optimizer-Agent",
-    # return_json=True,
+    max_concurrency=7,
+    branch_timeout=120,
 )
 
 
-swarm.run(
+# System prompt tokens of this run (one call per agent)
+print(format_report(assembler.report()))
+
+result = swarm.run(
     "Create posts to advertise the upcoming GPTuesday event on November 2nd at 6pm in Little Havana."
 )
+
+for agent_name, post in result["outputs"].items():
+    print(f"{agent_name}:\n{post}\n")
+
+for agent_name, error in result["errors"].items():
+    print(f"{agent_name} failed: {error}")
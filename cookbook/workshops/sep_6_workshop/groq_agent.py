@@ -6,6 +6,8 @@ from swarms.prompts.finance_agent_sys_prompt import (
 )
 from swarms.structs.agent import Agent
 from dotenv import load_dotenv
+from state_store import IncrementalStateStore
+from llm_telemetry import TelemetryRecorder, instrument_agent
 
 load_dotenv()
 
@@ -26,7 +28,8 @@ agent = Agent(
     system_prompt=FINANCIAL_AGENT_SYS_PROMPT,
     llm=model,
     max_loops=2,
-    autosave=True,
+    # State is persisted incrementally by the store below instead of full JSON dumps
+    autosave=False,
     dashboard=False,
     verbose=True,
     dynamic_temperature_enabled=True,
@@ -37,7 +40,18 @@ agent = Agent(
 )
 
 
+# Record TTFT, latency, tokens, retries and loop index for each of the agent's
+# LLM calls. Streaming is used so time-to-first-token can be measured.
+telemetry = TelemetryRecorder()
+instrument_agent(agent, telemetry, measure_ttft=True)
+
+# Static config is written once; each save only appends the new conversation turns
+state_store = IncrementalStateStore("agent_workspace", agent.agent_name, compress=False)
+
 out = agent.run(
     "How can I establish a ROTH IRA to buy stocks and get a tax break? What are the criteria"
 )
+state_store.save(agent)
+telemetry.write_openmetrics(f"agent_workspace/{agent.agent_name}_metrics.prom")
 print(out)
+print(telemetry.summary()["total"])
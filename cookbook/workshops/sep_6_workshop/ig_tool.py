@@ -1,16 +1,138 @@
 from instagrapi import Client
-from typing import List
+from typing import Callable, Dict, List, Optional
 import os
+import threading
+import time
 
+# Where logged-in client settings (cookies, device ids) are persisted between runs
+SESSION_DIR = os.getenv("INSTAGRAM_SESSION_DIR", "instagram_sessions")
 
-def send_instagram_dm(message: str, media_urls: List[str] = None) -> bool:
+
+class InstagramSession:
+    """
+    A long-lived, logged-in Instagram client for one account.
+
+    The client settings are saved to `<session_dir>/<username>.json` after login
+    and loaded on the next run, so Instagram sees a resumed session instead of a
+    fresh login. Username and media lookups are cached for the life of the session.
+
+    Args:
+        username (str): The Instagram account to log in as.
+        password (str): The account password.
+        session_dir (str): Directory where session settings are stored.
+    """
+
+    def __init__(self, username: str, password: str, session_dir: str = SESSION_DIR):
+        if not username or not password:
+            raise ValueError("Instagram username and password are required.")
+
+        self.username = username
+        self.password = password
+        self.settings_path = os.path.join(session_dir, f"{username}.json")
+        self._client: Optional[Client] = None
+        self._user_ids: Dict[str, str] = {}
+        self._media_pks: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> Client:
+        """
+        Returns the logged-in client, logging in (and restoring saved settings) on first use.
+        """
+        with self._lock:
+            if self._client is None:
+                client = Client()
+                if os.path.exists(self.settings_path):
+                    client.load_settings(self.settings_path)
+                client.login(self.username, self.password)
+
+                os.makedirs(os.path.dirname(self.settings_path) or ".", exist_ok=True)
+                client.dump_settings(self.settings_path)
+                self._client = client
+            return self._client
+
+    def user_id(self, username: str) -> str:
+        """
+        Returns the user ID for a username, looking it up once per session.
+        """
+        if username not in self._user_ids:
+            self._user_ids[username] = self.client.user_id_from_username(username)
+        return self._user_ids[username]
+
+    def media_pk(self, url: str) -> str:
+        """
+        Returns the media primary key for a post URL, looking it up once per session.
+        """
+        if url not in self._media_pks:
+            self._media_pks[url] = self.client.media_pk_from_url(url)
+        return self._media_pks[url]
+
+    def send(
+        self, message: str, recipient: str, media_urls: Optional[List[str]] = None
+    ) -> None:
+        """
+        Sends a direct message, optionally with media, to a recipient.
+        """
+        if not message:
+            raise ValueError("The message cannot be empty.")
+
+        user_id = self.user_id(recipient)
+        if media_urls:
+            # Send a DM with media (images/videos)
+            media_ids = [self.media_pk(url) for url in media_urls]
+            self.client.direct_send(message, [user_id], media_pk=media_ids)
+        else:
+            # Send a simple text DM
+            self.client.direct_send(message, [user_id])
+
+    def save(self) -> None:
+        """
+        Persists the current client settings so the next run can resume the session.
+        """
+        if self._client is not None:
+            self._client.dump_settings(self.settings_path)
+
+
+_sessions: Dict[str, InstagramSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_instagram_session(
+    username: Optional[str] = None, password: Optional[str] = None
+) -> InstagramSession:
+    """
+    Returns the long-lived session for an account, creating it on first use.
+
+    Args:
+        username (Optional[str]): The account. Defaults to INSTAGRAM_USERNAME.
+        password (Optional[str]): The password. Defaults to INSTAGRAM_PASSWORD.
+
+    Returns:
+        InstagramSession: The shared session for the account.
+    """
+    username = username or os.getenv("INSTAGRAM_USERNAME")
+    password = password or os.getenv("INSTAGRAM_PASSWORD")
+    if not username:
+        raise ValueError("The username cannot be empty.")
+
+    with _sessions_lock:
+        if username not in _sessions:
+            _sessions[username] = InstagramSession(username, password)
+        return _sessions[username]
+
+
+def send_instagram_dm(
+    message: str, media_urls: List[str] = None, recipient: Optional[str] = None
+) -> bool:
     """
     Sends a direct message to a user on Instagram.
 
+    Reuses the account's long-lived session instead of logging in for every message.
+
     Args:
-        username (str): The username of the recipient.
         message (str): The message to send in the DM.
         media_urls (List[str], optional): A list of URLs to media (images or videos) to send along with the message.
+        recipient (str, optional): The username of the recipient. Defaults to the logged-in account.
 
     Returns:
         bool: True if the DM was sent successfully, False otherwise.
@@ -19,31 +141,9 @@ def send_instagram_dm(message: str, media_urls: List[str] = None) -> bool:
         ValueError: If the username is invalid or the message is empty.
         Exception: If there is an issue with the Instagram API request.
     """
-    client = Client()
-
     try:
-        username = os.getenv("INSTAGRAM_USERNAME")
-        password = os.getenv("INSTAGRAM_PASSWORD")
-        # Log in to Instagram
-        client.login(username, password)
-
-        # Ensure the username and message are valid
-        if not username:
-            raise ValueError("The username cannot be empty.")
-        if not message:
-            raise ValueError("The message cannot be empty.")
-
-        # Get the user ID for the recipient
-        user_id = client.user_id_from_username(username)
-
-        if media_urls:
-            # Send a DM with media (images/videos)
-            media_ids = [client.media_pk_from_url(url) for url in media_urls]
-            client.direct_send(message, [user_id], media_pk=media_ids)
-        else:
-            # Send a simple text DM
-            client.direct_send(message, [user_id])
-
+        session = get_instagram_session()
+        session.send(message, recipient or session.username, media_urls)
         return True
 
     except ValueError as e:
@@ -52,5 +152,45 @@ def send_instagram_dm(message: str, media_urls: List[str] = None) -> bool:
     except Exception as e:
         print(f"Error: {e}")
         raise
+
+
+def send_instagram_dms(
+    messages: List[Dict],
+    delay: float = 2.0,
+    on_sent: Optional[Callable[[Dict], None]] = None,
+) -> List[bool]:
+    """
+    Sends many direct messages through one logged-in session.
+
+    Messages are sent one after another with a pause between them, because
+    Instagram throttles accounts that send bursts of DMs.
+
+    Args:
+        messages (List[Dict]): Dicts with "recipient", "message" and optional "media_urls".
+        delay (float): Seconds to wait between messages.
+        on_sent (Optional[Callable[[Dict], None]]): Called with each message right after
+            it was sent, e.g. to log it before the next one goes out.
+
+    Returns:
+        List[bool]: True for each message that was sent, False for each that failed.
+    """
+    session = get_instagram_session()
+    results = []
+
+    try:
+        for index, item in enumerate(messages):
+            if index:
+                time.sleep(delay)
+            try:
+                session.send(item["message"], item["recipient"], item.get("media_urls"))
+            except Exception as e:
+                print(f"Error sending to {item.get('recipient')}: {e}")
+                results.append(False)
+                continue
+            results.append(True)
+            if on_sent is not None:
+                on_sent(item)
     finally:
-        client.logout()
+        session.save()
+
+    return results
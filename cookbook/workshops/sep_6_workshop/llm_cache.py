@@ -0,0 +1,232 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from llm_proxy import LLMProxy
+
+DEFAULT_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite")
+
+
+class ResponseCache:
+    """
+    A content-addressed, on-disk cache of LLM responses backed by SQLite.
+
+    Entries expire after `ttl` seconds and the table is bounded to `max_entries`
+    rows, evicting the least recently used entries first. Hit and miss counters
+    are kept for the lifetime of the object.
+
+    Args:
+        path (str): Path to the SQLite file. It is created if it does not exist.
+        ttl (Optional[float]): Seconds an entry stays valid, or None to never expire.
+        max_entries (int): Maximum number of cached responses kept on disk.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl: Optional[float] = 24 * 60 * 60,
+        max_entries: int = 10_000,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        model_name: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        system_prompt: Optional[str],
+        task: str,
+    ) -> str:
+        """
+        Hashes every input that can change the response into a cache key.
+
+        Returns:
+            str: A hex SHA-256 digest.
+        """
+        payload = json.dumps(
+            [model_name, temperature, max_tokens, system_prompt, task],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the cached response for a key, or None on a miss or expired entry.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        """
+        Stores a response and evicts the least recently used entries above the size bound.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            self._conn.execute(
+                """
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns hit/miss counters and the number of entries currently stored.
+        """
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": size,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedLLM(LLMProxy):
+    """
+    Wraps a model such as OpenAIChat so identical calls are served from a ResponseCache.
+
+    The wrapper can be passed anywhere the model is, including `Agent(llm=...)`.
+    Attributes it does not define itself are read from and written to the wrapped
+    model, so settings changed at runtime (e.g. dynamic temperature) are part of
+    the cache key.
+
+    Args:
+        llm (Any): The model to wrap. It must be callable or expose `run(task)`.
+        cache (Optional[ResponseCache]): The cache to use. Defaults to one at DEFAULT_CACHE_PATH.
+        system_prompt (Optional[str]): A system prompt sent outside the task, if any.
+    """
+
+    _own_attributes = ("llm", "cache", "system_prompt")
+
+    def __init__(
+        self,
+        llm: Any,
+        cache: Optional[ResponseCache] = None,
+        system_prompt: Optional[str] = None,
+    ):
+        object.__setattr__(self, "llm", llm)
+        object.__setattr__(self, "cache", cache or ResponseCache())
+        object.__setattr__(self, "system_prompt", system_prompt)
+
+    def _key(self, task: str) -> str:
+        return ResponseCache.make_key(
+            getattr(self.llm, "model_name", None),
+            getattr(self.llm, "temperature", None),
+            getattr(self.llm, "max_tokens", None),
+            self.system_prompt,
+            task,
+        )
+
+    def run(self, task: str, *args, **kwargs) -> str:
+        """
+        Returns the cached response for the task, calling the wrapped model on a miss.
+
+        Args:
+            task (str): The prompt to send to the model.
+
+        Returns:
+            str: The model response.
+        """
+        key = self._key(task)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        if callable(self.llm):
+            response = self.llm(task, *args, **kwargs)
+        else:
+            response = self.llm.run(task, *args, **kwargs)
+
+        self.cache.set(key, str(response))
+        return response
+
+    def stream(self, task: str, *args, **kwargs) -> Iterator[Any]:
+        """
+        Streams the response for the task, serving it from the cache when it is there.
+
+        A cached response is yielded as one chunk. On a miss the wrapped model's
+        chunks are yielded as they arrive and the joined text is cached once the
+        stream completes; a stream that is closed early or fails is not cached.
+        Models without a `stream` method are called through `run`.
+
+        Args:
+            task (str): The prompt to send to the model.
+
+        Yields:
+            Any: The response chunks.
+        """
+        if not hasattr(self.llm, "stream"):
+            yield self.run(task, *args, **kwargs)
+            return
+
+        key = self._key(task)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        for chunk in self.llm.stream(task, *args, **kwargs):
+            # Chat models yield message chunks, completion models yield strings
+            chunks.append(str(getattr(chunk, "content", chunk)))
+            yield chunk
+        self.cache.set(key, "".join(chunks))
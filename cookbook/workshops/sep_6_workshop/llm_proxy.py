@@ -0,0 +1,36 @@
+from typing import Any, List, Tuple
+
+
+class LLMProxy:
+    """
+    Base class for wrappers that stand in for the model they wrap, e.g. in `Agent(llm=...)`.
+
+    Attributes named in `_own_attributes` live on the wrapper and must be set
+    with `object.__setattr__` in `__init__`. Any other attribute is read from
+    the first wrapped model and written to every wrapped model, so settings
+    changed at runtime (e.g. a dynamic temperature) reach the models.
+
+    Subclasses implement `run(task)` and, when they wrap more than `self.llm`,
+    override `_wrapped`.
+    """
+
+    _own_attributes: Tuple[str, ...] = ("llm",)
+
+    def _wrapped(self) -> List[Any]:
+        return [self.llm]
+
+    def __call__(self, task: str, *args, **kwargs) -> Any:
+        return self.run(task, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for missing attributes; guard against recursion before __init__ ran
+        if name in type(self)._own_attributes:
+            raise AttributeError(name)
+        return getattr(self._wrapped()[0], name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in type(self)._own_attributes:
+            object.__setattr__(self, name, value)
+        else:
+            for llm in self._wrapped():
+                setattr(llm, name, value)
@@ -0,0 +1,264 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+from llm_proxy import LLMProxy
+
+
+class BackendStats:
+    """
+    Rolling latency and error statistics for one backend.
+
+    Args:
+        window (int): Number of recent calls the statistics are computed over.
+    """
+
+    def __init__(self, window: int = 50):
+        self._latencies = deque(maxlen=window)
+        self._outcomes = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.hedges = 0
+        self.wins = 0
+        self.cooldown_until = 0.0
+
+    def observe(self, latency: float, ok: bool) -> None:
+        self.calls += 1
+        self._outcomes.append(ok)
+        if ok:
+            self._latencies.append(latency)
+        else:
+            self.errors += 1
+
+    @property
+    def samples(self) -> int:
+        return len(self._latencies)
+
+    @property
+    def recent_calls(self) -> int:
+        return len(self._outcomes)
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return 1 - sum(self._outcomes) / len(self._outcomes)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class RouterLLM(LLMProxy):
+    """
+    Routes each call to the fastest healthy backend among several interchangeable models.
+
+    Backends are ranked by rolling p50 latency; ones that have not answered yet
+    are tried first so every backend gets measured. A backend whose error rate
+    over the window reaches `max_error_rate` is skipped for `cooldown` seconds.
+
+    With hedging on, if the chosen backend has not answered within its p95
+    latency, the same request is also sent to the next-ranked backend and the
+    first successful answer is returned. The slower request cannot be cancelled
+    once sent (it runs on a worker thread), so it still completes and counts
+    towards its backend's statistics. When a backend fails, the next one is tried.
+
+    Like CachedLLM, the router can be passed anywhere a model is. Attributes it
+    does not define are read from the first backend and written to all of them,
+    so settings such as a dynamic temperature apply to every backend.
+
+    Args:
+        backends (Dict[str, Any]): Models by name, in order of preference. Each must be
+            callable or expose `run(task)`.
+        window (int): Number of recent calls per backend the statistics cover.
+        max_error_rate (float): Error rate at which a backend is put in cooldown.
+        cooldown (float): Seconds an unhealthy backend is skipped.
+        hedge (bool): Whether to send a second request when the first is slow.
+        hedge_delay (float): Seconds to wait before hedging while a backend has too few samples.
+        min_samples (int): Latency samples needed before the backend's own p95 is used.
+        max_workers (int): Maximum number of requests in flight.
+    """
+
+    _own_attributes = (
+        "backends",
+        "stats",
+        "window",
+        "max_error_rate",
+        "cooldown",
+        "hedge",
+        "hedge_delay",
+        "min_samples",
+        "model_name",
+        "_executor",
+        "_lock",
+    )
+
+    def __init__(
+        self,
+        backends: Dict[str, Any],
+        window: int = 50,
+        max_error_rate: float = 0.5,
+        cooldown: float = 30.0,
+        hedge: bool = True,
+        hedge_delay: float = 2.0,
+        min_samples: int = 5,
+        max_workers: int = 16,
+    ):
+        if not backends:
+            raise ValueError("At least one backend is required.")
+
+        set_own = object.__setattr__
+        set_own(self, "backends", dict(backends))
+        set_own(self, "stats", {name: BackendStats(window) for name in backends})
+        set_own(self, "window", window)
+        set_own(self, "max_error_rate", max_error_rate)
+        set_own(self, "cooldown", cooldown)
+        set_own(self, "hedge", hedge)
+        set_own(self, "hedge_delay", hedge_delay)
+        set_own(self, "min_samples", min_samples)
+        # Identifies the router, e.g. in CachedLLM keys, independently of which backend answers
+        set_own(self, "model_name", "router:" + ",".join(backends))
+        set_own(self, "_executor", ThreadPoolExecutor(max_workers=max_workers))
+        set_own(self, "_lock", threading.Lock())
+
+    def ranked_backends(self) -> List[str]:
+        """
+        Returns the backends in the order they would be tried.
+
+        Healthy backends come first, unmeasured ones before measured ones, then by
+        p50 latency. Backends in cooldown are only used when no other is left.
+        """
+        now = time.monotonic()
+        order = list(self.backends)
+
+        with self._lock:
+
+            def key(name: str):
+                stats = self.stats[name]
+                p50 = stats.quantile(0.5)
+                return (
+                    stats.cooldown_until > now,
+                    p50 is not None,
+                    p50 or 0.0,
+                    order.index(name),
+                )
+
+            return sorted(order, key=key)
+
+    def _hedge_after(self, name: str) -> float:
+        with self._lock:
+            stats = self.stats[name]
+            if stats.samples < self.min_samples:
+                return self.hedge_delay
+            return stats.quantile(0.95)
+
+    def _call(self, name: str, task: str, args: tuple, kwargs: dict) -> Any:
+        llm = self.backends[name]
+        start = time.perf_counter()
+        try:
+            if callable(llm):
+                response = llm(task, *args, **kwargs)
+            else:
+                response = llm.run(task, *args, **kwargs)
+        except Exception:
+            self._observe(name, time.perf_counter() - start, ok=False)
+            raise
+        self._observe(name, time.perf_counter() - start, ok=True)
+        return response
+
+    def _observe(self, name: str, latency: float, ok: bool) -> None:
+        with self._lock:
+            stats = self.stats[name]
+            stats.observe(latency, ok)
+            if (
+                not ok
+                and stats.recent_calls >= self.min_samples
+                and stats.error_rate >= self.max_error_rate
+            ):
+                stats.cooldown_until = time.monotonic() + self.cooldown
+
+    def run(self, task: str, *args, **kwargs) -> Any:
+        """
+        Sends the task to the best backend, hedging and failing over as needed.
+
+        Args:
+            task (str): The prompt to send.
+
+        Returns:
+            Any: The first successful response.
+
+        Raises:
+            Exception: The last backend error if every backend failed.
+        """
+        remaining = self.ranked_backends()
+        pending: Dict[Future, str] = {}
+        last_error: Optional[Exception] = None
+
+        def submit() -> None:
+            name = remaining.pop(0)
+            pending[self._executor.submit(self._call, name, task, args, kwargs)] = name
+
+        submit()
+        while pending:
+            # Hedge only while a single request is in flight and another backend is left
+            timeout = None
+            if self.hedge and remaining and len(pending) == 1:
+                timeout = self._hedge_after(next(iter(pending.values())))
+
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                with self._lock:
+                    self.stats[remaining[0]].hedges += 1
+                submit()
+                continue
+
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                with self._lock:
+                    self.stats[name].wins += 1
+                return response
+
+            # Everything in flight failed; fail over to the next backend
+            if not pending and remaining:
+                submit()
+
+        raise last_error
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the current statistics of every backend.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: p50/p95 latency, error rate, calls, errors,
+            hedged requests sent to it, wins and whether it is in cooldown.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {
+                    "p50": stats.quantile(0.5),
+                    "p95": stats.quantile(0.95),
+                    "error_rate": stats.error_rate,
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "hedges": stats.hedges,
+                    "wins": stats.wins,
+                    "cooling_down": stats.cooldown_until > now,
+                }
+                for name, stats in self.stats.items()
+            }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def _wrapped(self) -> List[Any]:
+        return list(self.backends.values())
@@ -0,0 +1,167 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import requests
+
+
+class ChatCompletionsStubHandler(BaseHTTPRequestHandler):
+    """
+    Imitates an OpenAI-compatible `/chat/completions` endpoint with configurable behaviour.
+
+    Each response is delayed by the server's `latency` seconds, plus `tail_latency`
+    for a `tail_rate` fraction of requests, and a `error_rate` fraction of
+    requests answer 500. The number of requests served is kept as `server.requests`.
+    """
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+
+        with server.lock:
+            server.requests += 1
+            slow = server.random.random() < server.tail_rate
+            failed = server.random.random() < server.error_rate
+
+        time.sleep(server.latency + (server.tail_latency if slow else 0.0))
+        if failed:
+            self._reply(500, {"error": {"message": "stub failure", "type": "server_error"}})
+            return
+
+        prompt = payload.get("messages", [{}])[-1].get("content", "")
+        self._reply(
+            200,
+            {
+                "id": f"chatcmpl-{server.requests}",
+                "object": "chat.completion",
+                "model": payload.get("model", server.name),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {
+                            "role": "assistant",
+                            "content": f"[{server.name}] Response to: {prompt[:80]}",
+                        },
+                        "finish_reason": "stop",
+                    }
+                ],
+            },
+        )
+
+    def _reply(self, status: int, body: dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(
+    name: str,
+    latency: float = 0.1,
+    error_rate: float = 0.0,
+    tail_rate: float = 0.0,
+    tail_latency: float = 0.0,
+    port: int = 0,
+    seed: Optional[int] = 0,
+) -> ThreadingHTTPServer:
+    """
+    Starts a stub chat-completions server on a background thread.
+
+    Args:
+        name (str): Name the stub puts in its responses.
+        latency (float): Seconds every response takes.
+        error_rate (float): Fraction of requests that answer 500.
+        tail_rate (float): Fraction of requests that take `tail_latency` longer.
+        tail_latency (float): Extra seconds for slow requests.
+        port (int): Port to listen on. 0 picks a free port.
+        seed (Optional[int]): Seed for the error and tail draws.
+
+    Returns:
+        ThreadingHTTPServer: The running server. Its base URL is `http://127.0.0.1:<server.server_port>/v1`.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), ChatCompletionsStubHandler)
+    server.name = name
+    server.latency = latency
+    server.error_rate = error_rate
+    server.tail_rate = tail_rate
+    server.tail_latency = tail_latency
+    server.random = random.Random(seed)
+    server.lock = threading.Lock()
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class ChatCompletionsClient:
+    """
+    A minimal client for an OpenAI-compatible chat-completions endpoint.
+
+    Used to point RouterLLM at the stub servers without an OpenAI SDK.
+
+    Args:
+        base_url (str): The API base, e.g. `http://127.0.0.1:8000/v1`.
+        model_name (str): Model sent with each request.
+        api_key (str): Bearer token sent with each request.
+        timeout (float): Seconds before a request is abandoned.
+    """
+
+    def __init__(self, base_url: str, model_name: str, api_key: str = "stub", timeout: float = 30.0):
+        self.base_url = base_url.rstrip("/")
+        self.model_name = model_name
+        self.api_key = api_key
+        self.timeout = timeout
+        self.temperature = 0.1
+        self.session = requests.Session()
+
+    def __call__(self, task: str) -> str:
+        response = self.session.post(
+            f"{self.base_url}/chat/completions",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={
+                "model": self.model_name,
+                "temperature": self.temperature,
+                "messages": [{"role": "user", "content": task}],
+            },
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+
+# Example usage: route 40 requests over a fast-but-flaky and a slower-but-steady stub
+if __name__ == "__main__":
+    from llm_router import RouterLLM
+
+    openai_stub = start_stub_server("openai", latency=0.05, tail_rate=0.1, tail_latency=1.0, error_rate=0.1)
+    groq_stub = start_stub_server("groq", latency=0.15, seed=1)
+
+    router = RouterLLM(
+        {
+            "openai": ChatCompletionsClient(f"http://127.0.0.1:{openai_stub.server_port}/v1", "gpt-4o-mini"),
+            "groq": ChatCompletionsClient(f"http://127.0.0.1:{groq_stub.server_port}/v1", "llama-3.1-70b-versatile"),
+        },
+        hedge_delay=0.3,
+    )
+
+    latencies = []
+    for i in range(40):
+        start = time.perf_counter()
+        router.run(f"Request {i}")
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    print(f"p50 {latencies[len(latencies) // 2]:.3f}s, max {latencies[-1]:.3f}s")
+    for name, stats in router.report().items():
+        print(name, stats)
+    router.close()
+    openai_stub.shutdown()
+    groq_stub.shutdown()
@@ -0,0 +1,346 @@
+import functools
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional
+
+from llm_cache import CachedLLM
+from llm_proxy import LLMProxy
+from prompt_budget import count_tokens
+
+# Quantiles reported for latency and time-to-first-token
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class TelemetryRecorder:
+    """
+    Collects one record per LLM call and exports them as rollups or OpenMetrics text.
+
+    Each record holds the agent name, the agent run it belongs to, the loop
+    index within that run, the number of failed attempts before it, start time,
+    time-to-first-token (streamed calls only), total latency, estimated prompt
+    and completion tokens, and the error if the call failed.
+    """
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def summary(self, start: int = 0) -> Dict[str, Any]:
+        """
+        Rolls the records up per agent.
+
+        Args:
+            start (int): Index of the first record to include, e.g. `len(recorder.records)`
+                taken when a swarm run began.
+
+        Returns:
+            Dict[str, Any]: Totals and latency quantiles per agent and overall.
+        """
+        with self._lock:
+            records = self.records[start:]
+
+        return {
+            "agents": {
+                name: _rollup(agent_records)
+                for name, agent_records in _by_agent(records).items()
+            },
+            "total": _rollup(records),
+        }
+
+    def to_openmetrics(self) -> str:
+        """
+        Renders the records in the OpenMetrics text format.
+
+        Returns:
+            str: Summaries for latency and time-to-first-token, and counters for
+            calls, errors, retries and tokens, labelled by agent.
+        """
+        with self._lock:
+            by_agent = _by_agent(self.records)
+        summary = {agent: _rollup(records) for agent, records in by_agent.items()}
+        lines = []
+
+        for metric, key, help_text in (
+            ("llm_call_latency_seconds", "latency", "Total latency of an LLM call."),
+            ("llm_time_to_first_token_seconds", "ttft", "Time to the first streamed token."),
+        ):
+            lines += [f"# TYPE {metric} summary", f"# UNIT {metric} seconds", f"# HELP {metric} {help_text}"]
+            for agent, records in by_agent.items():
+                values = [r[key] for r in records if r[key] is not None]
+                label = _label(agent)
+                for q in QUANTILES:
+                    if values:
+                        lines.append(f'{metric}{{agent="{label}",quantile="{q}"}} {_quantile(values, q):.6f}')
+                lines.append(f'{metric}_count{{agent="{label}"}} {len(values)}')
+                lines.append(f'{metric}_sum{{agent="{label}"}} {sum(values):.6f}')
+
+        for metric, key, help_text in (
+            ("llm_calls", "calls", "LLM calls, including failed attempts."),
+            ("llm_call_errors", "errors", "LLM calls that raised."),
+            ("llm_call_retries", "retries", "LLM calls made after a failed attempt."),
+            ("llm_prompt_tokens", "prompt_tokens", "Estimated prompt tokens sent."),
+            ("llm_completion_tokens", "completion_tokens", "Estimated completion tokens received."),
+        ):
+            lines += [f"# TYPE {metric} counter", f"# HELP {metric} {help_text}"]
+            for agent, rollup in summary.items():
+                lines.append(f'{metric}_total{{agent="{_label(agent)}"}} {rollup[key]}')
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_openmetrics(self, path: str) -> None:
+        """
+        Writes the OpenMetrics text to a file, e.g. for the node_exporter textfile collector.
+
+        Args:
+            path (str): Destination file. It is replaced atomically.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(self.to_openmetrics())
+        os.replace(tmp_path, path)
+
+    def serve(self, port: int = 9464) -> ThreadingHTTPServer:
+        """
+        Serves the metrics at `http://127.0.0.1:<port>/metrics` on a background thread.
+
+        Args:
+            port (int): Port to listen on. 0 picks a free port.
+
+        Returns:
+            ThreadingHTTPServer: The running server; call `shutdown()` to stop it.
+        """
+        recorder = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                data = recorder.to_openmetrics().encode("utf-8")
+                self.send_response(200)
+                self.send_header(
+                    "Content-Type", "application/openmetrics-text; version=1.0.0; charset=utf-8"
+                )
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+class TelemetryLLM(LLMProxy):
+    """
+    Wraps a model so every call made through it is recorded in a TelemetryRecorder.
+
+    Like CachedLLM, attributes it does not define are read from and written to
+    the wrapped model. Calls are attributed to the agent run that is active on
+    the calling thread (see `instrument_agent`), so concurrent runs of the same
+    agent get separate loop and retry counts. Calls through `stream` are
+    recorded once the stream ends, with their time-to-first-token.
+
+    Args:
+        llm (Any): The model to wrap. It must be callable or expose `run(task)`.
+        recorder (TelemetryRecorder): Where the call records go.
+        agent_name (str): Agent the calls are attributed to.
+        measure_ttft (bool): Serve `run` through `llm.stream(task)` when available to
+            measure time-to-first-token.
+    """
+
+    _own_attributes = ("llm", "recorder", "agent_name", "measure_ttft", "_context", "_runs")
+
+    def __init__(
+        self,
+        llm: Any,
+        recorder: TelemetryRecorder,
+        agent_name: str = "llm",
+        measure_ttft: bool = False,
+    ):
+        object.__setattr__(self, "llm", llm)
+        object.__setattr__(self, "recorder", recorder)
+        object.__setattr__(self, "agent_name", agent_name)
+        object.__setattr__(self, "measure_ttft", measure_ttft)
+        object.__setattr__(self, "_context", threading.local())
+        object.__setattr__(self, "_runs", 0)
+
+    def begin_run(self) -> None:
+        """
+        Starts a new agent run on the calling thread, resetting the loop and retry counts.
+        """
+        with self.recorder._lock:
+            object.__setattr__(self, "_runs", self._runs + 1)
+            self._context.run = self._runs
+        self._context.loop = 0
+        self._context.attempt = 0
+
+    def _start_record(self, task: str) -> Dict[str, Any]:
+        if not hasattr(self._context, "run"):
+            self.begin_run()
+        return {
+            "agent_name": self.agent_name,
+            "run": self._context.run,
+            "loop": self._context.loop,
+            "retry": self._context.attempt,
+            "start_time": time.time(),
+            "ttft": None,
+            "latency": None,
+            "prompt_tokens": count_tokens(str(task)),
+            "completion_tokens": 0,
+            "error": None,
+        }
+
+    def _finish_record(
+        self, record: Dict[str, Any], start: float, response: Any = None, error: Optional[Exception] = None
+    ) -> None:
+        record["latency"] = time.perf_counter() - start
+        if error is not None:
+            record["error"] = f"{type(error).__name__}: {error}"
+            self._context.attempt += 1
+        else:
+            record["completion_tokens"] = count_tokens(str(response))
+            self._context.loop += 1
+            self._context.attempt = 0
+        self.recorder.record(record)
+
+    def _timed_chunks(self, record: Dict[str, Any], start: float, chunks: Iterator[Any]) -> Iterator[Any]:
+        for index, chunk in enumerate(chunks):
+            if index == 0:
+                record["ttft"] = time.perf_counter() - start
+            yield chunk
+
+    def run(self, task: str, *args, **kwargs) -> str:
+        """
+        Calls the wrapped model and records the call.
+
+        Args:
+            task (str): The prompt to send to the model.
+
+        Returns:
+            str: The model response.
+        """
+        record = self._start_record(task)
+        start = time.perf_counter()
+        try:
+            if self.measure_ttft and hasattr(self.llm, "stream"):
+                chunks = self._timed_chunks(record, start, self.llm.stream(task, *args, **kwargs))
+                response = "".join(str(getattr(chunk, "content", chunk)) for chunk in chunks)
+            elif callable(self.llm):
+                response = self.llm(task, *args, **kwargs)
+            else:
+                response = self.llm.run(task, *args, **kwargs)
+        except Exception as e:
+            self._finish_record(record, start, error=e)
+            raise
+
+        self._finish_record(record, start, response=response)
+        return response
+
+    def stream(self, task: str, *args, **kwargs) -> Iterator[Any]:
+        """
+        Streams from the wrapped model and records the call once the stream ends.
+
+        Models without a `stream` method are called through `run`, as one chunk.
+
+        Args:
+            task (str): The prompt to send to the model.
+
+        Yields:
+            Any: The response chunks.
+        """
+        if not hasattr(self.llm, "stream"):
+            yield self.run(task, *args, **kwargs)
+            return
+
+        record = self._start_record(task)
+        start = time.perf_counter()
+        text = []
+        try:
+            for chunk in self._timed_chunks(record, start, self.llm.stream(task, *args, **kwargs)):
+                text.append(str(getattr(chunk, "content", chunk)))
+                yield chunk
+        except Exception as e:
+            self._finish_record(record, start, error=e)
+            raise
+        self._finish_record(record, start, response="".join(text))
+
+
+def instrument_agent(agent: Any, recorder: TelemetryRecorder, measure_ttft: bool = False) -> Any:
+    """
+    Records every LLM call an agent makes, with its loop index and retry count.
+
+    The agent's model is wrapped in a TelemetryLLM and `agent.run` is wrapped so
+    each run starts fresh loop and retry counts. When the model is a CachedLLM,
+    the model inside it is wrapped instead, behind a CachedLLM of the agent's
+    own that shares the same cache: cache hits never reach the model, so they
+    are not recorded as calls, and a CachedLLM shared by several agents is left
+    as it is.
+
+    Args:
+        agent (Any): An Agent with `agent_name`, `llm` and `run(task)`.
+        recorder (TelemetryRecorder): Where the call records go.
+        measure_ttft (bool): Stream calls to measure time-to-first-token.
+
+    Returns:
+        Any: The same agent, instrumented in place.
+    """
+    if isinstance(agent.llm, CachedLLM):
+        llm = TelemetryLLM(agent.llm.llm, recorder, agent.agent_name, measure_ttft=measure_ttft)
+        agent.llm = CachedLLM(llm, cache=agent.llm.cache, system_prompt=agent.llm.system_prompt)
+    else:
+        llm = TelemetryLLM(agent.llm, recorder, agent.agent_name, measure_ttft=measure_ttft)
+        agent.llm = llm
+    run = agent.run
+
+    @functools.wraps(run)
+    def instrumented_run(*args, **kwargs):
+        llm.begin_run()
+        return run(*args, **kwargs)
+
+    agent.run = instrumented_run
+    return agent
+
+
+def _rollup(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    latencies = [r["latency"] for r in records if r["latency"] is not None]
+    ttfts = [r["ttft"] for r in records if r["ttft"] is not None]
+    rollup = {
+        "calls": len(records),
+        "errors": sum(1 for r in records if r["error"]),
+        "retries": sum(1 for r in records if r["retry"]),
+        "max_loop": max((r["loop"] for r in records), default=None),
+        "prompt_tokens": sum(r["prompt_tokens"] for r in records),
+        "completion_tokens": sum(r["completion_tokens"] for r in records),
+        "latency_sum": sum(latencies),
+    }
+    for q in QUANTILES:
+        rollup[f"latency_p{int(q * 100)}"] = _quantile(latencies, q) if latencies else None
+        rollup[f"ttft_p{int(q * 100)}"] = _quantile(ttfts, q) if ttfts else None
+    return rollup
+
+
+def _by_agent(records: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    by_agent: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        by_agent.setdefault(record["agent_name"], []).append(record)
+    return by_agent
+
+
+def _quantile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
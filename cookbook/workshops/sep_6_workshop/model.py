@@ -1,17 +1,39 @@
 import os
 from swarms import OpenAIChat
 from dotenv import load_dotenv
+from llm_cache import CachedLLM
+from llm_router import RouterLLM
 
 load_dotenv()
 
 api_key = os.getenv("OPENAI_API_KEY")
 # .env OPENAI_API_KEY="sk-"
 
-model = OpenAIChat(
-    model_name="gpt-4o-mini", openai_api_key=api_key, max_tokens=4000, temperature=0.1
-)
+backends = {
+    "openai": OpenAIChat(
+        model_name="gpt-4o-mini", openai_api_key=api_key, max_tokens=4000, temperature=0.1
+    )
+}
+
+# Groq serves the same OpenAI-compatible API; add it as a second backend when configured
+# .env GROQ_API_KEY="gsk_"
+if os.getenv("GROQ_API_KEY"):
+    backends["groq"] = OpenAIChat(
+        openai_api_base="https://api.groq.com/openai/v1",
+        openai_api_key=os.getenv("GROQ_API_KEY"),
+        model_name="llama-3.1-70b-versatile",
+        max_tokens=4000,
+        temperature=0.1,
+    )
+
+# Each request goes to the fastest healthy backend, with a hedged request to the
+# other one if the first is slower than its p95. Identical prompts are answered
+# from the local response cache (llm_cache.sqlite).
+model = CachedLLM(RouterLLM(backends))
 
 out = model(
     "How can I establish a ROTH IRA to buy stocks and get a tax break? What are the criteria"
 )
 print(out)
+print(model.cache.stats())
+print(model.llm.report())
@@ -0,0 +1,262 @@
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from prompt_budget import count_tokens
+
+# Recipients who already received a message, one JSON object per line
+SENT_LOG_PATH = os.getenv("OUTREACH_SENT_LOG", "outreach_sent_log.jsonl")
+
+# Profile fields passed to the model; anything else in a profile is left out of the prompt
+PROFILE_FIELDS = ("username", "name", "bio", "notes")
+
+# A Markdown code fence around the answer, e.g. ```json ... ```
+_CODE_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+def normalize_recipient(username: str) -> str:
+    """
+    Normalizes an Instagram handle, so "@Jasmine.Art" and "jasmine.art" are the same recipient.
+    """
+    return username.strip().lstrip("@").lower()
+
+
+class SentLog:
+    """
+    An append-only log of the recipients a message was sent to.
+
+    Each line of the file is `{"recipient": ..., "message": ..., "sent_at": ...}`,
+    so the log can be read, grepped or trimmed by hand. It is loaded once, and
+    every `record` appends one line.
+
+    Args:
+        path (str): The log file. Created on the first `record`.
+    """
+
+    def __init__(self, path: str = SENT_LOG_PATH):
+        self.path = path
+        self._recipients = set()
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        self._recipients.add(normalize_recipient(json.loads(line)["recipient"]))
+
+    def __contains__(self, recipient: str) -> bool:
+        return normalize_recipient(recipient) in self._recipients
+
+    def __len__(self) -> int:
+        return len(self._recipients)
+
+    def record(self, recipient: str, message: str) -> None:
+        entry = {"recipient": normalize_recipient(recipient), "message": message, "sent_at": time.time()}
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._recipients.add(entry["recipient"])
+
+
+def _profile_for_prompt(profile: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: profile[field] for field in PROFILE_FIELDS if profile.get(field)}
+
+
+def build_batch_prompt(profiles: List[Dict[str, Any]]) -> str:
+    """
+    Builds one request that asks for a personalized message per recipient.
+
+    Args:
+        profiles (List[Dict[str, Any]]): Recipient profiles with at least "username".
+
+    Returns:
+        str: The task, listing the profiles as a JSON array.
+    """
+    recipients = json.dumps([_profile_for_prompt(profile) for profile in profiles], ensure_ascii=False, indent=1)
+    return (
+        f"Write one outreach message for each of the {len(profiles)} recipients below, following the rules "
+        "and examples above. Personalize each message with the recipient's name and anything in their "
+        "profile; do not reuse the same opening for every recipient.\n\n"
+        f"Recipients:\n{recipients}\n\n"
+        'Answer with only a JSON array, one object per recipient in the same order: '
+        '[{"username": "<username>", "message": "<message>"}, ...]'
+    )
+
+
+def build_single_prompt(profile: Dict[str, Any]) -> str:
+    return (
+        "Write the outreach message for this recipient, following the rules and examples above. "
+        "Answer with only the message.\n\n"
+        f"Recipient: {json.dumps(_profile_for_prompt(profile), ensure_ascii=False)}"
+    )
+
+
+def parse_batch_response(response: str) -> Optional[Dict[str, str]]:
+    """
+    Parses a batch response into messages per recipient.
+
+    Tolerates a Markdown code fence or text around the array, including text
+    with brackets such as "[Name]": the first well-formed JSON array of objects
+    is used. Entries without a username or with an empty message are dropped.
+
+    Args:
+        response (str): The model's answer to `build_batch_prompt`.
+
+    Returns:
+        Optional[Dict[str, str]]: Normalized username to message, or None if the
+        response holds no JSON array of objects.
+    """
+    text = response or ""
+    fence = _CODE_FENCE.search(text)
+    if fence:
+        text = fence.group(1)
+
+    decoder = json.JSONDecoder()
+    entries = None
+    start = text.find("[")
+    while start != -1:
+        try:
+            candidate, _ = decoder.raw_decode(text, start)
+        except json.JSONDecodeError:
+            candidate = None
+        if isinstance(candidate, list) and candidate and all(isinstance(entry, dict) for entry in candidate):
+            entries = candidate
+            break
+        start = text.find("[", start + 1)
+    if entries is None:
+        return None
+
+    messages = {}
+    for entry in entries:
+        username, message = entry.get("username"), entry.get("message")
+        if isinstance(username, str) and isinstance(message, str) and message.strip():
+            messages[normalize_recipient(username)] = message.strip()
+    return messages
+
+
+class OutreachBatcher:
+    """
+    Drafts outreach messages for many recipients with a few large requests.
+
+    The system prompt with its example messages is the same for every
+    recipient, so instead of one request per recipient, `batch_size` profiles
+    are packed into one request and the model answers with a JSON array of
+    messages. If a response is not a valid array, every recipient of that
+    batch is drafted with its own request; recipients missing from an
+    otherwise valid array are drafted one by one as well. Recipients found in
+    the sent log, or listed twice, are skipped before any request is made.
+
+    Args:
+        llm (Any): The model, exposing `run(prompt)` or `__call__(prompt)`.
+        system_prompt (str): The outreach instructions and examples.
+        batch_size (int): Recipients per request.
+        sent_log (Optional[SentLog]): Recipients to skip. None skips only duplicates within a call.
+        max_workers (int): Requests sent at the same time.
+    """
+
+    def __init__(
+        self,
+        llm: Any,
+        system_prompt: str,
+        batch_size: int = 20,
+        sent_log: Optional[SentLog] = None,
+        max_workers: int = 4,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+
+        self.llm = llm
+        self.system_prompt = system_prompt.strip()
+        self.batch_size = batch_size
+        self.sent_log = sent_log
+        self.max_workers = max_workers
+        self.stats: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
+
+    def _call(self, task: str) -> str:
+        prompt = f"{self.system_prompt}\n\n{task}"
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["prompt_tokens"] += count_tokens(prompt)
+        return str(self.llm.run(prompt) if hasattr(self.llm, "run") else self.llm(prompt))
+
+    def _draft_one(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            message = self._call(build_single_prompt(profile)).strip()
+            return {"recipient": profile["username"], "message": message, "error": None}
+        except Exception as e:
+            return {"recipient": profile["username"], "message": None, "error": f"{type(e).__name__}: {e}"}
+
+    def _draft_batch(self, profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        try:
+            messages = parse_batch_response(self._call(build_batch_prompt(profiles)))
+        except Exception:
+            messages = None
+        if messages is None:
+            with self._stats_lock:
+                self.stats["malformed_batches"] += 1
+            messages = {}
+
+        drafts = []
+        for profile in profiles:
+            message = messages.get(normalize_recipient(profile["username"]))
+            if message is None:
+                with self._stats_lock:
+                    self.stats["fallbacks"] += 1
+                drafts.append(self._draft_one(profile))
+            else:
+                drafts.append({"recipient": profile["username"], "message": message, "error": None})
+        return drafts
+
+    def draft(self, profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drafts a message for every recipient not yet in the sent log.
+
+        Args:
+            profiles (List[Dict[str, Any]]): Recipient profiles with "username" and
+                optionally "name", "bio" and "notes".
+
+        Returns:
+            List[Dict[str, Any]]: One draft per new recipient, in input order, with
+            "recipient", "message" and "error" (None on success). Nothing is recorded
+            as sent; call `SentLog.record` once a message has actually gone out.
+        """
+        self.stats = {
+            "recipients": len(profiles),
+            "skipped": 0,
+            "requests": 0,
+            "malformed_batches": 0,
+            "fallbacks": 0,
+            "prompt_tokens": 0,
+        }
+
+        seen = set()
+        pending = []
+        for profile in profiles:
+            recipient = normalize_recipient(profile["username"])
+            if recipient in seen or (self.sent_log is not None and recipient in self.sent_log):
+                self.stats["skipped"] += 1
+                continue
+            seen.add(recipient)
+            pending.append(profile)
+
+        batches = [pending[i : i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return [draft for drafts in executor.map(self._draft_batch, batches) for draft in drafts]
+
+    def format_stats(self) -> str:
+        """
+        Summarizes the last `draft` call, including the prompt tokens spent per drafted recipient.
+        """
+        stats = self.stats
+        drafted = stats.get("recipients", 0) - stats.get("skipped", 0)
+        per_recipient = stats.get("prompt_tokens", 0) / drafted if drafted else 0.0
+        return (
+            f"{drafted} drafted, {stats.get('skipped', 0)} skipped (already sent or duplicate) with "
+            f"{stats.get('requests', 0)} requests; {stats.get('malformed_batches', 0)} malformed batches, "
+            f"{stats.get('fallbacks', 0)} single-recipient fallbacks; "
+            f"{per_recipient:.0f} prompt tokens per recipient"
+        )
@@ -0,0 +1,168 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Optional[Any]:
+    # None when tiktoken is missing or cannot fetch its encoding file (offline)
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimates the number of tokens in a text.
+
+    Uses tiktoken (the gpt-4o encoding) when it is installed and falls back to
+    ~4 characters per token.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: The estimated token count.
+    """
+    encoding = _encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
+
+
+class PromptAssembler:
+    """
+    Builds agent system prompts as one shared prefix plus a short agent-specific part.
+
+    Every prompt starts with the same `shared_context`, byte for byte, so
+    providers that cache prompt prefixes only bill it at full price once they
+    reach `min_cache_tokens`. The agent-specific part is counted against a
+    per-agent token budget before anything is sent. An over-budget part is
+    summarized when a summarizer is given; it is never cut, so a part that
+    still does not fit raises a ValueError.
+
+    Args:
+        shared_context (str): Context common to every agent (brand, audience, goals, links).
+        default_budget (int): Token budget for an agent-specific part.
+        budgets (Optional[Dict[str, int]]): Per-agent overrides of `default_budget`.
+        summarizer (Optional[Callable[[str], str]]): Used to shorten over-budget parts.
+        min_cache_tokens (int): Shortest prefix the provider caches (1024 for OpenAI).
+    """
+
+    def __init__(
+        self,
+        shared_context: str,
+        default_budget: int = 300,
+        budgets: Optional[Dict[str, int]] = None,
+        summarizer: Optional[Callable[[str], str]] = None,
+        min_cache_tokens: int = 1024,
+    ):
+        self.shared_context = shared_context.strip()
+        self.default_budget = default_budget
+        self.budgets = budgets or {}
+        self.summarizer = summarizer
+        self.min_cache_tokens = min_cache_tokens
+        self.prefix_tokens = count_tokens(self.shared_context)
+        self.prompts: Dict[str, str] = {}
+        self._unsummarized: Dict[str, str] = {}
+
+    def build(self, agent_name: str, instructions: str) -> str:
+        """
+        Returns the system prompt for an agent and records it for `report`.
+
+        Args:
+            agent_name (str): The agent the prompt is for.
+            instructions (str): The agent-specific instructions.
+
+        Returns:
+            str: The shared prefix followed by the instructions.
+
+        Raises:
+            ValueError: If the instructions exceed the agent's budget, even after summarizing.
+        """
+        budget = self.budgets.get(agent_name, self.default_budget)
+        specific = _dedent(instructions)
+        tokens = count_tokens(specific)
+        if tokens > budget and self.summarizer is not None:
+            specific = self.summarizer(specific)
+            tokens = count_tokens(specific)
+        if tokens > budget:
+            raise ValueError(
+                f"The instructions for '{agent_name}' are {tokens} tokens, over their budget of {budget}."
+            )
+
+        prompt = f"{self.shared_context}\n\n{specific}"
+        self.prompts[agent_name] = prompt
+        self._unsummarized[agent_name] = f"{self.shared_context}\n\n{_dedent(instructions)}"
+        return prompt
+
+    def report(self, calls_per_agent: int = 1) -> Dict[str, Any]:
+        """
+        Counts the tokens the assembled prompts send per run.
+
+        Args:
+            calls_per_agent (int): LLM calls each agent makes per run.
+
+        Returns:
+            Dict[str, Any]: Token counts per agent and per run, including the tokens
+            saved by summarizing and the tokens a provider prefix cache can serve
+            after the first call.
+        """
+        agents = {}
+        for agent_name, prompt in self.prompts.items():
+            baseline = count_tokens(self._unsummarized[agent_name])
+            assembled = count_tokens(prompt)
+            agents[agent_name] = {
+                "baseline_tokens": baseline,
+                "assembled_tokens": assembled,
+                "saved_tokens": baseline - assembled,
+            }
+
+        calls = len(agents) * calls_per_agent
+        cacheable = self.prefix_tokens >= self.min_cache_tokens
+        baseline_total = sum(a["baseline_tokens"] for a in agents.values()) * calls_per_agent
+        assembled_total = sum(a["assembled_tokens"] for a in agents.values()) * calls_per_agent
+        return {
+            "agents": agents,
+            "calls": calls,
+            "prefix_tokens": self.prefix_tokens,
+            "baseline_tokens": baseline_total,
+            "assembled_tokens": assembled_total,
+            "saved_tokens": baseline_total - assembled_total,
+            # Every call after the first starts with the same prefix, but the
+            # provider only caches it once it reaches min_cache_tokens
+            "cacheable_prefix_tokens": self.prefix_tokens * max(calls - 1, 0) if cacheable else 0,
+        }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    Renders a `PromptAssembler.report` as a short summary.
+
+    Args:
+        report (Dict[str, Any]): The report to render.
+
+    Returns:
+        str: One line per agent and a total line.
+    """
+    lines = [
+        f"{name}: {a['baseline_tokens']} -> {a['assembled_tokens']} tokens"
+        for name, a in report["agents"].items()
+    ]
+    if report["cacheable_prefix_tokens"]:
+        cache = f"{report['cacheable_prefix_tokens']} cacheable"
+    else:
+        cache = "too short for the provider prefix cache"
+    lines.append(
+        f"System prompt tokens per run: {report['baseline_tokens']} -> {report['assembled_tokens']} "
+        f"({report['saved_tokens']} saved by summarizing over {report['calls']} calls); "
+        f"shared prefix {report['prefix_tokens']} tokens, {cache}"
+    )
+    return "\n".join(lines)
+
+
+def _dedent(text: str) -> str:
+    lines: List[str] = [line.strip() for line in text.strip().splitlines()]
+    return "\n".join(lines)
@@ -0,0 +1,272 @@
+import importlib
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Only the standard library is imported here, so a client call starts in milliseconds.
+# swarms is imported by the recipe builders, once per runner process.
+
+# Can be overridden per deployment, e.g. to a path under /run
+SOCKET_PATH = os.getenv("RECIPE_RUNNER_SOCKET", "/tmp/swarms_recipe_runner.sock")
+
+# Recipe name -> "module:function" returning a ready agent; modules are imported on first use
+RECIPES = {
+    "agent_example": "agent_example:build_agent",
+    "art_therapy": "art_therapy_agent:build_agent",
+}
+
+
+def _load_builder(target: str) -> Callable[[], Any]:
+    module_name, function_name = target.split(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+class AgentPool:
+    """
+    Keeps pre-built agents per recipe so tasks skip import and construction time.
+
+    Each recipe has up to `size` agents, so that many of its tasks can run at once
+    without two tasks sharing an agent's conversation. After a task, the agent's
+    conversation is cut back to what it held when built; an agent whose memory
+    cannot be reset that way is rebuilt instead. A build that fails gives its
+    slot back, so the next task of the recipe builds again instead of waiting
+    for an agent that will never arrive.
+
+    Args:
+        recipes (Dict[str, str]): Recipe name to "module:function" builder.
+        size (int): Agents kept per recipe.
+    """
+
+    def __init__(self, recipes: Optional[Dict[str, str]] = None, size: int = 2):
+        self.recipes = dict(recipes or RECIPES)
+        self.size = size
+        self._idle: Dict[str, "queue.Queue"] = {}
+        self._built: Dict[str, int] = {}
+        self._baselines: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.build_times: Dict[str, List[float]] = {}
+
+    def _build(self, recipe: str) -> Any:
+        start = time.perf_counter()
+        agent = _load_builder(self.recipes[recipe])()
+        self.build_times.setdefault(recipe, []).append(time.perf_counter() - start)
+        history = getattr(getattr(agent, "short_memory", None), "conversation_history", None)
+        if isinstance(history, list):
+            self._baselines[id(agent)] = len(history)
+        return agent
+
+    def _build_in_slot(self, recipe: str) -> Any:
+        # The slot was reserved by the caller; a failed build releases it
+        try:
+            return self._build(recipe)
+        except Exception:
+            with self._lock:
+                self._built[recipe] -= 1
+            raise
+
+    def warm(self, recipes: Optional[List[str]] = None) -> None:
+        """
+        Imports and builds every agent of the given recipes (default: all) ahead of the first task.
+        """
+        for recipe in recipes or list(self.recipes):
+            idle = self._queue(recipe)
+            while True:
+                with self._lock:
+                    if self._built[recipe] >= self.size:
+                        break
+                    self._built[recipe] += 1
+                idle.put(self._build_in_slot(recipe))
+
+    def _queue(self, recipe: str) -> "queue.Queue":
+        if recipe not in self.recipes:
+            raise KeyError(f"Unknown recipe '{recipe}'. Available: {', '.join(self.recipes)}")
+        with self._lock:
+            if recipe not in self._idle:
+                self._idle[recipe] = queue.Queue()
+                self._built[recipe] = 0
+            return self._idle[recipe]
+
+    @contextmanager
+    def acquire(self, recipe: str) -> Iterator[Any]:
+        """
+        Lends an idle agent of the recipe, building one if fewer than `size` exist.
+
+        Raises:
+            KeyError: If the recipe is unknown.
+        """
+        idle = self._queue(recipe)
+        agent = None
+        while agent is None:
+            try:
+                agent = idle.get_nowait()
+                break
+            except queue.Empty:
+                pass
+            with self._lock:
+                build = self._built[recipe] < self.size
+                if build:
+                    self._built[recipe] += 1
+            if build:
+                agent = self._build_in_slot(recipe)
+            else:
+                # Re-checked periodically, since a failed build elsewhere frees a slot
+                try:
+                    agent = idle.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+
+        try:
+            yield agent
+        finally:
+            self._release(recipe, agent)
+
+    def _release(self, recipe: str, agent: Any) -> None:
+        history = getattr(getattr(agent, "short_memory", None), "conversation_history", None)
+        baseline = self._baselines.get(id(agent))
+        if isinstance(history, list) and baseline is not None:
+            del history[baseline:]
+            self._queue(recipe).put(agent)
+            return
+
+        self._baselines.pop(id(agent), None)
+        try:
+            self._queue(recipe).put(self._build_in_slot(recipe))
+        except Exception:
+            # The slot is free again and the next task rebuilds; the finished
+            # task keeps its own result or error
+            pass
+
+
+class _RunnerHandler(socketserver.StreamRequestHandler):
+    # One JSON request per line: {"recipe": ..., "task": ...} or {"command": "ping"}
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if request.get("command") == "ping":
+                    response = {"ok": True, "recipes": list(self.server.pool.recipes)}
+                else:
+                    response = self.server.run_task(request["recipe"], request["task"])
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class RecipeRunnerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serves tasks for the warm agent pool over a local Unix socket.
+
+    Args:
+        pool (AgentPool): The agents to run tasks on.
+        socket_path (str): Path of the socket file. A stale file at that path is replaced.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, pool: AgentPool, socket_path: str = SOCKET_PATH):
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        self.pool = pool
+        super().__init__(socket_path, _RunnerHandler)
+
+    def run_task(self, recipe: str, task: str) -> Dict[str, Any]:
+        requested = time.perf_counter()
+        with self.pool.acquire(recipe) as agent:
+            started = time.perf_counter()
+            output = agent.run(task)
+        return {
+            "ok": True,
+            "output": str(output),
+            "wait_time": started - requested,
+            "run_time": time.perf_counter() - started,
+        }
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+def call_runner(
+    request: Dict[str, Any],
+    socket_path: str = SOCKET_PATH,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Sends one request to a running recipe runner and returns its response.
+
+    Raises:
+        RuntimeError: If the runner reports an error.
+        OSError: If no runner is listening on the socket.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as stream:
+            response = json.loads(stream.readline())
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error", "Recipe runner failed."))
+    return response
+
+
+def run_remote(
+    recipe: str,
+    task: str,
+    socket_path: str = SOCKET_PATH,
+    timeout: Optional[float] = None,
+) -> str:
+    """
+    Runs a task on a warm agent of the recipe in the runner process.
+
+    Args:
+        recipe (str): A name from RECIPES, e.g. "art_therapy".
+        task (str): The task for the agent.
+        socket_path (str): The runner's socket.
+        timeout (Optional[float]): Seconds to wait for the answer.
+
+    Returns:
+        str: The agent's output.
+    """
+    return call_runner({"recipe": recipe, "task": task}, socket_path, timeout)["output"]
+
+
+# Example usage:
+#   python recipe_runner.py serve                      # long-lived, imports and builds once
+#   python recipe_runner.py run art_therapy "Jasmine: told me that you're offering art therapy"
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Warm agent pool for the workshop recipes.")
+    parser.add_argument("--socket", default=SOCKET_PATH, help="Unix socket path.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Start the runner.")
+    serve.add_argument("--recipes", nargs="*", help="Recipes to warm at startup (default: all).")
+    serve.add_argument("--size", type=int, default=2, help="Agents kept per recipe.")
+
+    run = commands.add_parser("run", help="Send a task to a running runner.")
+    run.add_argument("recipe", choices=sorted(RECIPES))
+    run.add_argument("task")
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        pool = AgentPool(size=args.size)
+        start = time.perf_counter()
+        pool.warm(args.recipes)
+        print(f"Warmed {args.recipes or list(RECIPES)} in {time.perf_counter() - start:.2f}s")
+        print(f"Listening on {args.socket}")
+        with RecipeRunnerServer(pool, args.socket) as server:
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+    else:
+        print(run_remote(args.recipe, args.task, args.socket))
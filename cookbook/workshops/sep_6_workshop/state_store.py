@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+# Agent attributes that are runtime objects or already stored elsewhere
+EXCLUDED_KEYS = {"llm", "short_memory", "long_term_memory", "tokenizer", "logger_handler"}
+
+
+class IncrementalStateStore:
+    """
+    Persists an agent's state as static config plus an append-only conversation log.
+
+    The full Agent autosave rewrites the whole state, including the system prompt,
+    tool prompt and the LLM class docstring, on every save. This store instead:
+
+    - writes `<name>.config.json` only when the configuration actually changes,
+    - appends only the conversation turns added since the last save to
+      `<name>.turns.jsonl`, so a save costs O(new turns),
+    - every `compact_every` turns, folds the log into `<name>.snapshot.json`
+      (or `.json.zst` when `compress=True`, which requires `zstandard`).
+
+    Args:
+        directory (str): Directory the files are written to.
+        name (str): File name prefix, usually the agent name.
+        compact_every (int): Number of logged turns that triggers a compaction.
+        compress (bool): Compress the compacted snapshot with zstd.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        name: str,
+        compact_every: int = 200,
+        compress: bool = False,
+    ):
+        self.directory = directory
+        self.name = name
+        self.compact_every = compact_every
+        self.compress = compress
+        os.makedirs(directory, exist_ok=True)
+
+        self.config_path = os.path.join(directory, f"{name}.config.json")
+        self.log_path = os.path.join(directory, f"{name}.turns.jsonl")
+        self.snapshot_path = os.path.join(
+            directory, f"{name}.snapshot.json" + (".zst" if compress else "")
+        )
+
+        # The config file holds exactly the hashed text, so an unchanged config is not rewritten after a restart
+        self._config_hash: Optional[str] = None
+        if os.path.exists(self.config_path):
+            with open(self.config_path, "rb") as file:
+                self._config_hash = hashlib.sha256(file.read()).hexdigest()
+        self._repair_log()
+        # Recover counts from disk so a restarted process keeps appending where it stopped
+        self._snapshot_turns = len(self._read_snapshot())
+        self._log_turns = len(self._read_log())
+        # How much of the history passed in by this process is already saved
+        self._history_offset = 0
+
+    @property
+    def saved_turns(self) -> int:
+        return self._snapshot_turns + self._log_turns
+
+    @staticmethod
+    def agent_config(agent: Any) -> Dict[str, Any]:
+        """
+        Extracts the JSON-serializable configuration of an agent.
+
+        The LLM is recorded by class and model name only, and the conversation is left out.
+        """
+        config = {}
+        for key, value in vars(agent).items():
+            if key in EXCLUDED_KEYS or key.startswith("_"):
+                continue
+            try:
+                json.dumps(value)
+            except (TypeError, ValueError):
+                continue
+            config[key] = value
+
+        llm = getattr(agent, "llm", None)
+        if llm is not None:
+            config["llm"] = {
+                "name": type(llm).__name__,
+                "model_name": getattr(llm, "model_name", None),
+            }
+        return config
+
+    def save(self, agent: Any) -> int:
+        """
+        Saves the agent's config if it changed and appends its new conversation turns.
+
+        Args:
+            agent (Any): An Agent with `short_memory.conversation_history`.
+
+        Returns:
+            int: The number of turns appended.
+        """
+        self.save_config(self.agent_config(agent))
+        return self.append_turns(agent.short_memory.conversation_history)
+
+    def save_config(self, config: Dict[str, Any]) -> None:
+        data = json.dumps(config, indent=4, ensure_ascii=False, sort_keys=True)
+        digest = hashlib.sha256(data.encode("utf-8")).hexdigest()
+        if digest == self._config_hash:
+            return
+
+        tmp_path = f"{self.config_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(data)
+        os.replace(tmp_path, self.config_path)
+        self._config_hash = digest
+
+    def mark_saved(self, history: List[Dict[str, Any]]) -> None:
+        """
+        Marks every turn of `history` as saved, e.g. after loading a saved
+        conversation back into a new agent, so those turns are not appended again.
+        """
+        self._history_offset = len(history)
+
+    def append_turns(self, history: List[Dict[str, Any]]) -> int:
+        """
+        Appends the turns of `history` that have not been saved yet.
+
+        Only turns added since the last call in this process are new: a restarted
+        process starts with a fresh agent whose history is not the one on disk.
+        A history shorter than what was saved from it is a new conversation and
+        is appended in full.
+
+        Args:
+            history (List[Dict[str, Any]]): The agent's full conversation history.
+
+        Returns:
+            int: The number of turns appended.
+        """
+        if len(history) < self._history_offset:
+            self._history_offset = 0
+        new_turns = history[self._history_offset :]
+        if not new_turns:
+            return 0
+
+        with open(self.log_path, "a", encoding="utf-8") as file:
+            for turn in new_turns:
+                file.write(json.dumps(turn, ensure_ascii=False, default=str) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        self._log_turns += len(new_turns)
+        self._history_offset = len(history)
+
+        if self._log_turns >= self.compact_every:
+            self.compact()
+        return len(new_turns)
+
+    def compact(self) -> None:
+        """
+        Folds the turn log into the snapshot and truncates the log.
+        """
+        turns = self._read_snapshot() + self._read_log()
+        data = json.dumps(turns, ensure_ascii=False, default=str).encode("utf-8")
+        if self.compress:
+            data = self._zstd().ZstdCompressor(level=10).compress(data)
+
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        # The snapshot is durable before the log it replaces is removed
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+        self._snapshot_turns = len(turns)
+        self._log_turns = 0
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Loads the saved state.
+
+        Returns:
+            Dict[str, Any]: The config under "config" and every turn under "conversation_history".
+        """
+        config = {}
+        if os.path.exists(self.config_path):
+            with open(self.config_path, encoding="utf-8") as file:
+                config = json.load(file)
+        return {
+            "config": config,
+            "conversation_history": self._read_snapshot() + self._read_log(),
+        }
+
+    def _repair_log(self) -> None:
+        # Drop a torn last line left by a crash mid-append so new turns start on a fresh line
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, "rb+") as file:
+            data = file.read()
+            if data and not data.endswith(b"\n"):
+                file.truncate(data.rfind(b"\n") + 1)
+
+    def _read_snapshot(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.snapshot_path):
+            return []
+        with open(self.snapshot_path, "rb") as file:
+            data = file.read()
+        if self.compress:
+            data = self._zstd().ZstdDecompressor().decompress(data)
+        return json.loads(data)
+
+    def _read_log(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path, encoding="utf-8") as file:
+            return [json.loads(line) for line in file if line.strip()]
+
+    @staticmethod
+    def _zstd() -> Any:
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "Compressed snapshots require zstandard: pip3 install zstandard"
+            ) from e
+        return zstandard
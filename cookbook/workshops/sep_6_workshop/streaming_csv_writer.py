@@ -0,0 +1,202 @@
+import csv
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class StreamingResultWriter:
+    """
+    Appends swarm results to a CSV file one row at a time as tasks finish.
+
+    Rows are flushed immediately and fsync'd in batches (every `fsync_every` rows
+    or `fsync_interval` seconds, whichever comes first). When the CSV grows past
+    `max_bytes` it is rotated to `<name>.<n>.csv` and a fresh file with a header
+    is started. An optional newline-delimited JSON sidecar receives the same rows,
+    so downstream tools can tail it (`pd.read_json(path, lines=True)`) without
+    parsing multi-line quoted CSV cells. An optional Parquet sidecar writes one
+    row group per fsync batch and requires `pyarrow`. A Parquet file cannot be
+    appended to, so each writer (and each rotation) starts its own
+    `<name>-<timestamp>-<part>.parquet`; read them together with
+    `pd.concat(pd.read_parquet(p) for p in sorted(glob.glob("<name>-*.parquet")))`.
+    A Parquet file is only readable once `close()` has written its footer.
+
+    Args:
+        path (str): CSV file to append to.
+        fieldnames (List[str]): Column names, in order.
+        max_bytes (Optional[int]): Rotate the files once the CSV reaches this size.
+        fsync_every (int): Number of rows between fsyncs.
+        fsync_interval (float): Maximum seconds between fsyncs while rows are arriving.
+        jsonl_sidecar (bool): Also write rows to `<name>.jsonl`.
+        parquet_sidecar (bool): Also write rows to `<name>-<timestamp>-<part>.parquet`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fieldnames: List[str],
+        max_bytes: Optional[int] = 10 * 1024 * 1024,
+        fsync_every: int = 10,
+        fsync_interval: float = 5.0,
+        jsonl_sidecar: bool = True,
+        parquet_sidecar: bool = False,
+    ):
+        if fsync_every < 1:
+            raise ValueError("fsync_every must be at least 1.")
+
+        self.path = path
+        self.fieldnames = fieldnames
+        self.max_bytes = max_bytes
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.jsonl_sidecar = jsonl_sidecar
+        self.parquet_sidecar = parquet_sidecar
+        self.rows_written = 0
+
+        self._base, _ = os.path.splitext(path)
+        self._lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        self._last_sync = time.monotonic()
+        self._parquet_writer = None
+        self._parquet_run = time.strftime("%Y%m%dT%H%M%S")
+        self._parquet_part = 0
+
+        if parquet_sidecar:
+            # Fails here rather than at the first fsync, after rows were already written
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError(
+                    "The Parquet sidecar requires pyarrow: pip3 install pyarrow"
+                ) from e
+            self._pa = pa
+            self._pq = pq
+            self._parquet_schema = pa.schema([(name, pa.string()) for name in fieldnames])
+
+        # Files written with different columns (e.g. by SpreadSheetSwarm) are rotated
+        # aside rather than appended to under a mismatched header
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, newline="", encoding="utf-8") as file:
+                header = next(csv.reader(file), [])
+            if header != self.fieldnames:
+                self._move_aside()
+        self._open()
+
+    def _open(self) -> None:
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._csv_file = open(self.path, "a", newline="", encoding="utf-8")
+        self._csv = csv.DictWriter(
+            self._csv_file, fieldnames=self.fieldnames, extrasaction="ignore"
+        )
+        if new_file:
+            self._csv.writeheader()
+
+        self._jsonl_file = (
+            open(f"{self._base}.jsonl", "a", encoding="utf-8")
+            if self.jsonl_sidecar
+            else None
+        )
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """
+        Appends one row to the CSV and any sidecars.
+
+        Args:
+            row (Dict[str, Any]): Values keyed by field name. Unknown keys are ignored.
+        """
+        with self._lock:
+            self._csv.writerow(row)
+            self._csv_file.flush()
+            if self._jsonl_file:
+                self._jsonl_file.write(
+                    json.dumps(
+                        {name: row.get(name) for name in self.fieldnames},
+                        ensure_ascii=False,
+                        default=str,
+                    )
+                    + "\n"
+                )
+                self._jsonl_file.flush()
+
+            self._pending.append(row)
+            self.rows_written += 1
+
+            if (
+                len(self._pending) >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync()
+
+            if self.max_bytes and self._csv_file.tell() >= self.max_bytes:
+                self._rotate()
+
+    def _sync(self) -> None:
+        for file in (self._csv_file, self._jsonl_file):
+            if file:
+                os.fsync(file.fileno())
+        if self.parquet_sidecar and self._pending:
+            self._write_parquet(self._pending)
+        self._pending = []
+        self._last_sync = time.monotonic()
+
+    def _write_parquet(self, rows: List[Dict[str, Any]]) -> None:
+        pa = self._pa
+        # Every column is stored as a string, so a column that is empty in the first
+        # batch is not inferred as null and rejected once later batches fill it
+        table = pa.table(
+            {
+                name: [None if row.get(name) is None else str(row[name]) for row in rows]
+                for name in self.fieldnames
+            },
+            schema=self._parquet_schema,
+        )
+        if self._parquet_writer is None:
+            # A new file per writer and rotation, so earlier runs are never truncated
+            self._parquet_part += 1
+            path = f"{self._base}-{self._parquet_run}-{self._parquet_part}.parquet"
+            while os.path.exists(path):
+                self._parquet_part += 1
+                path = f"{self._base}-{self._parquet_run}-{self._parquet_part}.parquet"
+            self._parquet_writer = self._pq.ParquetWriter(path, self._parquet_schema)
+        self._parquet_writer.write_table(table)
+
+    def _close_files(self) -> None:
+        self._sync()
+        self._csv_file.close()
+        if self._jsonl_file:
+            self._jsonl_file.close()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        self._parquet_run = time.strftime("%Y%m%dT%H%M%S")
+        self._parquet_part = 0
+
+    def _rotate(self) -> None:
+        self._close_files()
+        self._move_aside()
+        self._open()
+
+    def _move_aside(self) -> None:
+        index = 1
+        while os.path.exists(f"{self._base}.{index}.csv"):
+            index += 1
+
+        os.replace(self.path, f"{self._base}.{index}.csv")
+        sidecar = f"{self._base}.jsonl"
+        if os.path.exists(sidecar):
+            os.replace(sidecar, f"{self._base}.{index}.jsonl")
+
+    def close(self) -> None:
+        """
+        Flushes, fsyncs and closes all open files.
+        """
+        with self._lock:
+            self._close_files()
+
+    def __enter__(self) -> "StreamingResultWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,227 @@
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from agent_calls import stream_isolated
+from async_rearrange import parse_flow
+
+# Marks the end of a stage's input or output on the queues
+_DONE = object()
+
+
+class SectionSplitter:
+    """
+    Cuts a stream of text chunks into sections at a delimiter.
+
+    A section is only cut once it holds at least `min_chars` characters, so
+    short paragraphs such as headings travel with the text that follows them.
+
+    Args:
+        boundary (str): The delimiter between sections, e.g. a blank line.
+        min_chars (int): Minimum section length before a cut is made.
+    """
+
+    def __init__(self, boundary: str = "\n\n", min_chars: int = 200):
+        self.boundary = boundary
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Adds a chunk and returns the sections it completed.
+        """
+        self._buffer += chunk
+        sections = []
+        search_from = self.min_chars
+        while True:
+            index = self._buffer.find(self.boundary, search_from)
+            if index == -1:
+                break
+            section = self._buffer[:index].strip()
+            self._buffer = self._buffer[index + len(self.boundary) :]
+            if section:
+                sections.append(section)
+        return sections
+
+    def flush(self) -> List[str]:
+        """
+        Returns whatever is left as a final section.
+        """
+        section, self._buffer = self._buffer.strip(), ""
+        return [section] if section else []
+
+
+class StreamingAgentRearrange:
+    """
+    Runs a sequential AgentRearrange flow as a pipeline that streams every stage.
+
+    Each stage runs on its own thread. As soon as a stage has written a complete
+    section (text up to a paragraph break), that section is handed to the next
+    stage, which starts on it while the previous stage keeps writing. Sections
+    that arrive while the next stage is busy are merged into its next call, so
+    a slow stage makes fewer, larger calls rather than queueing many. Every
+    token of every stage is yielded to the caller as it arrives. The caller sees
+    output after roughly one time-to-first-token instead of after the sum of
+    the stages' completions.
+
+    Each stage calls `stream_isolated`: agents whose model has a `stream(prompt)`
+    method are streamed with their system prompt followed by the sections
+    handed to them, and a CachedLLM serves repeated prompts from its cache.
+    Agents with tools, or whose model cannot stream, run once per call and
+    yield the result as one chunk, with the history the run added removed
+    again, so no section is resent with the next one.
+
+    Args:
+        agents (List[Any]): Agents exposing `agent_name`, `system_prompt`, `llm` and `run(task)`.
+        flow (str): A sequential flow such as "A -> B -> C".
+        boundary (str): Delimiter at which a stage's output is cut into sections.
+        min_section_chars (int): Minimum section length handed downstream.
+    """
+
+    def __init__(
+        self,
+        agents: List[Any],
+        flow: str,
+        boundary: str = "\n\n",
+        min_section_chars: int = 200,
+    ):
+        self.agents = {agent.agent_name: agent for agent in agents}
+        self.flow = flow
+        self.boundary = boundary
+        self.min_section_chars = min_section_chars
+
+        self.stages = []
+        for step in parse_flow(flow):
+            if len(step) > 1:
+                raise ValueError(
+                    f"Streaming needs a sequential flow; step '{', '.join(step)}' runs agents in parallel."
+                )
+            if step[0] not in self.agents:
+                raise ValueError(f"Agent '{step[0]}' in flow is not in the agents list.")
+            self.stages.append(step[0])
+
+    def _run_stage(
+        self,
+        index: int,
+        inputs: List["queue.Queue"],
+        events: "queue.Queue",
+        cancelled: threading.Event,
+    ) -> None:
+        name = self.stages[index]
+        agent = self.agents[name]
+        downstream = inputs[index + 1] if index + 1 < len(self.stages) else None
+        splitter = SectionSplitter(self.boundary, self.min_section_chars)
+
+        try:
+            part = 0
+            finished = False
+            while not finished and not cancelled.is_set():
+                sections = [inputs[index].get()]
+                # Sections that queued up while this stage was busy are taken as one task
+                while sections[-1] is not _DONE and not inputs[index].empty():
+                    sections.append(inputs[index].get())
+                if sections[-1] is _DONE:
+                    finished = True
+                    sections.pop()
+                if not sections:
+                    break
+                section = self.boundary.join(sections)
+
+                if part:
+                    events.put((name, self.boundary))
+                part += 1
+
+                for chunk in stream_isolated(agent, section):
+                    if cancelled.is_set():
+                        break
+                    events.put((name, chunk))
+                    if downstream:
+                        for completed in splitter.feed(chunk):
+                            downstream.put(completed)
+
+                # The answer to one section is complete even without a trailing boundary
+                if downstream:
+                    for completed in splitter.flush():
+                        downstream.put(completed)
+        except Exception as e:
+            events.put((name, e))
+        finally:
+            if downstream:
+                downstream.put(_DONE)
+            events.put((name, _DONE))
+
+    def stream(self, task: str) -> Iterator[Tuple[str, str]]:
+        """
+        Runs the flow and yields each stage's output as it is generated.
+
+        Chunks of different stages are interleaved in the order they were produced.
+
+        Args:
+            task (str): The task given to the first agent.
+
+        Yields:
+            Tuple[str, str]: The agent name and the next chunk of its output.
+
+        Raises:
+            Exception: The first error raised by a stage, once every stage has stopped.
+        """
+        inputs = [queue.Queue() for _ in self.stages]
+        events = queue.Queue()
+        cancelled = threading.Event()
+        inputs[0].put(task)
+        inputs[0].put(_DONE)
+
+        threads = [
+            threading.Thread(
+                target=self._run_stage, args=(i, inputs, events, cancelled), daemon=True
+            )
+            for i in range(len(self.stages))
+        ]
+        for thread in threads:
+            thread.start()
+
+        error: Optional[Exception] = None
+        running = len(self.stages)
+        try:
+            while running:
+                name, chunk = events.get()
+                if chunk is _DONE:
+                    running -= 1
+                elif isinstance(chunk, Exception):
+                    error = error or chunk
+                else:
+                    yield name, chunk
+        finally:
+            # Stops the stages between chunks if the caller closes the generator early
+            cancelled.set()
+
+        if error:
+            raise error
+
+    def run(self, task: str) -> Dict[str, Any]:
+        """
+        Runs the flow to completion and records when each stage produced output.
+
+        Args:
+            task (str): The task given to the first agent.
+
+        Returns:
+            Dict[str, Any]: The full output of each stage, the time to each stage's
+            first chunk, and the total time.
+        """
+        outputs: Dict[str, List[str]] = {name: [] for name in self.stages}
+        first_chunk: Dict[str, float] = {}
+        start = time.perf_counter()
+
+        for name, chunk in self.stream(task):
+            first_chunk.setdefault(name, time.perf_counter() - start)
+            outputs[name].append(chunk)
+
+        return {
+            "flow": self.flow,
+            "output": "".join(outputs[self.stages[-1]]),
+            "outputs": {name: "".join(chunks) for name, chunks in outputs.items()},
+            "first_chunk_time": first_chunk,
+            "total_time": time.perf_counter() - start,
+        }
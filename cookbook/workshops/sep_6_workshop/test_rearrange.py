@@ -1,19 +1,52 @@
+import glob
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 from swarms import Agent, AgentRearrange, OpenAIChat
-from swarms.utils import data_to_text
+from llm_cache import CachedLLM
+from expense_digest import build_digest, digest_to_text, drill_down, load_ledger
+from streaming_rearrange import StreamingAgentRearrange
+from batch_rearrange import BatchAgentRearrange
 
 load_dotenv()
 
 # Get the OpenAI API key from the environment variable
 api_key = os.getenv("OPENAI_API_KEY")
 
-# Create an instance of the OpenAIChat class
-model = OpenAIChat(
-    api_key=api_key, model_name="gpt-4o-mini", temperature=0.1, max_tokens=4000
+# Create an instance of the OpenAIChat class, answering identical prompts
+# from the local response cache (llm_cache.sqlite)
+model = CachedLLM(
+    OpenAIChat(
+        api_key=api_key, model_name="gpt-4o-mini", temperature=0.1, max_tokens=4000
+    )
 )
 
 
+# Aggregate the ledger once with pandas; the agents get the digest, not the raw rows
+# Each ledger is loaded once, however often the tool drills into it
+cached_ledger = lru_cache(maxsize=1)(load_ledger)
+ledger = cached_ledger("data.csv")
+digest = digest_to_text(build_digest(ledger))
+
+
+def fetch_expense_rows(
+    vendor: str = None, service: str = None, month: str = None, ledger_path: str = "data.csv"
+) -> str:
+    """
+    Fetches the raw transactions for a vendor, service and/or month, largest first.
+
+    Args:
+        vendor (str, optional): The vendor name, e.g. "Slack".
+        service (str, optional): The service category, e.g. "Marketing".
+        month (str, optional): The month name, e.g. "April".
+        ledger_path (str, optional): The ledger the task is about. Defaults to "data.csv".
+
+    Returns:
+        str: The matching transactions as CSV.
+    """
+    return drill_down(cached_ledger(ledger_path), vendor=vendor, service=service, month=month)
+
+
 # Initialize the boss agent (Director)
 boss_agent = Agent(
     agent_name="BossAgent",
@@ -55,6 +88,8 @@ worker1 = Agent(
     stopping_token="<DONE>",
     state_save_file_type="json",
     saved_state_path="worker1.json",
+    # Lets the analyzer pull the underlying rows for anything the digest flags
+    tools=[fetch_expense_rows],
 )
 
 # Initialize worker 2: Summary Generator
@@ -97,42 +132,49 @@ flow = "BossAgent -> ExpenseAnalyzer -> SummaryGenerator"
 # Using AgentRearrange class to manage the swarm
 agent_system = AgentRearrange(agents=agents, flow=flow, return_json=True)
 
-data = data_to_text("data.csv")
-
 # Input task for the swarm
-task = """
+def expense_task(digest: str, ledger_path: str = "data.csv") -> str:
+    return f"""
 
     The company has been facing a rising number of unnecessary expenses, and the finance team needs a detailed 
     analysis of recent transactions to identify which expenses can be cut off to improve profitability. 
     Analyze the provided transaction data and create a detailed report on cost-cutting opportunities, 
     focusing on recurring transactions and non-essential expenditures. 
     
-    Transactions: 
-        
-    Vendor,Service,Expense ($),Month
-    Amazon Web Services,Payments,4632.83,June
-    Google Cloud,Collaboration,1581.25,August
-    Microsoft Azure,Cloud Services,460.21,February
-    HubSpot,Accounting,1804.32,January
-    Slack,Collaboration,3137.03,July
-    Stripe,Ads,2592.29,May
-    Twilio,Marketing,818.5,March
-    Zoom,Marketing,3105.0,April
-    Trello,Marketing,2986.18,January
-    GitHub,Collaboration,1958.86,May
-    LinkedIn Ads,Collaboration,797.92,September
-    Google Ads,Cloud Services,2862.14,April
-    Facebook Ads,Accounting,2326.0,August
-    Mailchimp,Cloud Services,3735.74,April
-    Salesforce,Cloud Services,2828.26,April
-    Notion,Accounting,4481.65,September
-    QuickBooks,Accounting,464.77,May
-    Zapier,Marketing,1478.0,June
-    DocuSign,Ads,3267.59,October
-    PayPal,CRM,3294.24,February
+    Transaction digest (pre-aggregated from the full ledger):
+
+{digest}
+    Use the fetch_expense_rows tool with ledger_path="{ledger_path}" to inspect the individual transactions behind any vendor, service or month.
 
 """
 
-# Run the swarm system with the task
-output = agent_system.run(task)
-print(output)
+
+task = expense_task(digest)
+
+if os.getenv("EXPENSE_LEDGERS"):
+    # Batch mode, e.g. EXPENSE_LEDGERS="clients/*.csv": every ledger goes through the
+    # same flow as a pipeline, and each ledger is read only when the first agent has room
+    def ledger_tasks(paths):
+        for path in paths:
+            yield expense_task(digest_to_text(build_digest(cached_ledger(path))), path)
+
+    paths = sorted(glob.glob(os.getenv("EXPENSE_LEDGERS")))
+    pipeline = BatchAgentRearrange(agents=agents, flow=flow, queue_size=4)
+    # Only the ledgers of tasks still in the pipeline stay in memory
+    cached_ledger = lru_cache(maxsize=pipeline.max_in_flight)(load_ledger)
+    for result in pipeline.run_batch(ledger_tasks(paths)):
+        print(f"=== {paths[result['index']]}")
+        print(result["output"] if result["error"] is None else f"Failed: {result['error']}")
+    print(pipeline.format_stats())
+elif os.getenv("STREAM_REPORT", "true").lower() == "true":
+    # Pipelined streaming: each agent starts on every finished section of the
+    # previous agent's output, and the summary is printed as it is written
+    pipeline = StreamingAgentRearrange(agents=agents, flow=flow)
+    for agent_name, chunk in pipeline.stream(task):
+        if agent_name == "SummaryGenerator":
+            print(chunk, end="", flush=True)
+    print()
+else:
+    # Run the swarm system with the task
+    output = agent_system.run(task)
+    print(output)